@@ -1,7 +1,7 @@
 import json
 import os
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import connection
 
 from apps.home.models import Projet, Tag, Testimonial
@@ -22,15 +22,13 @@ class Command(BaseCommand):
         file_path = options["file"]
 
         if not os.path.exists(file_path):
-            self.stdout.write(self.style.ERROR(f"File {file_path} does not exist"))
-            return
+            raise CommandError(f"File {file_path} does not exist")
 
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
         except json.JSONDecodeError as e:
-            self.stdout.write(self.style.ERROR(f"Invalid JSON file: {e}"))
-            return
+            raise CommandError(f"Invalid JSON file: {e}")
 
         self.import_tags(data.get("tags", []))
         self.import_projects(data.get("projects", []))
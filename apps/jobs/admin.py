@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["label", "status", "created_by", "created_at", "finished_at"]
+    list_filter = ["status", "command"]
+    readonly_fields = ["started_at", "finished_at", "updated_at"]
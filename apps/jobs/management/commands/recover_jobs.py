@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.jobs.runner import fail_interrupted_jobs, purge_old_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark jobs interrupted by a restart as failed and delete expired ones. "
+        "Run it before starting the application server."
+    )
+
+    def handle(self, *args, **options):
+        interrupted = fail_interrupted_jobs()
+        purged = purge_old_jobs()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{interrupted} interrupted job(s) marked as failed, "
+                f"{purged} expired job(s) deleted"
+            )
+        )
@@ -0,0 +1,253 @@
+import io
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_LINES = 200
+OUTPUT_SAVE_INTERVAL = 1.0  # seconds between progress writes
+
+_lock = threading.Lock()
+_worker: threading.Thread | None = None
+
+
+def enqueue(
+    label: str,
+    command: str,
+    *,
+    user=None,
+    arguments: dict | None = None,
+    input_file: str = "",
+    result_argument: str = "",
+    result_name: str = "",
+    result_content_type: str = "application/octet-stream",
+) -> Job:
+    """
+    Queue ``command`` to run in the background and return its Job.
+
+    Jobs are rows in the database; every process runs them one at a time in
+    a worker thread, so requests return immediately and no broker is needed.
+    When ``result_argument`` is given, the command receives a path under
+    JOBS_ROOT through that option and the file is offered for download as
+    ``result_name`` once the job has succeeded.
+    """
+    purge_old_jobs()
+
+    arguments = dict(arguments or {})
+    result_file = ""
+    if result_argument:
+        result_file = str(_jobs_root() / f"{uuid.uuid4().hex}-{result_name}")
+        arguments[result_argument] = result_file
+
+    job = Job.objects.create(
+        label=label,
+        command=command,
+        arguments=arguments,
+        input_file=input_file,
+        result_file=result_file,
+        result_name=result_name,
+        result_content_type=result_content_type if result_file else "",
+        created_by=user if user and user.is_authenticated else None,
+    )
+    transaction.on_commit(start_worker)
+    return job
+
+
+def save_upload(uploaded_file) -> str:
+    """Copy an uploaded file under JOBS_ROOT so it outlives the request."""
+    suffix = "".join(Path(uploaded_file.name).suffixes[-2:])
+    path = _jobs_root() / f"{uuid.uuid4().hex}-upload{suffix}"
+    with open(path, "wb") as f:
+        for chunk in uploaded_file.chunks():
+            f.write(chunk)
+    return str(path)
+
+
+def start_worker() -> None:
+    """Start this process's worker thread unless it is already running."""
+    global _worker
+    with _lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_work, name="jobs-worker", daemon=True)
+            _worker.start()
+
+
+def purge_old_jobs() -> int:
+    """Delete finished jobs older than JOBS_RETENTION_DAYS and their files."""
+    cutoff = timezone.now() - timedelta(days=settings.JOBS_RETENTION_DAYS)
+    old_jobs = Job.objects.filter(
+        status__in=[Job.SUCCEEDED, Job.FAILED], finished_at__lt=cutoff
+    )
+    for path in old_jobs.values_list("result_file", flat=True):
+        _remove(path)
+    deleted, _ = old_jobs.delete()
+    return deleted
+
+
+def fail_interrupted_jobs() -> int:
+    """
+    Mark jobs left running by a stopped process as failed.
+
+    Worker threads die with their process, so this runs at startup, before
+    the application server accepts requests.
+    """
+    return Job.objects.filter(status=Job.RUNNING).update(
+        status=Job.FAILED,
+        error="Interrupted by a server restart",
+        finished_at=timezone.now(),
+    )
+
+
+def _work() -> None:
+    global _worker
+    try:
+        while True:
+            job = _claim_next_job()
+            if job is None:
+                with _lock:
+                    # Re-check under the lock so that a job queued while
+                    # this thread was finishing is not left behind
+                    if not Job.objects.filter(status=Job.PENDING).exists():
+                        _worker = None
+                        return
+                continue
+            _run(job)
+    except Exception:
+        logger.exception("Job worker crashed")
+        with _lock:
+            _worker = None
+    finally:
+        connections.close_all()
+
+
+def _claim_next_job() -> Job | None:
+    """Atomically move the oldest pending job to running, across processes."""
+    while True:
+        job = Job.objects.filter(status=Job.PENDING).order_by("id").first()
+        if job is None:
+            return None
+        started_at = timezone.now()
+        claimed = Job.objects.filter(id=job.id, status=Job.PENDING).update(
+            status=Job.RUNNING, started_at=started_at, updated_at=started_at
+        )
+        if claimed:
+            job.status = Job.RUNNING
+            job.started_at = started_at
+            return job
+
+
+def _run(job: Job) -> None:
+    output = _JobOutput(job.id)
+    logger.info(f"Running job {job.id}: {job.command}")
+    try:
+        call_command(job.command, stdout=output, stderr=output, **job.arguments)
+    except Exception as e:
+        logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+        status, error = Job.FAILED, str(e) or e.__class__.__name__
+        if job.result_file:
+            _remove(job.result_file)
+    else:
+        status, error = Job.SUCCEEDED, ""
+    finally:
+        output.close()
+        if job.input_file:
+            _remove(job.input_file)
+
+    Job.objects.filter(id=job.id).update(
+        status=status,
+        error=error,
+        output=output.text(),
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    logger.info(f"Job {job.id} {status}")
+
+
+class _JobOutput(io.TextIOBase):
+    """
+    File-like sink for the command output.
+
+    Keeps the last OUTPUT_LINES lines and saves them on the job at most once
+    per OUTPUT_SAVE_INTERVAL, which is what the status endpoint reports as
+    progress. The lines are saved through a connection of their own, in
+    autocommit: commands such as import_workout_data run in a single
+    transaction, which would otherwise hide their progress until the end.
+    """
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.lines: deque[str] = deque(maxlen=OUTPUT_LINES)
+        self.partial = ""
+        self.saved_at = time.monotonic()
+        self.connection = None
+        self.live = True
+
+    def write(self, text: str) -> int:
+        *complete, self.partial = (self.partial + text).split("\n")
+        self.lines.extend(complete)
+        if (
+            complete
+            and self.live
+            and time.monotonic() - self.saved_at >= OUTPUT_SAVE_INTERVAL
+        ):
+            self.save_progress()
+            self.saved_at = time.monotonic()
+        return len(text)
+
+    def save_progress(self) -> None:
+        if self.connection is None:
+            self.connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        ops = self.connection.ops
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {ops.quote_name(Job._meta.db_table)} "  # nosec B608
+                    "SET output = %s, updated_at = %s WHERE id = %s",
+                    [
+                        self.text(),
+                        ops.adapt_datetimefield_value(timezone.now()),
+                        self.job_id,
+                    ],
+                )
+        except DatabaseError as e:
+            # A SQLite file has a single writer at a time; the output is
+            # still saved when the job finishes
+            logger.warning(f"Job {self.job_id} progress not saved: {e}")
+            self.live = False
+
+    def text(self) -> str:
+        return "\n".join([*self.lines, self.partial]).strip("\n")
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        super().close()
+
+
+def _jobs_root() -> Path:
+    root = Path(settings.JOBS_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def _remove(path: str) -> None:
+    if not path:
+        return
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
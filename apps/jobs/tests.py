@@ -0,0 +1,75 @@
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.test import TransactionTestCase
+
+from apps.workout.models import TypeWorkout
+from apps.workout.records import refresh_personal_records
+
+from . import runner
+from .models import Job
+
+
+def read_output(job_id: int) -> str:
+    """The job output as another connection sees it"""
+
+    def read():
+        try:
+            return Job.objects.get(id=job_id).output
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(read).result()
+
+
+@mock.patch.object(runner, "OUTPUT_SAVE_INTERVAL", 0)
+class JobProgressTests(TransactionTestCase):
+    """Progress is visible while the command still runs in a transaction"""
+
+    def test_progress_commits_on_its_own(self):
+        job = Job.objects.create(label="Test", command="import_workout_data")
+        output = runner._JobOutput(job.id)
+        try:
+            with transaction.atomic():
+                output.write("Importing data...\n")
+                self.assertEqual(read_output(job.id), "Importing data...")
+                transaction.set_rollback(True)
+        finally:
+            output.close()
+        self.assertEqual(read_output(job.id), "Importing data...")
+
+    def test_running_import_progress(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "export.json"
+            TypeWorkout.objects.create(name_workout="Push")
+            call_command("export_workout_data", output=str(path), stdout=StringIO())
+            job = Job.objects.create(
+                label="Import",
+                command="import_workout_data",
+                arguments={"file": str(path)},
+            )
+            progress = []
+
+            def read_progress(exercise_ids):
+                # Runs inside the import transaction
+                progress.append(read_output(job.id))
+                return refresh_personal_records(exercise_ids)
+
+            with mock.patch(
+                "apps.workout.management.commands.import_workout_data"
+                ".refresh_personal_records",
+                side_effect=read_progress,
+            ):
+                runner._run(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED, job.error)
+        self.assertEqual(
+            progress[0].splitlines()[-1], "  Refreshed 0 workout summaries"
+        )
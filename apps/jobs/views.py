@@ -0,0 +1,75 @@
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
+
+from .models import Job
+from .runner import start_worker
+
+
+def job_payload(job: Job) -> dict:
+    """JSON view of a job, as returned when it is queued and by job_status"""
+    lines = job.output.strip().splitlines()
+    return {
+        "id": job.id,
+        "label": job.label,
+        "status": job.status,
+        "finished": job.is_finished,
+        "progress": lines[-1] if lines else "",
+        "output": job.output,
+        "error": job.error,
+        "status_url": reverse("job_status", args=[job.id]),
+        "page_url": reverse("job_detail", args=[job.id]),
+        "download_url": (
+            reverse("job_download", args=[job.id])
+            if job.status == Job.SUCCEEDED and job.result_file
+            else None
+        ),
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def get_user_job(request, job_id: int) -> Job:
+    """Fetch a job, hiding other users' jobs from non-staff users"""
+    job = get_object_or_404(Job, id=job_id)
+    if not request.user.is_staff and job.created_by_id != request.user.id:
+        raise Http404("Job not found")
+    if job.status == Job.PENDING:
+        # Jobs queued before a restart wait for a worker; polling revives it
+        start_worker()
+    return job
+
+
+@login_required
+def job_detail(request, job_id):
+    """Page following a job until it finishes, for non-JS forms"""
+    job = get_user_job(request, job_id)
+    return render(
+        request, "jobs/job_detail.html", {"job": job, "payload": job_payload(job)}
+    )
+
+
+@login_required
+def job_status(request, job_id):
+    """Status and progress of a job (polled by the JS)"""
+    return JsonResponse(job_payload(get_user_job(request, job_id)))
+
+
+@login_required
+def job_download(request, job_id):
+    """Download the file produced by a succeeded job"""
+    job = get_user_job(request, job_id)
+    if job.status != Job.SUCCEEDED or not job.result_file:
+        raise Http404("No file for this job")
+    try:
+        f = open(job.result_file, "rb")
+    except FileNotFoundError:
+        raise Http404("The file of this job has expired")
+    return FileResponse(
+        f,
+        as_attachment=True,
+        filename=job.result_name,
+        content_type=job.result_content_type or None,
+    )
@@ -1,6 +1,13 @@
 from django.contrib import admin
+from django.db import transaction
 from django.db.models import OuterRef, Subquery
 
+from .cache import (
+    EXERCISES_STAMP,
+    TEMPLATES_STAMP,
+    WORKOUT_TYPES_STAMP,
+    bump_data_version,
+)
 from .models import (
     CardioSeriesLog,
     Equipment,
@@ -15,31 +22,93 @@ from .models import (
     Workout,
     WorkoutTemplate,
 )
+from .records import refresh_personal_records
+from .search import refresh_search_text
+from .summaries import refresh_workout_summaries, workouts_using_exercises
+
+
+class StampedAdmin(admin.ModelAdmin):
+    """Bump the data version and the change ``stamps`` on every admin write"""
+
+    stamps: tuple[str, ...] = ()
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        bump_data_version(*self.stamps)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_data_version(*self.stamps)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            bump_data_version(*self.stamps)
+
+
+class ExerciseTagAdmin(StampedAdmin):
+    """Refresh the exercises of a renamed or deleted tag"""
+
+    stamps = (EXERCISES_STAMP,)
+
+    def refresh_exercises(self, exercise_ids):
+        refresh_search_text(exercise_ids)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and "name" in form.changed_data:
+            self.refresh_exercises(obj.exercises.values_list("id", flat=True))
+
+    def delete_model(self, request, obj):
+        exercise_ids = list(obj.exercises.values_list("id", flat=True))
+        super().delete_model(request, obj)
+        self.refresh_exercises(exercise_ids)
+
+    def delete_queryset(self, request, queryset):
+        # Unlike the delete view, the delete action is not atomic
+        with transaction.atomic():
+            exercise_ids = [
+                exercise_id
+                for exercise_id in queryset.values_list("exercises", flat=True)
+                if exercise_id is not None
+            ]
+            super().delete_queryset(request, queryset)
+            self.refresh_exercises(exercise_ids)
 
 
 @admin.register(Equipment)
-class EquipmentAdmin(admin.ModelAdmin):
+class EquipmentAdmin(ExerciseTagAdmin):
     list_display = ["name", "description"]
     search_fields = ["name"]
     list_filter = ["name"]
 
 
 @admin.register(MuscleGroup)
-class MuscleGroupAdmin(admin.ModelAdmin):
+class MuscleGroupAdmin(ExerciseTagAdmin):
     list_display = ["name", "description"]
     search_fields = ["name"]
     list_filter = ["name"]
 
+    def refresh_exercises(self, exercise_ids):
+        exercise_ids = list(exercise_ids)
+        super().refresh_exercises(exercise_ids)
+        # Workout summaries list the muscle groups of their exercises
+        refresh_workout_summaries(workouts_using_exercises(exercise_ids))
+
 
 @admin.register(TypeWorkout)
-class TypeWorkoutAdmin(admin.ModelAdmin):
+class TypeWorkoutAdmin(StampedAdmin):
+    # Templates show the name of their type
+    stamps = (WORKOUT_TYPES_STAMP, TEMPLATES_STAMP)
     list_display = ["name_workout"]
     search_fields = ["name_workout"]
     list_filter = ["name_workout"]
 
 
 @admin.register(Exercice)
-class ExerciceAdmin(admin.ModelAdmin):
+class ExerciceAdmin(StampedAdmin):
+    # Deleting an exercise removes it from the templates
+    stamps = (EXERCISES_STAMP, TEMPLATES_STAMP)
     list_display = [
         "name",
         "exercise_type",
@@ -59,6 +128,28 @@ class ExerciceAdmin(admin.ModelAdmin):
     def get_equipment(self, obj):
         return ", ".join([eq.name for eq in obj.equipment.all()])
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        refresh_search_text([form.instance.id])
+        if change and "muscle_groups" in form.changed_data:
+            # Workout summaries list the muscle groups of their exercises
+            refresh_workout_summaries(workouts_using_exercises([form.instance.id]))
+
+    def delete_model(self, request, obj):
+        workout_ids = workouts_using_exercises([obj.id])
+        super().delete_model(request, obj)
+        # The positions and series of the exercise went with it
+        refresh_workout_summaries(workout_ids)
+
+    def delete_queryset(self, request, queryset):
+        # Unlike the delete view, the delete action is not atomic
+        with transaction.atomic():
+            workout_ids = workouts_using_exercises(
+                queryset.values_list("id", flat=True)
+            )
+            super().delete_queryset(request, queryset)
+            refresh_workout_summaries(workout_ids)
+
 
 class StrengthSeriesLogInline(admin.TabularInline):
     model = StrengthSeriesLog
@@ -106,14 +197,49 @@ class WorkoutAdmin(admin.ModelAdmin):
     list_filter = ["date", "type_workout", "duration"]
     fieldsets = ((None, {"fields": ("date", "type_workout", "duration")}),)
     inlines = [OneExerciceInline, StrengthSeriesLogInline, CardioSeriesLogInline]
+    list_select_related = ["type_workout", "summary"]
 
     @admin.display(description="Exercises")
     def get_exercise_count(self, obj):
-        strength_count = obj.strength_series_logs.count()
-        cardio_count = obj.cardio_series_logs.count()
+        summary = getattr(obj, "summary", None)
+        if summary is None:
+            return "-"
+        strength_count = summary.strength_series_count
+        cardio_count = summary.cardio_series_count
         total = strength_count + cardio_count
         return f"{total} ({strength_count}S, {cardio_count}C)"
 
+    def save_related(self, request, form, formsets, change):
+        exercise_ids = self._strength_exercise_ids([form.instance.id])
+        super().save_related(request, form, formsets, change)
+        refresh_workout_summaries([form.instance.id])
+        refresh_personal_records(
+            exercise_ids | self._strength_exercise_ids([form.instance.id])
+        )
+        bump_data_version()
+
+    def delete_model(self, request, obj):
+        exercise_ids = self._strength_exercise_ids([obj.id])
+        super().delete_model(request, obj)
+        refresh_personal_records(exercise_ids)
+        bump_data_version()
+
+    def delete_queryset(self, request, queryset):
+        # Unlike the delete view, the delete action is not atomic
+        with transaction.atomic():
+            exercise_ids = self._strength_exercise_ids(queryset.values("id"))
+            super().delete_queryset(request, queryset)
+            refresh_personal_records(exercise_ids)
+            bump_data_version()
+
+    @staticmethod
+    def _strength_exercise_ids(workout_ids):
+        return set(
+            StrengthSeriesLog.objects.filter(workout_id__in=workout_ids).values_list(
+                "exercise_id", flat=True
+            )
+        )
+
 
 class TemplateExerciseInline(admin.TabularInline):
     model = TemplateExercise
@@ -137,7 +263,8 @@ class TemplateCardioSeriesInline(admin.TabularInline):
 
 
 @admin.register(WorkoutTemplate)
-class WorkoutTemplateAdmin(admin.ModelAdmin):
+class WorkoutTemplateAdmin(StampedAdmin):
+    stamps = (TEMPLATES_STAMP,)
     list_display = ["name", "type_workout", "duration", "is_active", "created_at"]
     search_fields = ["name", "type_workout__name_workout"]
     list_filter = ["type_workout", "is_active", "created_at"]
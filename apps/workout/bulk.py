@@ -0,0 +1,119 @@
+from collections import defaultdict
+from typing import Any
+
+from django.db import models
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def bulk_upsert(
+    model: type[models.Model],
+    rows: list[dict[str, Any]],
+    key_fields: list[str],
+    value_fields: list[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> tuple[list[models.Model], int, int]:
+    """
+    Set-based equivalent of calling update_or_create() once per row.
+
+    ``rows`` hold attribute values (``workout_id``, not ``workout``). Rows are
+    matched on ``key_fields``; existing rows are preloaded in batches with an
+    ``__in`` lookup on the first key field, which must therefore be non-null.
+    New keys are inserted with bulk_create and rows whose ``value_fields``
+    differ are written back with bulk_update. As with update_or_create, a
+    key repeated in ``rows`` resolves to one object carrying the last values,
+    and the oldest row wins when the table already holds duplicates.
+
+    Returns (objects aligned with ``rows``, created count, updated count).
+    """
+    if not rows:
+        return [], 0, 0
+
+    first_field = key_fields[0]
+    lookup_values = list({row[first_field] for row in rows})
+    existing: dict[tuple, models.Model] = {}
+    for start in range(0, len(lookup_values), batch_size):
+        end = start + batch_size
+        queryset = model.objects.filter(
+            **{f"{first_field}__in": lookup_values[start:end]}
+        ).order_by("pk")
+        for obj in queryset:
+            existing.setdefault(_key(obj, key_fields), obj)
+
+    objects: list[models.Model] = []
+    pending: dict[tuple, models.Model] = {}
+    to_update: dict[Any, models.Model] = {}
+    for row in rows:
+        key = tuple(row[name] for name in key_fields)
+        obj = existing.get(key)
+        if obj is not None:
+            if any(getattr(obj, name) != row.get(name) for name in value_fields):
+                for name in value_fields:
+                    setattr(obj, name, row.get(name))
+                to_update[obj.pk] = obj
+        elif key in pending:
+            obj = pending[key]
+            for name in value_fields:
+                setattr(obj, name, row.get(name))
+        else:
+            obj = pending[key] = model(**row)
+        objects.append(obj)
+
+    if pending:
+        model.objects.bulk_create(list(pending.values()), batch_size=batch_size)
+    if to_update:
+        model.objects.bulk_update(
+            list(to_update.values()), value_fields, batch_size=batch_size
+        )
+
+    return objects, len(pending), len(to_update)
+
+
+def bulk_set_m2m(
+    relation: Any,
+    targets: dict[int, set[int]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> None:
+    """
+    Set-based equivalent of ``obj.<relation>.set(ids)`` for many objects.
+
+    ``relation`` is the ManyToMany descriptor (e.g. ``Exercice.muscle_groups``)
+    and ``targets`` maps each source id to the complete set of target ids.
+    """
+    if not targets:
+        return
+
+    through = relation.through
+    source_field = relation.field.m2m_field_name() + "_id"
+    target_field = relation.field.m2m_reverse_field_name() + "_id"
+
+    source_ids = list(targets)
+    current: dict[int, dict[int, int]] = defaultdict(dict)
+    for start in range(0, len(source_ids), batch_size):
+        end = start + batch_size
+        for pk, source_id, target_id in through.objects.filter(
+            **{f"{source_field}__in": source_ids[start:end]}
+        ).values_list("pk", source_field, target_field):
+            current[source_id][target_id] = pk
+
+    stale_ids = []
+    missing = []
+    for source_id, wanted in targets.items():
+        stored = current.get(source_id, {})
+        stale_ids.extend(
+            pk for target_id, pk in stored.items() if target_id not in wanted
+        )
+        missing.extend(
+            through(**{source_field: source_id, target_field: target_id})
+            for target_id in wanted
+            if target_id not in stored
+        )
+
+    for start in range(0, len(stale_ids), batch_size):
+        end = start + batch_size
+        through.objects.filter(pk__in=stale_ids[start:end]).delete()
+    through.objects.bulk_create(missing, batch_size=batch_size)
+
+
+def _key(obj: models.Model, key_fields: list[str]) -> tuple:
+    return tuple(getattr(obj, name) for name in key_fields)
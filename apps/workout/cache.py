@@ -0,0 +1,102 @@
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DataVersion
+
+DATA_VERSION_NAME = "workout"
+# Change stamps of the reference tables read by the conditional JSON views
+# (see conditional.py). Writes bump them along with the data version.
+EXERCISES_STAMP = "exercises"
+WORKOUT_TYPES_STAMP = "workout_types"
+TEMPLATES_STAMP = "templates"
+ALL_STAMPS = (EXERCISES_STAMP, WORKOUT_TYPES_STAMP, TEMPLATES_STAMP)
+CACHE_PREFIX = "workout"
+STATS_KEY = f"{CACHE_PREFIX}:stats"
+
+
+def get_data_version() -> int:
+    """Return the current workout data version (a single indexed lookup)."""
+    version = (
+        DataVersion.objects.filter(name=DATA_VERSION_NAME)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_data_version(*stamps: str) -> None:
+    """
+    Invalidate every cached workout payload.
+
+    The counter lives in the database so that all worker processes see the
+    bump, whatever the cache backend. Called by every write path that touches
+    workouts or series. ``stamps`` names the change stamps of the reference
+    tables the write touched as well; they are bumped in the same UPDATE.
+    """
+    names = {DATA_VERSION_NAME, *stamps}
+    updated = DataVersion.objects.filter(name__in=names).update(
+        version=F("version") + 1, updated_at=timezone.now()
+    )
+    if updated < len(names):
+        for name in names:
+            DataVersion.objects.get_or_create(name=name, defaults={"version": 1})
+
+
+def cached_payload(
+    name: str, key_parts: Iterable[Any], builder: Callable[[], Any]
+) -> Any:
+    """
+    Return the payload ``name`` for ``key_parts``, building it on a miss.
+
+    Keys embed the data version, so a bump makes every older entry
+    unreachable and they simply expire.
+    """
+    parts = ":".join(str(part) for part in key_parts)
+    key = f"{CACHE_PREFIX}:{name}:v{get_data_version()}:{parts}"
+
+    payload = cache.get(key)
+    if payload is not None:
+        _count(name, "hits")
+        return payload
+
+    _count(name, "misses")
+    payload = builder()
+    cache.set(key, payload)
+    return payload
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Return the hit/miss counters of each payload, e.g. {"dashboard": {...}}."""
+    stats: dict[str, dict[str, int]] = {}
+    for name in cache.get(STATS_KEY, []):
+        stats[name] = {
+            "hits": cache.get(f"{STATS_KEY}:{name}:hits", 0),
+            "misses": cache.get(f"{STATS_KEY}:{name}:misses", 0),
+        }
+    return stats
+
+
+def reset_cache_stats() -> None:
+    names = cache.get(STATS_KEY, [])
+    cache.delete_many(
+        [f"{STATS_KEY}:{name}:{kind}" for name in names for kind in ("hits", "misses")]
+    )
+    cache.delete(STATS_KEY)
+
+
+def _count(name: str, kind: str) -> None:
+    key = f"{STATS_KEY}:{name}:{kind}"
+    try:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+    except ValueError:
+        # The counter expired between add() and incr()
+        cache.set(key, 1, timeout=None)
+
+    names = cache.get(STATS_KEY, [])
+    if name not in names:
+        cache.set(STATS_KEY, [*names, name], timeout=None)
@@ -0,0 +1,98 @@
+from collections.abc import Callable
+from datetime import datetime, time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.utils import timezone, translation
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    quote_etag,
+)
+from django.utils.http import http_date
+
+from .cache import DATA_VERSION_NAME
+from .models import DataVersion
+
+
+def validators(stamps: tuple[str, ...]) -> tuple[str, int]:
+    """
+    Return the ETag and Last-Modified timestamp of a response built from
+    the tables behind ``stamps``, read with a single indexed query.
+
+    The ETag also holds the language and the date, as payloads are
+    translated and some of them run up to today. For the same reason
+    Last-Modified is never earlier than midnight.
+    """
+    rows = {
+        name: (version, updated_at)
+        for name, version, updated_at in DataVersion.objects.filter(
+            name__in=stamps
+        ).values_list("name", "version", "updated_at")
+    }
+    today = timezone.localdate()
+    versions = "-".join(str(rows.get(name, (0, None))[0]) for name in stamps)
+    etag = quote_etag(f"{versions}-{translation.get_language()}-{today.isoformat()}")
+
+    last_modified = max(
+        [
+            timezone.make_aware(datetime.combine(today, time.min)),
+            *(updated_at for _version, updated_at in rows.values()),
+        ]
+    )
+    return etag, int(last_modified.timestamp())
+
+
+def finish(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_on(*stamps: str) -> Callable:
+    """
+    Answer GETs with 304 Not Modified while the tables behind ``stamps``
+    are unchanged since the client's copy.
+
+    ``stamps`` are the change stamps the view reads (see cache.py); by
+    default the data version, which every workout write bumps. Works on
+    sync and async views. Responses are marked private and no-cache so
+    the browser revalidates them on each call instead of guessing a
+    freshness lifetime from Last-Modified.
+    """
+    names = stamps or (DATA_VERSION_NAME,)
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_view(request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD"):
+                    return await view(request, *args, **kwargs)
+                etag, last_modified = await sync_to_async(validators)(names)
+                response = get_conditional_response(
+                    request, etag=etag, last_modified=last_modified
+                )
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return finish(response, etag, last_modified)
+
+            return async_view
+
+        @wraps(view)
+        def sync_view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            etag, last_modified = validators(names)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return finish(response, etag, last_modified)
+
+        return sync_view
+
+    return decorator
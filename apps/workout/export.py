@@ -0,0 +1,264 @@
+import json
+import zlib
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from datetime import datetime
+from itertools import islice
+from typing import Any
+
+from asgiref.sync import sync_to_async
+
+from .jsonstream import COLUMNAR_FORMAT, COLUMNAR_VERSION
+from .models import (
+    CardioSeriesLog,
+    Equipment,
+    Exercice,
+    MuscleGroup,
+    OneExercice,
+    StrengthSeriesLog,
+    TemplateCardioSeries,
+    TemplateExercise,
+    TemplateStrengthSeries,
+    TypeWorkout,
+    Workout,
+    WorkoutTemplate,
+)
+
+EXPORT_CHUNK_SIZE = 2000
+
+Rows = Iterator[dict[str, Any]]
+
+
+def iter_json_export(chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the workout export as JSON text, one table chunk at a time.
+
+    Every table is read with ``.iterator(chunk_size=...)``, so memory stays
+    bounded by the chunk size whatever the history length. The document has
+    the same keys and rows as before, with one row per line.
+    """
+    today_date = datetime.today().strftime("%Y-%m-%d")
+    yield "{\n" + f'  "export_date": {json.dumps(today_date)}'
+
+    for name, rows in EXPORT_TABLES:
+        yield f",\n  {json.dumps(name)}: ["
+        separator = "\n"
+        buffer = []
+        for row in rows(chunk_size):
+            buffer.append(separator + "    " + json.dumps(row, ensure_ascii=False))
+            separator = ",\n"
+            if len(buffer) >= chunk_size:
+                yield "".join(buffer)
+                buffer = []
+        if buffer:
+            yield "".join(buffer)
+        yield "\n  ]" if separator == ",\n" else "]"
+
+    yield "\n}\n"
+
+
+def iter_columnar_export(chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the workout export as columnar JSON lines.
+
+    The first line is a header ({"format", "version", "export_date"}). Each
+    following line holds up to ``chunk_size`` rows of one table, stored column
+    by column: {"table", "columns": [...], "data": [[column values], ...]}.
+    Field names appear once per block instead of once per row, and columns
+    of similar values compress well once gzipped (see iter_gzip()).
+    """
+    header = {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "export_date": datetime.today().strftime("%Y-%m-%d"),
+    }
+    yield json.dumps(header) + "\n"
+
+    for name, rows in EXPORT_TABLES:
+        iterator = rows(chunk_size)
+        while batch := list(islice(iterator, chunk_size)):
+            columns = list(batch[0])
+            block = {
+                "table": name,
+                "columns": columns,
+                "data": [[row[column] for row in batch] for column in columns],
+            }
+            yield json.dumps(block, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def iter_gzip(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip a stream of text chunks on the fly."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def aiter_chunks(chunks: Iterator[Any]) -> AsyncIterator[Any]:
+    """
+    Serve a sync stream of chunks to an async response.
+
+    Under ASGI, Django reads a sync iterator with sync_to_async(list), i.e.
+    the whole export is built in memory before the first byte is sent. Each
+    chunk is pulled from the sync thread instead, as it is sent.
+    """
+    try:
+        while (chunk := await sync_to_async(next)(chunks, None)) is not None:
+            yield chunk
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            # Ends the export queries when the client goes away
+            await sync_to_async(close)()
+
+
+def export_type_workouts(chunk_size: int) -> Rows:
+    yield from TypeWorkout.objects.values("id", "name_workout").iterator(
+        chunk_size=chunk_size
+    )
+
+
+def export_muscle_groups(chunk_size: int) -> Rows:
+    yield from MuscleGroup.objects.values("id", "name", "description").iterator(
+        chunk_size=chunk_size
+    )
+
+
+def export_equipment(chunk_size: int) -> Rows:
+    yield from Equipment.objects.values("id", "name", "description").iterator(
+        chunk_size=chunk_size
+    )
+
+
+def export_exercises(chunk_size: int) -> Rows:
+    # M2M links are prefetched once per chunk instead of queried per exercise
+    exercises = Exercice.objects.prefetch_related("muscle_groups", "equipment")
+    for ex in exercises.iterator(chunk_size=chunk_size):
+        yield {
+            "id": ex.id,
+            "name": ex.name,
+            "exercise_type": ex.exercise_type,
+            "difficulty": ex.difficulty,
+            "muscle_groups": [mg.id for mg in ex.muscle_groups.all()],
+            "equipment": [eq.id for eq in ex.equipment.all()],
+        }
+
+
+def export_workouts(chunk_size: int) -> Rows:
+    workouts = Workout.objects.values_list(
+        "id", "date", "type_workout_id", "type_workout__name_workout", "duration"
+    )
+    for id_, date, type_id, type_name, duration in workouts.iterator(
+        chunk_size=chunk_size
+    ):
+        yield {
+            "id": id_,
+            "date": date.strftime("%Y-%m-%d"),
+            "type_workout_id": type_id,
+            "type_workout_name": type_name,
+            "duration": duration,
+        }
+
+
+def export_strength_series_logs(chunk_size: int) -> Rows:
+    logs = StrengthSeriesLog.objects.values_list(
+        "id",
+        "exercise_id",
+        "exercise__name",
+        "workout_id",
+        "series_number",
+        "reps",
+        "weight",
+    )
+    for id_, exercise_id, name, workout_id, number, reps, weight in logs.iterator(
+        chunk_size=chunk_size
+    ):
+        yield {
+            "id": id_,
+            "exercise_id": exercise_id,
+            "exercise_name": name,
+            "workout_id": workout_id,
+            "series_number": number,
+            "reps": reps,
+            "weight": weight,
+        }
+
+
+def export_cardio_series_logs(chunk_size: int) -> Rows:
+    logs = CardioSeriesLog.objects.values_list(
+        "id",
+        "exercise_id",
+        "exercise__name",
+        "workout_id",
+        "series_number",
+        "duration_seconds",
+        "distance_m",
+    )
+    for id_, exercise_id, name, workout_id, number, duration, distance in logs.iterator(
+        chunk_size=chunk_size
+    ):
+        yield {
+            "id": id_,
+            "exercise_id": exercise_id,
+            "exercise_name": name,
+            "workout_id": workout_id,
+            "series_number": number,
+            "duration_seconds": duration,
+            "distance_m": distance,
+        }
+
+
+def export_one_exercices(chunk_size: int) -> Rows:
+    one_exercices = OneExercice.objects.values_list(
+        "id", "name_id", "seance_id", "position"
+    )
+    for id_, exercise_id, workout_id, position in one_exercices.iterator(
+        chunk_size=chunk_size
+    ):
+        yield {
+            "id": id_,
+            "exercise_id": exercise_id,
+            "workout_id": workout_id,
+            "position": position,
+        }
+
+
+def export_workout_templates(chunk_size: int) -> Rows:
+    yield from WorkoutTemplate.objects.values(
+        "id", "name", "type_workout_id", "duration", "is_active"
+    ).iterator(chunk_size=chunk_size)
+
+
+def export_template_exercises(chunk_size: int) -> Rows:
+    yield from TemplateExercise.objects.values(
+        "id", "template_id", "exercise_id", "position"
+    ).iterator(chunk_size=chunk_size)
+
+
+def export_template_strength_series(chunk_size: int) -> Rows:
+    yield from TemplateStrengthSeries.objects.values(
+        "id", "template_exercise_id", "series_number", "reps", "weight"
+    ).iterator(chunk_size=chunk_size)
+
+
+def export_template_cardio_series(chunk_size: int) -> Rows:
+    yield from TemplateCardioSeries.objects.values(
+        "id", "template_exercise_id", "series_number", "duration_seconds", "distance_m"
+    ).iterator(chunk_size=chunk_size)
+
+
+EXPORT_TABLES: list[tuple[str, Callable[[int], Rows]]] = [
+    ("type_workouts", export_type_workouts),
+    ("muscle_groups", export_muscle_groups),
+    ("equipment", export_equipment),
+    ("exercises", export_exercises),
+    ("workouts", export_workouts),
+    ("strength_series_logs", export_strength_series_logs),
+    ("cardio_series_logs", export_cardio_series_logs),
+    ("one_exercices", export_one_exercices),
+    ("workout_templates", export_workout_templates),
+    ("template_exercises", export_template_exercises),
+    ("template_strength_series", export_template_strength_series),
+    ("template_cardio_series", export_template_cardio_series),
+]
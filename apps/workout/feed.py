@@ -0,0 +1,119 @@
+from collections.abc import Iterable
+from typing import Any
+
+from .models import CardioSeriesLog, Exercice, OneExercice, StrengthSeriesLog
+
+STRENGTH_FIELDS = ("series_number", "reps", "weight")
+CARDIO_FIELDS = ("series_number", "duration_seconds", "distance_m")
+
+
+def build_exercises_by_workout(
+    workout_ids: Iterable[int], with_details: bool = False
+) -> dict[int, list[dict[str, Any]]]:
+    """
+    Assemble the exercises and series of several workouts at once.
+
+    Positions, strength series, cardio series and (optionally) muscle groups
+    are each fetched with a single query for the whole batch and grouped in
+    memory, so the query count does not depend on the number of workouts.
+
+    Returns {workout_id: [exercise, ...]} with exercises sorted by position.
+    When ``with_details`` is set, each exercise also carries its ``id`` and
+    ``muscle_groups`` as needed by the workout feed.
+    """
+    workout_ids = list(workout_ids)
+    exercises_by_workout: dict[int, list[dict[str, Any]]] = {
+        workout_id: [] for workout_id in workout_ids
+    }
+    if not workout_ids:
+        return exercises_by_workout
+
+    # Later positions win when an exercise appears twice in the same workout
+    positions: dict[tuple[int, int], int] = {
+        (seance_id, exercise_id): position
+        for seance_id, exercise_id, position in OneExercice.objects.filter(
+            seance_id__in=workout_ids
+        )
+        .order_by("seance_id", "position")
+        .values_list("seance_id", "name_id", "position")
+    }
+
+    strength_rows = (
+        StrengthSeriesLog.objects.filter(workout_id__in=workout_ids)
+        .order_by("workout_id", "exercise__name", "exercise_id", "series_number")
+        .values_list("workout_id", "exercise_id", "exercise__name", *STRENGTH_FIELDS)
+    )
+    cardio_rows = (
+        CardioSeriesLog.objects.filter(workout_id__in=workout_ids)
+        .order_by("workout_id", "exercise__name", "exercise_id", "series_number")
+        .values_list("workout_id", "exercise_id", "exercise__name", *CARDIO_FIELDS)
+    )
+
+    _group_series(
+        strength_rows, "strength", STRENGTH_FIELDS, positions, exercises_by_workout
+    )
+    _group_series(cardio_rows, "cardio", CARDIO_FIELDS, positions, exercises_by_workout)
+
+    if with_details:
+        exercise_ids = {
+            exercise["id"]
+            for exercises in exercises_by_workout.values()
+            for exercise in exercises
+        }
+        muscle_groups = get_muscle_group_names(exercise_ids)
+        for exercises in exercises_by_workout.values():
+            for exercise in exercises:
+                exercise["muscle_groups"] = muscle_groups.get(exercise["id"], [])
+    else:
+        for exercises in exercises_by_workout.values():
+            for exercise in exercises:
+                del exercise["id"]
+
+    for exercises in exercises_by_workout.values():
+        exercises.sort(key=lambda x: x.get("position", 0))
+
+    return exercises_by_workout
+
+
+def get_muscle_group_names(exercise_ids: Iterable[int]) -> dict[int, list[str]]:
+    """Return {exercise_id: [muscle group name, ...]} in a single query."""
+    exercise_ids = list(exercise_ids)
+    names: dict[int, list[str]] = {}
+    if not exercise_ids:
+        return names
+
+    rows = (
+        Exercice.muscle_groups.through.objects.filter(exercice_id__in=exercise_ids)
+        .order_by("musclegroup__name")
+        .values_list("exercice_id", "musclegroup__name")
+    )
+    for exercise_id, name in rows:
+        names.setdefault(exercise_id, []).append(name)
+    return names
+
+
+def _group_series(
+    rows,
+    exercise_type: str,
+    fields: tuple[str, ...],
+    positions: dict[tuple[int, int], int],
+    exercises_by_workout: dict[int, list[dict[str, Any]]],
+) -> None:
+    """Fold ordered series rows into one exercise entry per consecutive run."""
+    current_key: tuple[int, int] | None = None
+    current_exercise: dict[str, Any] | None = None
+
+    for workout_id, exercise_id, exercise_name, *values in rows:
+        if current_key != (workout_id, exercise_id):
+            current_key = (workout_id, exercise_id)
+            current_exercise = {
+                "id": exercise_id,
+                "name": exercise_name,
+                "exercise_type": exercise_type,
+                "position": positions.get((workout_id, exercise_id), 0),
+                "series": [],
+            }
+            exercises_by_workout[workout_id].append(current_exercise)
+
+        if current_exercise is not None:
+            current_exercise["series"].append(dict(zip(fields, values)))
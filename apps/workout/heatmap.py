@@ -0,0 +1,102 @@
+import calendar
+from collections import defaultdict
+from datetime import date
+from typing import Any
+
+from django.utils.translation import gettext
+
+from .cache import cached_payload
+from .models import Workout
+
+
+def month_names() -> list[str]:
+    return [
+        gettext("January"),
+        gettext("February"),
+        gettext("March"),
+        gettext("April"),
+        gettext("May"),
+        gettext("June"),
+        gettext("July"),
+        gettext("August"),
+        gettext("September"),
+        gettext("October"),
+        gettext("November"),
+        gettext("December"),
+    ]
+
+
+def calendar_snapshot(year: int) -> dict[str, Any]:
+    """
+    Return the calendar heatmap data of ``year``, cached per data version.
+
+    The snapshot holds what does not depend on the language or the current
+    date: the layout of each month, its workouts by day and the years that
+    have workouts. Any workout write bumps the data version, so the next
+    request rebuilds it with two queries.
+    """
+    return cached_payload(
+        "calendar_year", (year,), lambda: build_calendar_snapshot(year)
+    )
+
+
+def build_calendar_snapshot(year: int) -> dict[str, Any]:
+    workout_days: dict[int, dict[int, dict[str, Any]]] = defaultdict(dict)
+    workouts = (
+        Workout.objects.filter(date__year=year)
+        .order_by("date", "id")
+        .values_list("id", "date", "duration", "type_workout__name_workout")
+    )
+    # One workout per day is shown; the last one saved wins
+    for workout_id, workout_date, duration, type_name in workouts:
+        workout_days[workout_date.month][workout_date.day] = {
+            "day": workout_date.day,
+            "type": type_name or "No Type",
+            "duration": duration,
+            "id": workout_id,
+        }
+
+    months = []
+    for month in range(1, 13):
+        start_weekday, num_days = calendar.monthrange(year, month)
+        months.append(
+            {
+                "number": month,
+                "num_days": num_days,
+                "start_weekday": start_weekday,
+                "workout_days": dict(workout_days[month]),
+            }
+        )
+
+    return {
+        "year": year,
+        "months": months,
+        "years_with_data": [day.year for day in Workout.objects.dates("date", "year")],
+    }
+
+
+def calendar_payload(year: int, today: date | None = None) -> dict[str, Any]:
+    """
+    Calendar of ``year`` as rendered by the analytics page and its year
+    navigation: the cached snapshot plus month names and the current month.
+    """
+    today = today or date.today()
+    snapshot = calendar_snapshot(year)
+    names = month_names()
+
+    months = [
+        {
+            **month,
+            "name": names[month["number"] - 1],
+            "empty_days_before": list(range(month["start_weekday"])),
+            "is_current": year == today.year and month["number"] == today.month,
+        }
+        for month in snapshot["months"]
+    ]
+    years_with_data = snapshot["years_with_data"]
+    return {
+        "year": year,
+        "months": months,
+        "has_prev_year_data": (year - 1) in years_with_data,
+        "has_next_year_data": (year + 1) in years_with_data,
+    }
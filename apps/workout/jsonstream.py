@@ -0,0 +1,174 @@
+import gzip
+import json
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+from typing import IO, Any
+
+READ_SIZE = 1 << 16
+
+COLUMNAR_FORMAT = "workout-columnar"
+COLUMNAR_VERSION = 1
+GZIP_MAGIC = b"\x1f\x8b"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = frozenset(",:]} \t\n\r")
+
+
+def iter_json_object(
+    f: IO[str], read_size: int = READ_SIZE
+) -> Iterator[tuple[str, Any]]:
+    """
+    Incrementally parse a JSON document whose root is an object.
+
+    Yields ``(key, value)`` for each top-level member. Array values are
+    yielded as lazy iterators over their items, decoded one at a time with
+    ``JSONDecoder.raw_decode``, so only one item and one read buffer are held
+    in memory. An array has to be consumed before asking for the next key;
+    whatever is left of it is skipped. Malformed input raises
+    ``json.JSONDecodeError``.
+    """
+    reader = _Reader(f, read_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.decode()
+            if not isinstance(key, str):
+                raise reader.error("Expecting property name")
+            reader.expect(":")
+            if reader.peek() == "[":
+                reader.pos += 1
+                items = _iter_array(reader)
+                yield key, items
+                for _item in items:
+                    pass
+            else:
+                yield key, reader.decode()
+
+            if reader.peek() != ",":
+                reader.expect("}")
+                break
+            reader.pos += 1
+
+    if reader.peek():
+        raise reader.error("Extra data")
+
+
+def iter_columnar_object(f: IO[str]) -> Iterator[tuple[str, Any]]:
+    """
+    Parse a columnar export (see export.iter_columnar_export()) line by line.
+
+    Yields the same ``(key, value)`` pairs as iter_json_object(): the export
+    date, then each table with a lazy iterator over its rows as dicts.
+    """
+    lines = iter(f)
+    header = json.loads(next(lines, "null"))
+    if not isinstance(header, dict) or header.get("format") != COLUMNAR_FORMAT:
+        raise json.JSONDecodeError("Not a columnar workout export", "", 0)
+    if header.get("version", 0) > COLUMNAR_VERSION:
+        raise json.JSONDecodeError(
+            f"Unsupported columnar export version {header['version']}", "", 0
+        )
+    yield "export_date", header.get("export_date")
+
+    blocks = (json.loads(line) for line in lines if line.strip())
+    for table, table_blocks in groupby(blocks, key=itemgetter("table")):
+        yield table, (
+            dict(zip(block["columns"], values))
+            for block in table_blocks
+            for values in zip(*block["data"])
+        )
+
+
+@contextmanager
+def open_export(path: str) -> Iterator[Iterator[tuple[str, Any]]]:
+    """Open a JSON or gzipped columnar export and return its sections."""
+    with open(path, "rb") as f:
+        gzipped = f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+    if gzipped:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            yield iter_columnar_object(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield iter_json_object(f)
+
+
+def _iter_array(reader: "_Reader") -> Iterator[Any]:
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.decode()
+        char = reader.peek()
+        if char == "]":
+            reader.pos += 1
+            return
+        reader.expect(",")
+
+
+class _Reader:
+    """Read buffer over a text file, with the position of the next char."""
+
+    def __init__(self, f: IO[str], read_size: int):
+        self.f = f
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.consumed = 0  # chars dropped from the front of the buffer
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk of the file; False once it is exhausted."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.read_size)
+        if not chunk:
+            self.eof = True
+            return False
+        start, self.pos = self.pos, 0
+        self.consumed += start
+        self.buffer = self.buffer[start:] + chunk
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next char, or "" at the end."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self.error(f"Expecting {char!r}")
+        self.pos += 1
+
+    def decode(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise self.error("Invalid value") from None
+            # A number cut by the end of the buffer ("2." of "2.5e3") still
+            # decodes, so only trust a value followed by a delimiter
+            if (
+                end == len(self.buffer) or self.buffer[end] not in _DELIMITERS
+            ) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(
+            f"{message} at char {self.consumed + self.pos}", self.buffer, self.pos
+        )
@@ -0,0 +1,154 @@
+import json
+import logging
+import statistics
+import time
+from io import BytesIO
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.urls import reverse
+
+# (name, CONN_MAX_AGE, pool) of the connection strategies to compare
+MODES = [
+    ("per_request", 0, False),
+    ("persistent", 60, False),
+    ("pool", 0, True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per-request latency of a view with a new database "
+        "connection per request, persistent connections and psycopg's "
+        "connection pool, and print the results as JSON. Requests go through "
+        "the WSGI handler so connections are opened and closed as in "
+        "production. Read-only: uses the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="Path to request (default: the calendar data of this year)",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Requests per mode (default: 200)",
+        )
+        parser.add_argument(
+            "--modes",
+            default=",".join(name for name, _max_age, _pool in MODES),
+            help="Comma-separated modes to run (default: all available)",
+        )
+
+    def handle(self, *args, **kwargs):
+        url = kwargs["url"] or reverse("get_calendar_data")
+        modes = [mode for mode in MODES if mode[0] in kwargs["modes"].split(",")]
+        if not modes:
+            raise CommandError("No known mode selected")
+
+        handler = WSGIHandler()
+        settings_dict = connection.settings_dict
+        saved = (settings_dict["CONN_MAX_AGE"], settings_dict.get("OPTIONS", {}))
+        results = {"url": url, "database": connection.vendor, "modes": {}}
+
+        # The views log every request; keep only warnings during the run
+        logging.disable(logging.INFO)
+        try:
+            for name, max_age, pool in modes:
+                if pool and not self.pool_available():
+                    self.stderr.write(
+                        self.style.WARNING(
+                            f"Skipping {name}: needs PostgreSQL with psycopg 3 and psycopg_pool"
+                        )
+                    )
+                    continue
+                self.stderr.write(f"Benchmarking {name}...")
+                self.reset(saved[1], max_age, pool)
+                results["modes"][name] = self.measure(handler, url, kwargs["requests"])
+        finally:
+            logging.disable(logging.NOTSET)
+            self.reset(saved[1], saved[0], False)
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    @staticmethod
+    def pool_available():
+        if connection.vendor != "postgresql":
+            return False
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            return False
+        return is_psycopg3
+
+    @staticmethod
+    def reset(options, max_age, pool):
+        """Close the connection (and pool) and apply the next mode's settings"""
+        connection.close()
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
+        options = {key: value for key, value in options.items() if key != "pool"}
+        if pool:
+            options["pool"] = True
+        connection.settings_dict["OPTIONS"] = options
+        connection.settings_dict["CONN_MAX_AGE"] = max_age
+
+    def measure(self, handler, url, count):
+        opened = []
+
+        def on_connect(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection_created.connect(on_connect)
+        try:
+            # Warm up the URL resolver, templates and the view's cache
+            self.request(handler, url)
+            opened.clear()
+            timings = []
+            for _request in range(count):
+                started = time.perf_counter()
+                self.request(handler, url)
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection_created.disconnect(on_connect)
+
+        return {
+            "requests": count,
+            "connections_opened": len(opened),
+            "mean_ms": round(statistics.mean(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(statistics.quantiles(timings, n=20)[-1], 3),
+            "min_ms": round(min(timings), 3),
+        }
+
+    @staticmethod
+    def request(handler, url):
+        path, _, query = url.partition("?")
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "HTTP_HOST": "localhost",
+            "wsgi.url_scheme": "http",
+            "wsgi.input": BytesIO(),
+            "wsgi.errors": BytesIO(),
+        }
+        statuses = []
+        response = handler(environ, lambda status, headers: statuses.append(status))
+        try:
+            for _chunk in response:
+                pass
+        finally:
+            # Sends request_finished, which closes or releases the connection
+            response.close()
+        if not statuses[0].startswith("200"):
+            raise CommandError(f"GET {url} returned {statuses[0]}")
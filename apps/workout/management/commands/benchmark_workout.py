@@ -0,0 +1,286 @@
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, timedelta
+from io import StringIO
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from apps.workout.export import iter_columnar_export, iter_gzip, iter_json_export
+from apps.workout.models import CardioSeriesLog, StrengthSeriesLog, Workout
+from apps.workout.synthetic import generate_history
+
+# History sizes in years run by each --preset. "ten-years" is the long
+# history the grouped weekly trend and dashboard aggregates are sized for.
+PRESETS = {"standard": "1,3,5", "ten-years": "10"}
+
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "workout-benchmark",
+    }
+}
+
+
+def endpoints(end_date: date) -> list[tuple[str, str]]:
+    """(name, url) of the views to benchmark"""
+    range_start = (end_date - timedelta(days=90)).isoformat()
+    three_years_start = (end_date - timedelta(days=3 * 365)).isoformat()
+    return [
+        ("redirect_workout", reverse("workout")),
+        ("get_last_workout", f"{reverse('get_last_workout')}?type=Push"),
+        ("analytics", reverse("analytics")),
+        ("get_dashboard_data", reverse("get_dashboard_data")),
+        (
+            "get_dashboard_data_90_days",
+            f"{reverse('get_dashboard_data')}?start_date={range_start}"
+            f"&end_date={end_date.isoformat()}",
+        ),
+        (
+            "get_dashboard_data_3_years",
+            f"{reverse('get_dashboard_data')}?start_date={three_years_start}"
+            f"&end_date={end_date.isoformat()}",
+        ),
+        ("get_calendar_data", f"{reverse('get_calendar_data')}?year={end_date.year}"),
+        ("exercise_library", reverse("exercise_library")),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time and count the queries of the main workout views, import and export "
+        "on synthetic histories of several sizes, and print the results as JSON. "
+        "Runs in a throwaway test database; the configured one is not touched "
+        "unless --use-current-database is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--preset",
+            choices=PRESETS,
+            default="standard",
+            help="History sizes to run: standard (1, 3 and 5 years) or ten-years "
+            "(default: standard)",
+        )
+        parser.add_argument(
+            "--years",
+            default=None,
+            help="Comma-separated history sizes in years, instead of the preset's",
+        )
+        parser.add_argument(
+            "--exercises",
+            type=int,
+            default=40,
+            help="Exercises in the library (default: 40)",
+        )
+        parser.add_argument(
+            "--workouts-per-week",
+            type=int,
+            default=4,
+            help="Training sessions per week (default: 4)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per view; the first one starts with an empty cache (default: 5)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed (default: 0)"
+        )
+        parser.add_argument(
+            "--use-current-database",
+            action="store_true",
+            help="Run in the configured database instead of a throwaway test "
+            "database; its workout data is deleted. Used by the test suite.",
+        )
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="Write the JSON results to this file instead of stdout",
+        )
+
+    def handle(self, *args, **kwargs):
+        kwargs["years"] = kwargs["years"] or PRESETS[kwargs["preset"]]
+        sizes = [int(years) for years in kwargs["years"].split(",")]
+        self.repeat = max(kwargs["repeat"], 2)
+
+        results = {
+            "meta": self.meta(kwargs),
+            "sizes": [],
+        }
+
+        in_place = kwargs["use_current_database"]
+        if not in_place:
+            setup_test_environment()
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+        # The views log every request; keep only warnings during the run
+        logging.disable(logging.INFO)
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES):
+                for years in sizes:
+                    self.stderr.write(f"Benchmarking {years} year(s) of history...")
+                    results["sizes"].append(self.run_size(years, kwargs))
+        finally:
+            logging.disable(logging.NOTSET)
+            if not in_place:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        output = json.dumps(results, indent=2)
+        if kwargs["output"]:
+            with open(kwargs["output"], "w", encoding="utf-8") as f:
+                f.write(output + "\n")
+            self.stderr.write(
+                self.style.SUCCESS(f"Results written to {kwargs['output']}")
+            )
+        else:
+            self.stdout.write(output)
+
+    def run_size(self, years, kwargs):
+        call_command("clear_workout_data", no_input=True, stdout=StringIO())
+        end_date = date.today()
+        started = time.perf_counter()
+        counts = generate_history(
+            years=years,
+            exercises=kwargs["exercises"],
+            workouts_per_week=kwargs["workouts_per_week"],
+            seed=kwargs["seed"],
+            end_date=end_date,
+        )
+        generate_seconds = time.perf_counter() - started
+
+        user = get_user_model().objects.get_or_create(username="benchmark")[0]
+        client = Client()
+        client.force_login(user)
+
+        benchmarks = {}
+        for name, url in endpoints(end_date):
+            benchmarks[name] = self.measure(lambda url=url: self.get(client, url))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, "export.json")
+            columnar_path = os.path.join(tmp_dir, "export.jsonl.gz")
+            benchmarks["export_json"] = self.measure(
+                lambda: self.write(json_path, iter_json_export(), "w"), repeat=1
+            )
+            benchmarks["export_json"]["bytes"] = os.path.getsize(json_path)
+            benchmarks["export_columnar"] = self.measure(
+                lambda: self.write(
+                    columnar_path, iter_gzip(iter_columnar_export()), "wb"
+                ),
+                repeat=1,
+            )
+            benchmarks["export_columnar"]["bytes"] = os.path.getsize(columnar_path)
+
+            for name, path in (
+                ("import_json", json_path),
+                ("import_columnar", columnar_path),
+            ):
+                call_command("clear_workout_data", no_input=True, stdout=StringIO())
+                benchmarks[name] = self.measure(
+                    lambda path=path: call_command(
+                        "import_workout_data", file=path, stdout=StringIO()
+                    ),
+                    repeat=1,
+                )
+
+        return {
+            "years": years,
+            "rows": {
+                **counts,
+                "imported_workouts": Workout.objects.count(),
+                "imported_series": StrengthSeriesLog.objects.count()
+                + CardioSeriesLog.objects.count(),
+            },
+            "generate_seconds": round(generate_seconds, 3),
+            "benchmarks": benchmarks,
+        }
+
+    def measure(self, run, repeat=None):
+        """
+        Time ``run`` ``repeat`` times, starting from an empty cache.
+
+        The first run is reported as cold; the others (served from the cache
+        when the view caches its payload) as warm.
+        """
+        cache.clear()
+        timings, query_counts = [], []
+        for _run in range(repeat or self.repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            query_counts.append(len(queries))
+
+        result = {"queries": query_counts[0], "cold_ms": round(timings[0], 2)}
+        if len(timings) > 1:
+            result["warm_queries"] = query_counts[-1]
+            result["warm_median_ms"] = round(statistics.median(timings[1:]), 2)
+            result["warm_min_ms"] = round(min(timings[1:]), 2)
+        return result
+
+    @staticmethod
+    def get(client, url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+        if response.streaming:
+            for _chunk in response.streaming_content:
+                pass
+
+    @staticmethod
+    def write(path, chunks, mode):
+        with open(path, mode) as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+    @staticmethod
+    def meta(kwargs):
+        try:
+            revision = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            revision = None
+        return {
+            "revision": revision,
+            "date": date.today().isoformat(),
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "options": {
+                key: kwargs[key]
+                for key in (
+                    "preset",
+                    "years",
+                    "exercises",
+                    "workouts_per_week",
+                    "repeat",
+                    "seed",
+                )
+            },
+        }
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 
+from apps.workout.cache import ALL_STAMPS, bump_data_version
 from apps.workout.models import (
     CardioSeriesLog,
     Equipment,
@@ -61,6 +62,7 @@ class Command(BaseCommand):
         Equipment.objects.all().delete()
         MuscleGroup.objects.all().delete()
         TypeWorkout.objects.all().delete()
+        bump_data_version(*ALL_STAMPS)
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -0,0 +1,147 @@
+import re
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.workout.models import (
+    CardioSeriesLog,
+    Exercice,
+    OneExercice,
+    StrengthSeriesLog,
+    TypeWorkout,
+    Workout,
+)
+
+# Index names in PostgreSQL and SQLite plans
+INDEX_PATTERN = re.compile(
+    r"Index (?:Only )?Scan (?:Backward )?using (\S+)"
+    r"|Bitmap Index Scan on (\S+)"
+    r"|USING (?:COVERING )?INDEX (\S+)"
+    r"|USING (INTEGER PRIMARY KEY)"
+)
+
+
+def hot_queries():
+    """The query shapes the workout pages depend on, as (label, queryset)"""
+    workout = Workout.objects.order_by("-date", "-id").first()
+    workout_id = workout.id if workout else 1
+    workout_date = workout.date if workout else date.today()
+    type_id = TypeWorkout.objects.values_list("id", flat=True).first() or 1
+    exercise_id = (
+        StrengthSeriesLog.objects.values_list("exercise_id", flat=True).first() or 1
+    )
+
+    queries = [
+        ("feed first page", Workout.objects.order_by("-date", "-id")[:11]),
+        (
+            "feed next page",
+            Workout.objects.filter(
+                Q(date__lt=workout_date) | Q(date=workout_date, id__lt=workout_id)
+            ).order_by("-date", "-id")[:11],
+        ),
+        (
+            "calendar year",
+            Workout.objects.filter(date__year=workout_date.year).order_by("date"),
+        ),
+        (
+            "dashboard date range",
+            Workout.objects.filter(
+                date__gte=date(workout_date.year, 1, 1), date__lte=workout_date
+            ),
+        ),
+        (
+            "last workout of a type",
+            Workout.objects.filter(type_workout_id=type_id).order_by("-date")[:1],
+        ),
+        (
+            "strength series of a workout",
+            StrengthSeriesLog.objects.filter(workout_id=workout_id).order_by(
+                "workout_id", "exercise_id", "series_number"
+            ),
+        ),
+        (
+            "cardio series of a workout",
+            CardioSeriesLog.objects.filter(workout_id=workout_id).order_by(
+                "workout_id", "exercise_id", "series_number"
+            ),
+        ),
+        (
+            "exercise positions of a workout",
+            OneExercice.objects.filter(seance_id=workout_id).order_by(
+                "seance_id", "position"
+            ),
+        ),
+        (
+            "heaviest set of an exercise",
+            StrengthSeriesLog.objects.filter(
+                exercise_id=exercise_id, weight__gt=0
+            ).order_by("-weight")[:1],
+        ),
+        (
+            "progression of an exercise",
+            StrengthSeriesLog.objects.filter(exercise_id=exercise_id).values(
+                "workout__date", "weight", "reps"
+            ),
+        ),
+    ]
+    if connection.vendor == "postgresql":
+        # Other databases search the library in Python, see search.py
+        queries.append(
+            (
+                "exercise library search",
+                Exercice.objects.filter(search_text__contains="press"),
+            )
+        )
+    return queries
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the hot workout queries and check that each one uses an index. "
+        "Exits with an error when one of them does not."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--allow-seqscan",
+            action="store_true",
+            help=(
+                "On PostgreSQL, keep sequential scans enabled. By default they "
+                "are disabled for the check, as the planner rightly prefers "
+                "them on small tables, which hides whether an index is usable."
+            ),
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Print the full plan of every query",
+        )
+
+    def handle(self, *args, **kwargs):
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == "postgresql" and not kwargs["allow_seqscan"]:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for label, queryset in hot_queries():
+                plan = queryset.explain()
+                indexes = [
+                    next(name for name in match.groups() if name)
+                    for match in INDEX_PATTERN.finditer(plan)
+                ]
+                if indexes:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"  {label}: {', '.join(indexes)}")
+                    )
+                else:
+                    failures.append(label)
+                    self.stdout.write(self.style.ERROR(f"  {label}: no index used"))
+                if kwargs["verbose_plans"] or not indexes:
+                    self.stdout.write(f"    {plan}".replace("\n", "\n    "))
+
+        if failures:
+            raise CommandError(f"No index used by: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All hot queries use an index"))
@@ -1,205 +1,64 @@
-import json
-from datetime import datetime
-
 from django.core.management.base import BaseCommand
 
-from apps.workout.models import (
-    CardioSeriesLog,
-    Equipment,
-    Exercice,
-    MuscleGroup,
-    OneExercice,
-    StrengthSeriesLog,
-    TemplateCardioSeries,
-    TemplateExercise,
-    TemplateStrengthSeries,
-    TypeWorkout,
-    Workout,
-    WorkoutTemplate,
+from apps.workout.export import (
+    EXPORT_CHUNK_SIZE,
+    iter_columnar_export,
+    iter_gzip,
+    iter_json_export,
 )
 
+DEFAULT_OUTPUTS = {
+    "json": "workout_data.json",
+    "columnar": "workout_data.jsonl.gz",
+}
+
 
 class Command(BaseCommand):
-    help = "Export all workout data to a JSON file"
+    help = "Export all workout data to a JSON or columnar (.jsonl.gz) file"
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--output",
             type=str,
-            default="workout_data.json",
-            help="Output file path (default: workout_data.json)",
+            default=None,
+            help=(
+                "Output file path (default: workout_data.json, or "
+                "workout_data.jsonl.gz with --format columnar)"
+            ),
+        )
+        parser.add_argument(
+            "--format",
+            choices=list(DEFAULT_OUTPUTS),
+            default="json",
+            help=(
+                "json: one document, readable by any JSON tool (default). "
+                "columnar: gzipped JSON lines with one block of column arrays "
+                "per chunk of rows; much smaller and faster to parse."
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f"Rows fetched per database round trip (default: {EXPORT_CHUNK_SIZE})",
         )
 
     def handle(self, *args, **kwargs):
-        today_date = datetime.today().strftime("%Y-%m-%d")
-
-        output_path: str = kwargs.get("output", "workout_data.json")
-
-        data = {
-            "export_date": today_date,
-            "type_workouts": self.export_type_workouts(),
-            "muscle_groups": self.export_muscle_groups(),
-            "equipment": self.export_equipment(),
-            "exercises": self.export_exercises(),
-            "workouts": self.export_workouts(),
-            "strength_series_logs": self.export_strength_series_logs(),
-            "cardio_series_logs": self.export_cardio_series_logs(),
-            "one_exercices": self.export_one_exercices(),
-            "workout_templates": self.export_workout_templates(),
-            "template_exercises": self.export_template_exercises(),
-            "template_strength_series": self.export_template_strength_series(),
-            "template_cardio_series": self.export_template_cardio_series(),
-        }
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        export_format: str = kwargs.get("format") or "json"
+        output_path: str = kwargs.get("output") or DEFAULT_OUTPUTS[export_format]
+        chunk_size: int = kwargs.get("chunk_size", EXPORT_CHUNK_SIZE)
+
+        if export_format == "columnar":
+            with open(output_path, "wb") as f:
+                for chunk in iter_gzip(iter_columnar_export(chunk_size)):
+                    f.write(chunk)
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                for chunk in iter_json_export(chunk_size):
+                    f.write(chunk)
 
         self.stdout.write(
             self.style.SUCCESS(
                 f"All workout data exported successfully to {output_path}"
             )
         )
-
-    def export_type_workouts(self):
-        return [
-            {
-                "id": tw.id,
-                "name_workout": tw.name_workout,
-            }
-            for tw in TypeWorkout.objects.all()
-        ]
-
-    def export_muscle_groups(self):
-        return [
-            {
-                "id": mg.id,
-                "name": mg.name,
-                "description": mg.description,
-            }
-            for mg in MuscleGroup.objects.all()
-        ]
-
-    def export_equipment(self):
-        return [
-            {
-                "id": eq.id,
-                "name": eq.name,
-                "description": eq.description,
-            }
-            for eq in Equipment.objects.all()
-        ]
-
-    def export_exercises(self):
-        return [
-            {
-                "id": ex.id,
-                "name": ex.name,
-                "exercise_type": ex.exercise_type,
-                "difficulty": ex.difficulty,
-                "muscle_groups": [mg.id for mg in ex.muscle_groups.all()],
-                "equipment": [eq.id for eq in ex.equipment.all()],
-            }
-            for ex in Exercice.objects.all()
-        ]
-
-    def export_workouts(self):
-        return [
-            {
-                "id": w.id,
-                "date": w.date.strftime("%Y-%m-%d"),
-                "type_workout_id": w.type_workout.id if w.type_workout else None,
-                "type_workout_name": (
-                    w.type_workout.name_workout if w.type_workout else None
-                ),
-                "duration": w.duration,
-            }
-            for w in Workout.objects.all()
-        ]
-
-    def export_strength_series_logs(self):
-        return [
-            {
-                "id": ssl.id,
-                "exercise_id": ssl.exercise.id,
-                "exercise_name": ssl.exercise.name,
-                "workout_id": ssl.workout.id,
-                "series_number": ssl.series_number,
-                "reps": ssl.reps,
-                "weight": ssl.weight,
-            }
-            for ssl in StrengthSeriesLog.objects.all()
-        ]
-
-    def export_cardio_series_logs(self):
-        return [
-            {
-                "id": csl.id,
-                "exercise_id": csl.exercise.id,
-                "exercise_name": csl.exercise.name,
-                "workout_id": csl.workout.id,
-                "series_number": csl.series_number,
-                "duration_seconds": csl.duration_seconds,
-                "distance_m": csl.distance_m,
-            }
-            for csl in CardioSeriesLog.objects.all()
-        ]
-
-    def export_one_exercices(self):
-        return [
-            {
-                "id": oe.id,
-                "exercise_id": oe.name.id,
-                "workout_id": oe.seance.id,
-                "position": oe.position,
-            }
-            for oe in OneExercice.objects.select_related("name", "seance").all()
-        ]
-
-    def export_workout_templates(self):
-        return [
-            {
-                "id": wt.id,
-                "name": wt.name,
-                "type_workout_id": wt.type_workout.id if wt.type_workout else None,
-                "duration": wt.duration,
-                "is_active": wt.is_active,
-            }
-            for wt in WorkoutTemplate.objects.all()
-        ]
-
-    def export_template_exercises(self):
-        return [
-            {
-                "id": te.id,
-                "template_id": te.template.id,
-                "exercise_id": te.exercise.id,
-                "position": te.position,
-            }
-            for te in TemplateExercise.objects.select_related(
-                "template", "exercise"
-            ).all()
-        ]
-
-    def export_template_strength_series(self):
-        return [
-            {
-                "id": tss.id,
-                "template_exercise_id": tss.template_exercise.id,
-                "series_number": tss.series_number,
-                "reps": tss.reps,
-                "weight": tss.weight,
-            }
-            for tss in TemplateStrengthSeries.objects.all()
-        ]
-
-    def export_template_cardio_series(self):
-        return [
-            {
-                "id": tcs.id,
-                "template_exercise_id": tcs.template_exercise.id,
-                "series_number": tcs.series_number,
-                "duration_seconds": tcs.duration_seconds,
-                "distance_m": tcs.distance_m,
-            }
-            for tcs in TemplateCardioSeries.objects.all()
-        ]
@@ -0,0 +1,63 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.workout.synthetic import generate_history
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic workout history (exercises, workouts, strength and "
+        "cardio series, templates) for development and benchmarks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--years", type=int, default=2, help="Years of history (default: 2)"
+        )
+        parser.add_argument(
+            "--exercises",
+            type=int,
+            default=40,
+            help="Number of exercises in the library (default: 40)",
+        )
+        parser.add_argument(
+            "--workouts-per-week",
+            type=int,
+            default=4,
+            help="Training sessions per week (default: 4)",
+        )
+        parser.add_argument(
+            "--templates",
+            type=int,
+            default=8,
+            help="Number of workout templates (default: 8)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed; the same seed generates the same data (default: 0)",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete all workout data first (without confirmation)",
+        )
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            if kwargs["clear"]:
+                call_command("clear_workout_data", no_input=True, stdout=self.stdout)
+
+            counts = generate_history(
+                years=kwargs["years"],
+                exercises=kwargs["exercises"],
+                workouts_per_week=kwargs["workouts_per_week"],
+                templates=kwargs["templates"],
+                seed=kwargs["seed"],
+            )
+
+        for name, count in counts.items():
+            self.stdout.write(f"  {name}: {count}")
+        self.stdout.write(self.style.SUCCESS("Synthetic workout data generated."))
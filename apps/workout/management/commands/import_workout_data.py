@@ -1,8 +1,16 @@
+import gzip
 import json
+import tempfile
+import time
 from datetime import datetime
+from itertools import chain, islice
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
+from apps.workout.bulk import DEFAULT_BATCH_SIZE, bulk_set_m2m, bulk_upsert
+from apps.workout.cache import ALL_STAMPS, bump_data_version
+from apps.workout.jsonstream import open_export
 from apps.workout.models import (
     CardioSeriesLog,
     Equipment,
@@ -17,374 +25,513 @@ from apps.workout.models import (
     Workout,
     WorkoutTemplate,
 )
+from apps.workout.records import refresh_personal_records
+from apps.workout.search import refresh_search_text
+from apps.workout.summaries import refresh_workout_summaries
+
+# Top-level sections in import order, with the sections they reference
+SECTIONS = {
+    "type_workouts": (),
+    "muscle_groups": (),
+    "equipment": (),
+    "exercises": ("muscle_groups", "equipment"),
+    "workouts": ("type_workouts",),
+    "strength_series_logs": ("exercises", "workouts"),
+    "strength_exercise_logs": ("exercises", "workouts"),
+    "cardio_series_logs": ("exercises", "workouts"),
+    "cardio_exercise_logs": ("exercises", "workouts"),
+    "one_exercices": ("exercises", "workouts"),
+    "workout_templates": ("type_workouts",),
+    "template_exercises": ("workout_templates", "exercises"),
+    "template_strength_series": ("template_exercises",),
+    "template_cardio_series": ("template_exercises",),
+}
 
 
 class Command(BaseCommand):
-    help = "Import all workout data from a JSON file"
+    help = "Import all workout data from a JSON or columnar (.jsonl.gz) export"
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--file",
             type=str,
             required=True,
-            help="Input JSON file path",
+            help="Input file path (JSON or gzipped columnar, detected automatically)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows per bulk statement (default: {DEFAULT_BATCH_SIZE})",
         )
 
     def handle(self, *args, **kwargs):
         input_path = kwargs["file"]
+        self.batch_size = kwargs["batch_size"]
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+
+        # {json_id: database id} maps built as each layer is imported so
+        # subsequent layers can resolve cross-references.
+        self.type_workout_map = {}
+        self.muscle_group_map = {}
+        self.equipment_map = {}
+        self.exercise_map = {}
+        self.workout_map = {}
+        self.template_map = {}
+        self.template_exercise_map = {}
+
+        self.stdout.write("Importing data...")
+        started = time.perf_counter()
 
         try:
-            with open(input_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open_export(input_path) as sections, transaction.atomic():
+                self.import_sections(sections)
+
+                refreshed = refresh_workout_summaries(self.workout_map.values())
+                self.stdout.write(
+                    self.style.SUCCESS(f"  Refreshed {refreshed} workout summaries")
+                )
+                refresh_personal_records(self.exercise_map.values())
+                self.stdout.write(self.style.SUCCESS("  Refreshed personal records"))
+                refresh_search_text(self.exercise_map.values())
+                bump_data_version(*ALL_STAMPS)
         except FileNotFoundError:
-            self.stdout.write(self.style.ERROR(f"File not found: {input_path}"))
-            return
+            raise CommandError(f"File not found: {input_path}")
         except json.JSONDecodeError as e:
-            self.stdout.write(self.style.ERROR(f"Invalid JSON file: {e}"))
-            return
+            raise CommandError(f"Invalid JSON file: {e}")
+        except (gzip.BadGzipFile, EOFError) as e:
+            raise CommandError(f"Invalid columnar file: {e}")
 
-        self.stdout.write("Importing data...")
+        elapsed = time.perf_counter() - started
+        rate = self.rows / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"All workout data imported successfully from {input_path} "
+                f"({self.rows} rows in {elapsed:.2f}s, {rate:.0f} rows/sec)"
+            )
+        )
+
+    def import_sections(self, sections):
+        """
+        Import the (key, items) sections of an export as they are parsed.
+
+        Exports list the tables in SECTIONS order, so every section streams
+        straight to the database in batches. A section that shows up before
+        the ones it references is spooled to a temporary file, one entry per
+        line, and imported once the whole document has been read.
+        """
+        imported = set()
+        deferred = {}
+        try:
+            for key, items in sections:
+                if key not in SECTIONS:
+                    continue
+                if all(dependency in imported for dependency in SECTIONS[key]):
+                    self.import_section(key, items)
+                    imported.add(key)
+                else:
+                    spool = deferred[key] = tempfile.TemporaryFile(
+                        "w+", encoding="utf-8"
+                    )
+                    for item in items:
+                        spool.write(json.dumps(item) + "\n")
+
+            for key in SECTIONS:
+                if key in deferred:
+                    spool = deferred[key]
+                    spool.seek(0)
+                    self.import_section(key, (json.loads(line) for line in spool))
+        finally:
+            for spool in deferred.values():
+                spool.close()
 
-        # Convert legacy aggregated logs to series format when present.
-        strength_series = data.get("strength_series_logs", [])
-        cardio_series = data.get("cardio_series_logs", [])
+    def import_section(self, key, items):
+        if key in ("strength_exercise_logs", "cardio_exercise_logs"):
+            # Legacy sections are only announced when they hold logs
+            items = iter(items)
+            first = next(items, None)
+            if first is None:
+                return
+            items = chain([first], items)
 
-        if data.get("strength_exercise_logs"):
+        if key == "strength_exercise_logs":
             self.stdout.write(
                 "  Detected legacy strength logs — converting to series format..."
             )
-            strength_series = strength_series + self.convert_legacy_strength_logs(
-                data["strength_exercise_logs"]
-            )
-        if data.get("cardio_exercise_logs"):
+            self.import_strength_series_logs(self.convert_legacy_strength_logs(items))
+        elif key == "cardio_exercise_logs":
             self.stdout.write(
                 "  Detected legacy cardio logs — converting to series format..."
             )
-            cardio_series = cardio_series + self.convert_legacy_cardio_logs(
-                data["cardio_exercise_logs"]
-            )
+            self.import_cardio_series_logs(self.convert_legacy_cardio_logs(items))
+        else:
+            getattr(self, f"import_{key}")(items)
 
-        # Build ID→object maps as we import each layer so subsequent
-        # layers can resolve cross-references without relying on DB IDs.
-        type_workout_map = self.import_type_workouts(data.get("type_workouts", []))
-        muscle_group_map = self.import_muscle_groups(data.get("muscle_groups", []))
-        equipment_map = self.import_equipment(data.get("equipment", []))
-        exercise_map = self.import_exercises(
-            data.get("exercises", []), muscle_group_map, equipment_map
-        )
-        workout_map = self.import_workouts(data.get("workouts", []), type_workout_map)
-        self.import_strength_series_logs(strength_series, exercise_map, workout_map)
-        self.import_cardio_series_logs(cardio_series, exercise_map, workout_map)
-        self.import_one_exercices(
-            data.get("one_exercices", []),
-            exercise_map,
-            workout_map,
-        )
-        template_map = self.import_workout_templates(
-            data.get("workout_templates", []), type_workout_map
-        )
-        template_exercise_map = self.import_template_exercises(
-            data.get("template_exercises", []), template_map, exercise_map
-        )
-        self.import_template_strength_series(
-            data.get("template_strength_series", []), template_exercise_map
-        )
-        self.import_template_cardio_series(
-            data.get("template_cardio_series", []), template_exercise_map
+    def batches(self, items):
+        """Split a stream of entries into lists of at most batch_size."""
+        iterator = iter(items)
+        while batch := list(islice(iterator, self.batch_size)):
+            yield batch
+
+    def upsert(self, model, rows, key_fields, value_fields):
+        """Run bulk_upsert() with the command's batch size."""
+        objects, created, updated = bulk_upsert(
+            model, rows, key_fields, value_fields, batch_size=self.batch_size
         )
+        self.rows += len(rows)
+        self.created += created
+        self.updated += updated
+        return objects
 
+    def report(self, count, label):
         self.stdout.write(
             self.style.SUCCESS(
-                f"All workout data imported successfully from {input_path}"
+                f"  Imported {count} {label} "
+                f"({self.created} new, {self.updated} updated)"
             )
         )
+        self.created = self.updated = 0
 
     def import_type_workouts(self, type_workouts):
-        """Return {json_id: TypeWorkout} map."""
-        id_map = {}
-        for tw_data in type_workouts:
-            obj, _ = TypeWorkout.objects.get_or_create(
-                name_workout=tw_data["name_workout"]
+        count = 0
+        for batch in self.batches(type_workouts):
+            objects = self.upsert(
+                TypeWorkout,
+                [{"name_workout": tw_data["name_workout"]} for tw_data in batch],
+                ["name_workout"],
+                [],
             )
-            id_map[tw_data["id"]] = obj
-        self.stdout.write(
-            self.style.SUCCESS(f"  Imported {len(type_workouts)} type workouts")
-        )
-        return id_map
+            for tw_data, obj in zip(batch, objects):
+                self.type_workout_map[tw_data["id"]] = obj.id
+            count += len(batch)
+        self.report(count, "type workouts")
 
     def import_muscle_groups(self, muscle_groups):
-        """Return {json_id: MuscleGroup} map."""
-        id_map = {}
-        for mg_data in muscle_groups:
-            obj, _ = MuscleGroup.objects.update_or_create(
-                name=mg_data["name"],
-                defaults={"description": mg_data.get("description", "")},
+        count = 0
+        for batch in self.batches(muscle_groups):
+            objects = self.upsert(
+                MuscleGroup,
+                [
+                    {
+                        "name": mg_data["name"],
+                        "description": mg_data.get("description", ""),
+                    }
+                    for mg_data in batch
+                ],
+                ["name"],
+                ["description"],
             )
-            id_map[mg_data["id"]] = obj
-        self.stdout.write(
-            self.style.SUCCESS(f"  Imported {len(muscle_groups)} muscle groups")
-        )
-        return id_map
+            for mg_data, obj in zip(batch, objects):
+                self.muscle_group_map[mg_data["id"]] = obj.id
+            count += len(batch)
+        self.report(count, "muscle groups")
 
     def import_equipment(self, equipment_list):
-        """Return {json_id: Equipment} map."""
-        id_map = {}
-        for eq_data in equipment_list:
-            obj, _ = Equipment.objects.update_or_create(
-                name=eq_data["name"],
-                defaults={"description": eq_data.get("description", "")},
+        count = 0
+        for batch in self.batches(equipment_list):
+            objects = self.upsert(
+                Equipment,
+                [
+                    {
+                        "name": eq_data["name"],
+                        "description": eq_data.get("description", ""),
+                    }
+                    for eq_data in batch
+                ],
+                ["name"],
+                ["description"],
             )
-            id_map[eq_data["id"]] = obj
-        self.stdout.write(
-            self.style.SUCCESS(f"  Imported {len(equipment_list)} equipment")
-        )
-        return id_map
-
-    def import_exercises(self, exercises, muscle_group_map, equipment_map):
-        """Return {json_id: Exercice} map."""
-        id_map = {}
-        for ex_data in exercises:
-            obj, _ = Exercice.objects.update_or_create(
-                name=ex_data["name"],
-                defaults={
-                    "exercise_type": ex_data["exercise_type"],
-                    "difficulty": ex_data.get("difficulty", ""),
-                },
+            for eq_data, obj in zip(batch, objects):
+                self.equipment_map[eq_data["id"]] = obj.id
+            count += len(batch)
+        self.report(count, "equipment")
+
+    def import_exercises(self, exercises):
+        count = 0
+        for batch in self.batches(exercises):
+            objects = self.upsert(
+                Exercice,
+                [
+                    {
+                        "name": ex_data["name"],
+                        "exercise_type": ex_data["exercise_type"],
+                        "difficulty": ex_data.get("difficulty", ""),
+                    }
+                    for ex_data in batch
+                ],
+                ["name"],
+                ["exercise_type", "difficulty"],
             )
-            if "muscle_groups" in ex_data:
-                mapped_mgs = [
-                    muscle_group_map[mg_id]
-                    for mg_id in ex_data["muscle_groups"]
-                    if mg_id in muscle_group_map
-                ]
-                obj.muscle_groups.set(mapped_mgs)
-            if "equipment" in ex_data:
-                mapped_eqs = [
-                    equipment_map[eq_id]
-                    for eq_id in ex_data["equipment"]
-                    if eq_id in equipment_map
-                ]
-                obj.equipment.set(mapped_eqs)
-            id_map[ex_data["id"]] = obj
-        self.stdout.write(self.style.SUCCESS(f"  Imported {len(exercises)} exercises"))
-        return id_map
-
-    def import_workouts(self, workouts, type_workout_map):
-        """Return {json_id: Workout} map."""
-        id_map = {}
-        for w_data in workouts:
-            type_workout = type_workout_map.get(w_data.get("type_workout_id"))
-            date = datetime.strptime(w_data["date"], "%Y-%m-%d").date()
-            obj, _ = Workout.objects.update_or_create(
-                date=date,
-                type_workout=type_workout,
-                defaults={"duration": w_data.get("duration", 0)},
+
+            # M2M links are replaced as a whole, like .set(); later entries win
+            muscle_groups = {}
+            equipment = {}
+            for ex_data, obj in zip(batch, objects):
+                self.exercise_map[ex_data["id"]] = obj.id
+                if "muscle_groups" in ex_data:
+                    muscle_groups[obj.id] = {
+                        self.muscle_group_map[mg_id]
+                        for mg_id in ex_data["muscle_groups"]
+                        if mg_id in self.muscle_group_map
+                    }
+                if "equipment" in ex_data:
+                    equipment[obj.id] = {
+                        self.equipment_map[eq_id]
+                        for eq_id in ex_data["equipment"]
+                        if eq_id in self.equipment_map
+                    }
+            bulk_set_m2m(Exercice.muscle_groups, muscle_groups, self.batch_size)
+            bulk_set_m2m(Exercice.equipment, equipment, self.batch_size)
+            count += len(batch)
+        self.report(count, "exercises")
+
+    def import_workouts(self, workouts):
+        count = 0
+        for batch in self.batches(workouts):
+            rows = [
+                {
+                    "date": datetime.strptime(w_data["date"], "%Y-%m-%d").date(),
+                    "type_workout_id": self.type_workout_map.get(
+                        w_data.get("type_workout_id")
+                    ),
+                    "duration": w_data.get("duration", 0),
+                }
+                for w_data in batch
+            ]
+            objects = self.upsert(
+                Workout, rows, ["date", "type_workout_id"], ["duration"]
             )
-            id_map[w_data["id"]] = obj
-        self.stdout.write(self.style.SUCCESS(f"  Imported {len(workouts)} workouts"))
-        return id_map
-
-    def import_strength_series_logs(
-        self, strength_series_logs, exercise_map, workout_map
-    ):
-        """Return {json_id: StrengthSeriesLog} map."""
-        id_map = {}
-        imported = 0
-        for ssl_data in strength_series_logs:
-            exercise = exercise_map.get(ssl_data["exercise_id"])
-            workout = workout_map.get(ssl_data["workout_id"])
-            if not exercise or not workout:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"  Skipping strength series log "
-                        f"(exercise_id={ssl_data['exercise_id']}, "
-                        f"workout_id={ssl_data['workout_id']}): "
-                        f"exercise or workout not found in map"
+            for w_data, obj in zip(batch, objects):
+                self.workout_map[w_data["id"]] = obj.id
+            count += len(batch)
+        self.report(count, "workouts")
+
+    def import_strength_series_logs(self, strength_series_logs):
+        count = 0
+        for batch in self.batches(strength_series_logs):
+            rows = []
+            for ssl_data in batch:
+                exercise_id = self.exercise_map.get(ssl_data["exercise_id"])
+                workout_id = self.workout_map.get(ssl_data["workout_id"])
+                if not exercise_id or not workout_id:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"  Skipping strength series log "
+                            f"(exercise_id={ssl_data['exercise_id']}, "
+                            f"workout_id={ssl_data['workout_id']}): "
+                            f"exercise or workout not found in map"
+                        )
                     )
+                    continue
+                rows.append(
+                    {
+                        "workout_id": workout_id,
+                        "exercise_id": exercise_id,
+                        "series_number": ssl_data["series_number"],
+                        "reps": ssl_data.get("reps"),
+                        "weight": ssl_data.get("weight"),
+                    }
                 )
-                continue
-            obj, _ = StrengthSeriesLog.objects.update_or_create(
-                exercise=exercise,
-                workout=workout,
-                series_number=ssl_data["series_number"],
-                defaults={
-                    "reps": ssl_data.get("reps"),
-                    "weight": ssl_data.get("weight"),
-                },
+            self.upsert(
+                StrengthSeriesLog,
+                rows,
+                ["workout_id", "exercise_id", "series_number"],
+                ["reps", "weight"],
             )
-            if "id" in ssl_data:
-                id_map[ssl_data["id"]] = obj
-            imported += 1
-        self.stdout.write(
-            self.style.SUCCESS(f"  Imported {imported} strength series logs")
-        )
-        return id_map
-
-    def import_cardio_series_logs(self, cardio_series_logs, exercise_map, workout_map):
-        """Return {json_id: CardioSeriesLog} map."""
-        id_map = {}
-        imported = 0
-        for csl_data in cardio_series_logs:
-            exercise = exercise_map.get(csl_data["exercise_id"])
-            workout = workout_map.get(csl_data["workout_id"])
-            if not exercise or not workout:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"  Skipping cardio series log "
-                        f"(exercise_id={csl_data['exercise_id']}, "
-                        f"workout_id={csl_data['workout_id']}): "
-                        f"exercise or workout not found in map"
+            count += len(rows)
+        self.report(count, "strength series logs")
+
+    def import_cardio_series_logs(self, cardio_series_logs):
+        count = 0
+        for batch in self.batches(cardio_series_logs):
+            rows = []
+            for csl_data in batch:
+                exercise_id = self.exercise_map.get(csl_data["exercise_id"])
+                workout_id = self.workout_map.get(csl_data["workout_id"])
+                if not exercise_id or not workout_id:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"  Skipping cardio series log "
+                            f"(exercise_id={csl_data['exercise_id']}, "
+                            f"workout_id={csl_data['workout_id']}): "
+                            f"exercise or workout not found in map"
+                        )
                     )
+                    continue
+                rows.append(
+                    {
+                        "workout_id": workout_id,
+                        "exercise_id": exercise_id,
+                        "series_number": csl_data["series_number"],
+                        "duration_seconds": csl_data.get("duration_seconds"),
+                        "distance_m": csl_data.get("distance_m"),
+                    }
                 )
-                continue
-            obj, _ = CardioSeriesLog.objects.update_or_create(
-                exercise=exercise,
-                workout=workout,
-                series_number=csl_data["series_number"],
-                defaults={
-                    "duration_seconds": csl_data.get("duration_seconds"),
-                    "distance_m": csl_data.get("distance_m"),
-                },
+            self.upsert(
+                CardioSeriesLog,
+                rows,
+                ["workout_id", "exercise_id", "series_number"],
+                ["duration_seconds", "distance_m"],
             )
-            if "id" in csl_data:
-                id_map[csl_data["id"]] = obj
-            imported += 1
-        self.stdout.write(
-            self.style.SUCCESS(f"  Imported {imported} cardio series logs")
-        )
-        return id_map
-
-    def import_one_exercices(self, one_exercices, exercise_map, workout_map):
-        imported = 0
-        for oe_data in one_exercices:
-            exercise = exercise_map.get(oe_data["exercise_id"])
-            workout = workout_map.get(oe_data["workout_id"])
-            if not exercise or not workout:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"  Skipping OneExercice "
-                        f"(exercise_id={oe_data['exercise_id']}, "
-                        f"workout_id={oe_data['workout_id']}): "
-                        f"exercise or workout not found in map"
+            count += len(rows)
+        self.report(count, "cardio series logs")
+
+    def import_one_exercices(self, one_exercices):
+        count = 0
+        for batch in self.batches(one_exercices):
+            rows = []
+            for oe_data in batch:
+                exercise_id = self.exercise_map.get(oe_data["exercise_id"])
+                workout_id = self.workout_map.get(oe_data["workout_id"])
+                if not exercise_id or not workout_id:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"  Skipping OneExercice "
+                            f"(exercise_id={oe_data['exercise_id']}, "
+                            f"workout_id={oe_data['workout_id']}): "
+                            f"exercise or workout not found in map"
+                        )
                     )
+                    continue
+                rows.append(
+                    {
+                        "seance_id": workout_id,
+                        "position": oe_data["position"],
+                        "name_id": exercise_id,
+                    }
                 )
-                continue
+            self.upsert(OneExercice, rows, ["seance_id", "position"], ["name_id"])
+            count += len(rows)
+        self.report(count, "one exercices")
 
-            OneExercice.objects.update_or_create(
-                seance=workout,
-                position=oe_data["position"],
-                defaults={"name": exercise},
-            )
-            imported += 1
-        self.stdout.write(self.style.SUCCESS(f"  Imported {imported} one exercices"))
-
-    def import_workout_templates(self, workout_templates, type_workout_map):
-        """Return {json_id: WorkoutTemplate} map."""
-        id_map = {}
-        for wt_data in workout_templates:
-            type_workout = type_workout_map.get(wt_data.get("type_workout_id"))
-            obj, _ = WorkoutTemplate.objects.update_or_create(
-                name=wt_data["name"],
-                defaults={
-                    "type_workout": type_workout,
+    def import_workout_templates(self, workout_templates):
+        count = 0
+        for batch in self.batches(workout_templates):
+            rows = [
+                {
+                    "name": wt_data["name"],
+                    "type_workout_id": self.type_workout_map.get(
+                        wt_data.get("type_workout_id")
+                    ),
                     "duration": wt_data.get("duration", 0),
                     "is_active": wt_data.get("is_active", True),
-                },
+                }
+                for wt_data in batch
+            ]
+            objects = self.upsert(
+                WorkoutTemplate,
+                rows,
+                ["name"],
+                ["type_workout_id", "duration", "is_active"],
             )
-            id_map[wt_data["id"]] = obj
-        self.stdout.write(
-            self.style.SUCCESS(f"  Imported {len(workout_templates)} workout templates")
-        )
-        return id_map
-
-    def import_template_exercises(self, template_exercises, template_map, exercise_map):
-        """Return {json_id: TemplateExercise} map."""
-        id_map = {}
-        imported = 0
-        for te_data in template_exercises:
-            template = template_map.get(te_data["template_id"])
-            exercise = exercise_map.get(te_data["exercise_id"])
-            if not template or not exercise:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"  Skipping TemplateExercise "
-                        f"(template_id={te_data['template_id']}, "
-                        f"exercise_id={te_data['exercise_id']}): "
-                        f"template or exercise not found in map"
+            for wt_data, obj in zip(batch, objects):
+                self.template_map[wt_data["id"]] = obj.id
+            count += len(batch)
+        self.report(count, "workout templates")
+
+    def import_template_exercises(self, template_exercises):
+        count = 0
+        for batch in self.batches(template_exercises):
+            entries = []
+            rows = []
+            for te_data in batch:
+                template_id = self.template_map.get(te_data["template_id"])
+                exercise_id = self.exercise_map.get(te_data["exercise_id"])
+                if not template_id or not exercise_id:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"  Skipping TemplateExercise "
+                            f"(template_id={te_data['template_id']}, "
+                            f"exercise_id={te_data['exercise_id']}): "
+                            f"template or exercise not found in map"
+                        )
                     )
+                    continue
+                entries.append(te_data)
+                rows.append(
+                    {
+                        "template_id": template_id,
+                        "position": te_data["position"],
+                        "exercise_id": exercise_id,
+                    }
                 )
-                continue
-            obj, _ = TemplateExercise.objects.update_or_create(
-                template=template,
-                position=te_data["position"],
-                defaults={"exercise": exercise},
+            objects = self.upsert(
+                TemplateExercise, rows, ["template_id", "position"], ["exercise_id"]
             )
-            id_map[te_data["id"]] = obj
-            imported += 1
-        self.stdout.write(
-            self.style.SUCCESS(f"  Imported {imported} template exercises")
-        )
-        return id_map
-
-    def import_template_strength_series(
-        self, template_strength_series, template_exercise_map
-    ):
-        imported = 0
-        for tss_data in template_strength_series:
-            template_exercise = template_exercise_map.get(
-                tss_data["template_exercise_id"]
-            )
-            if not template_exercise:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"  Skipping TemplateStrengthSeries "
-                        f"(template_exercise_id={tss_data['template_exercise_id']}): "
-                        f"template exercise not found in map"
+            for te_data, obj in zip(entries, objects):
+                self.template_exercise_map[te_data["id"]] = obj.id
+            count += len(rows)
+        self.report(count, "template exercises")
+
+    def import_template_strength_series(self, template_strength_series):
+        count = 0
+        for batch in self.batches(template_strength_series):
+            rows = []
+            for tss_data in batch:
+                template_exercise_id = self.template_exercise_map.get(
+                    tss_data["template_exercise_id"]
+                )
+                if not template_exercise_id:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"  Skipping TemplateStrengthSeries "
+                            f"(template_exercise_id={tss_data['template_exercise_id']}): "
+                            f"template exercise not found in map"
+                        )
                     )
+                    continue
+                rows.append(
+                    {
+                        "template_exercise_id": template_exercise_id,
+                        "series_number": tss_data["series_number"],
+                        "reps": tss_data.get("reps"),
+                        "weight": tss_data.get("weight"),
+                    }
                 )
-                continue
-            TemplateStrengthSeries.objects.update_or_create(
-                template_exercise=template_exercise,
-                series_number=tss_data["series_number"],
-                defaults={
-                    "reps": tss_data.get("reps"),
-                    "weight": tss_data.get("weight"),
-                },
+            self.upsert(
+                TemplateStrengthSeries,
+                rows,
+                ["template_exercise_id", "series_number"],
+                ["reps", "weight"],
             )
-            imported += 1
-        self.stdout.write(
-            self.style.SUCCESS(f"  Imported {imported} template strength series")
-        )
+            count += len(rows)
+        self.report(count, "template strength series")
 
-    def import_template_cardio_series(
-        self, template_cardio_series, template_exercise_map
-    ):
-        imported = 0
-        for tcs_data in template_cardio_series:
-            template_exercise = template_exercise_map.get(
-                tcs_data["template_exercise_id"]
-            )
-            if not template_exercise:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"  Skipping TemplateCardioSeries "
-                        f"(template_exercise_id={tcs_data['template_exercise_id']}): "
-                        f"template exercise not found in map"
+    def import_template_cardio_series(self, template_cardio_series):
+        count = 0
+        for batch in self.batches(template_cardio_series):
+            rows = []
+            for tcs_data in batch:
+                template_exercise_id = self.template_exercise_map.get(
+                    tcs_data["template_exercise_id"]
+                )
+                if not template_exercise_id:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"  Skipping TemplateCardioSeries "
+                            f"(template_exercise_id={tcs_data['template_exercise_id']}): "
+                            f"template exercise not found in map"
+                        )
                     )
+                    continue
+                rows.append(
+                    {
+                        "template_exercise_id": template_exercise_id,
+                        "series_number": tcs_data["series_number"],
+                        "duration_seconds": tcs_data.get("duration_seconds"),
+                        "distance_m": tcs_data.get("distance_m"),
+                    }
                 )
-                continue
-            TemplateCardioSeries.objects.update_or_create(
-                template_exercise=template_exercise,
-                series_number=tcs_data["series_number"],
-                defaults={
-                    "duration_seconds": tcs_data.get("duration_seconds"),
-                    "distance_m": tcs_data.get("distance_m"),
-                },
+            self.upsert(
+                TemplateCardioSeries,
+                rows,
+                ["template_exercise_id", "series_number"],
+                ["duration_seconds", "distance_m"],
             )
-            imported += 1
-        self.stdout.write(
-            self.style.SUCCESS(f"  Imported {imported} template cardio series")
-        )
+            count += len(rows)
+        self.report(count, "template cardio series")
 
     def convert_legacy_strength_logs(self, strength_exercise_logs):
         """Expand old aggregated strength logs into per-series dicts.
@@ -392,47 +539,41 @@ class Command(BaseCommand):
         A single StrengthExerciseLog with nb_series=3 becomes three entries
         with series_number 1, 2, 3, each carrying the same reps and weight.
         Multiple logs for the same (exercise_id, workout_id) are numbered
-        sequentially without collision.
+        sequentially without collision. Entries are yielded lazily so the
+        logs can be streamed.
         """
         series_counter: dict = {}  # (exercise_id, workout_id) -> next series_number
-        converted = []
         for sl in strength_exercise_logs:
             key = (sl["exercise_id"], sl["workout_id"])
             next_num = series_counter.get(key, 1)
             nb_series = sl.get("nb_series", 1)
             for i in range(nb_series):
-                converted.append(
-                    {
-                        "exercise_id": sl["exercise_id"],
-                        "workout_id": sl["workout_id"],
-                        "series_number": next_num + i,
-                        "reps": sl.get("nb_repetition"),
-                        "weight": sl.get("weight"),
-                    }
-                )
+                yield {
+                    "exercise_id": sl["exercise_id"],
+                    "workout_id": sl["workout_id"],
+                    "series_number": next_num + i,
+                    "reps": sl.get("nb_repetition"),
+                    "weight": sl.get("weight"),
+                }
             series_counter[key] = next_num + nb_series
-        return converted
 
     def convert_legacy_cardio_logs(self, cardio_exercise_logs):
         """Convert old aggregated cardio logs into per-series dicts.
 
         Each CardioExerciseLog becomes one series entry (series_number=1).
         Multiple logs for the same (exercise_id, workout_id) are numbered
-        sequentially without collision.
+        sequentially without collision. Entries are yielded lazily so the
+        logs can be streamed.
         """
         series_counter: dict = {}  # (exercise_id, workout_id) -> next series_number
-        converted = []
         for cl in cardio_exercise_logs:
             key = (cl["exercise_id"], cl["workout_id"])
             next_num = series_counter.get(key, 1)
-            converted.append(
-                {
-                    "exercise_id": cl["exercise_id"],
-                    "workout_id": cl["workout_id"],
-                    "series_number": next_num,
-                    "duration_seconds": cl.get("duration_seconds"),
-                    "distance_m": cl.get("distance_m"),
-                }
-            )
+            yield {
+                "exercise_id": cl["exercise_id"],
+                "workout_id": cl["workout_id"],
+                "series_number": next_num,
+                "duration_seconds": cl.get("duration_seconds"),
+                "distance_m": cl.get("distance_m"),
+            }
             series_counter[key] = next_num + 1
-        return converted
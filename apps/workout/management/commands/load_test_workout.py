@@ -0,0 +1,166 @@
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY,
+    HASH_SESSION_KEY,
+    SESSION_KEY,
+    get_user_model,
+)
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+
+def read_only_endpoints() -> list[tuple[str, str]]:
+    """(name, url) of the read-only JSON endpoints the pages poll"""
+    today = date.today()
+    range_start = (today - timedelta(days=90)).isoformat()
+    return [
+        ("get_reference_data", reverse("get_reference_data")),
+        ("get_template_list", reverse("get_template_list")),
+        ("get_calendar_data", f"{reverse('get_calendar_data')}?year={today.year}"),
+        ("get_dashboard_data", reverse("get_dashboard_data")),
+        (
+            "get_dashboard_data_90_days",
+            f"{reverse('get_dashboard_data')}?start_date={range_start}"
+            f"&end_date={today.isoformat()}",
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the read-only workout endpoints of a running server with "
+        "concurrent clients and print throughput and latencies as JSON. Run it "
+        "once against each deployment (WEB_SERVER_MODE=wsgi and asgi) to "
+        "compare them. Logs in by creating a session in the configured "
+        "database, which must be the one the server uses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://localhost:8000",
+            help="Server to test (default: http://localhost:8000)",
+        )
+        parser.add_argument(
+            "--username",
+            required=True,
+            help="User the requests are made as",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=20,
+            help="Simultaneous clients (default: 20)",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=20,
+            help="Seconds to run for (default: 20)",
+        )
+        parser.add_argument(
+            "--label",
+            default="",
+            help="Free text stored with the results, e.g. the server mode",
+        )
+
+    def handle(self, *args, **kwargs):
+        base_url = kwargs["base_url"].rstrip("/")
+        session_key = self.login(kwargs["username"])
+        cookie = f"{settings.SESSION_COOKIE_NAME}={session_key}"
+        targets = read_only_endpoints()
+
+        timings = defaultdict(list)
+        errors = defaultdict(int)
+        lock = threading.Lock()
+        deadline = time.monotonic() + kwargs["duration"]
+
+        def client(offset):
+            # Each client walks the endpoints from a different starting point
+            sent = offset
+            while time.monotonic() < deadline:
+                name, url = targets[sent % len(targets)]
+                sent += 1
+                request = urllib.request.Request(
+                    base_url + url, headers={"Cookie": cookie}
+                )
+                started = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request, timeout=30) as response:
+                        response.read()
+                        ok = response.status == 200
+                except (urllib.error.URLError, OSError):
+                    ok = False
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    if ok:
+                        timings[name].append(elapsed)
+                    else:
+                        errors[name] += 1
+
+        self.stderr.write(
+            f"Running {kwargs['concurrency']} clients for {kwargs['duration']}s "
+            f"against {base_url}..."
+        )
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=kwargs["concurrency"]) as executor:
+            list(executor.map(client, range(kwargs["concurrency"])))
+        elapsed = time.perf_counter() - started
+
+        total = sum(len(values) for values in timings.values())
+        if not total:
+            raise CommandError(f"No successful request to {base_url}")
+
+        results = {
+            "label": kwargs["label"],
+            "base_url": base_url,
+            "concurrency": kwargs["concurrency"],
+            "seconds": round(elapsed, 2),
+            "requests": total,
+            "errors": sum(errors.values()),
+            "requests_per_second": round(total / elapsed, 1),
+            "all": self.latencies([v for values in timings.values() for v in values]),
+            "endpoints": {
+                name: {**self.latencies(timings[name]), "errors": errors[name]}
+                for name, _url in targets
+            },
+        }
+        self.stdout.write(json.dumps(results, indent=2))
+
+    @staticmethod
+    def login(username):
+        """Create a session for ``username`` and return its key"""
+        try:
+            user = get_user_model().objects.get(username=username)
+        except get_user_model().DoesNotExist as e:
+            raise CommandError(f"Unknown user {username!r}") from e
+
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        return session.session_key
+
+    @staticmethod
+    def latencies(values):
+        if not values:
+            return {"requests": 0}
+        values = sorted(values)
+        return {
+            "requests": len(values),
+            "median_ms": round(statistics.median(values), 2),
+            "p95_ms": round(values[int(len(values) * 0.95) - 1], 2),
+            "max_ms": round(values[-1], 2),
+        }
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.workout.cache import bump_data_version
+from apps.workout.records import rebuild_all_personal_records
+
+
+class Command(BaseCommand):
+    help = "Recompute the PersonalRecord index from every strength series"
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write("Rebuilding personal records...")
+
+        with transaction.atomic():
+            rebuilt = rebuild_all_personal_records()
+            bump_data_version()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {rebuilt} personal records successfully.")
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.workout.cache import bump_data_version
+from apps.workout.search import rebuild_all_search_text
+
+
+class Command(BaseCommand):
+    help = "Recompute the exercise library search text of every exercise"
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write("Rebuilding exercise search text...")
+
+        with transaction.atomic():
+            rebuilt = rebuild_all_search_text()
+            bump_data_version()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt the search text of {rebuilt} exercises.")
+        )
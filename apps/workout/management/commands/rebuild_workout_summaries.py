@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.workout.cache import bump_data_version
+from apps.workout.summaries import rebuild_all_workout_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized WorkoutSummary row of every workout"
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write("Rebuilding workout summaries...")
+
+        with transaction.atomic():
+            rebuilt = rebuild_all_workout_summaries()
+            bump_data_version()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {rebuilt} workout summaries successfully.")
+        )
@@ -0,0 +1,183 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetrics:
+    """Query count, DB time, total time and size of one response"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.size = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Database execute wrapper, see connection.execute_wrapper()
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def db_ms(self) -> float:
+        return self.db_time * 1000
+
+    def slow_reasons(self) -> list[str]:
+        """Names of the thresholds this request went over"""
+        reasons = []
+        if self.queries > settings.SLOW_REQUEST_QUERIES:
+            reasons.append("queries")
+        if self.db_ms > settings.SLOW_REQUEST_DB_MS:
+            reasons.append("db")
+        if self.total_ms > settings.SLOW_REQUEST_MS:
+            reasons.append("total")
+        return reasons
+
+
+# Metrics of the request being served. Database connections belong to one
+# thread and an async view runs its queries in a worker thread, so queries are
+# attributed through this context variable (copied into sync_to_async threads)
+# rather than through wrappers added to the caller's own connections.
+current_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_metrics", default=None
+)
+
+
+def count_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection, see record_queries()"""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_counter(connection, **kwargs):
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+connection_created.connect(install_query_counter)
+
+
+@contextmanager
+def record_queries(metrics: RequestMetrics):
+    """Count the queries run in this context, on any connection, into ``metrics``"""
+    for connection in connections.all(initialized_only=True):
+        install_query_counter(connection)
+    token = current_metrics.set(metrics)
+    try:
+        yield
+    finally:
+        current_metrics.reset(token)
+
+
+class RequestMetricsMiddleware:
+    """
+    Measure the requests under REQUEST_METRICS_PATHS.
+
+    The query count, DB time and total time go in a Server-Timing header
+    (shown by the browser dev tools) and, with the response size, in one
+    log line per request. Requests over the SLOW_REQUEST_* thresholds are
+    logged as warnings. Streamed responses are logged once fully sent, so
+    their figures include the queries run while streaming.
+
+    Works in both sync and async chains, so async views served over ASGI
+    are not pushed back to a thread by this middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not request.path.startswith(tuple(settings.REQUEST_METRICS_PATHS)):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        with record_queries(metrics):
+            response = self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not request.path.startswith(tuple(settings.REQUEST_METRICS_PATHS)):
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        with record_queries(metrics):
+            response = await self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        response["Server-Timing"] = (
+            f'db;dur={metrics.db_ms:.1f};desc="{metrics.queries} queries", '
+            f"total;dur={metrics.total_ms:.1f}"
+        )
+
+        if response.streaming:
+            stream = self.astream if response.is_async else self.stream
+            response.streaming_content = stream(
+                request, response, response.streaming_content, metrics
+            )
+        else:
+            metrics.size = len(response.content)
+            self.log(request, response, metrics)
+        return response
+
+    def stream(self, request, response, content, metrics):
+        with record_queries(metrics):
+            try:
+                for chunk in content:
+                    metrics.size += len(chunk)
+                    yield chunk
+            finally:
+                self.log(request, response, metrics)
+
+    async def astream(self, request, response, content, metrics):
+        with record_queries(metrics):
+            try:
+                async for chunk in content:
+                    metrics.size += len(chunk)
+                    yield chunk
+            finally:
+                self.log(request, response, metrics)
+
+    def log(self, request, response, metrics):
+        slow = metrics.slow_reasons()
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": metrics.queries,
+            "db_ms": round(metrics.db_ms, 1),
+            "total_ms": round(metrics.total_ms, 1),
+            "bytes": metrics.size,
+        }
+        if slow:
+            fields["slow"] = ",".join(slow)
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"request_metrics": fields},
+        )
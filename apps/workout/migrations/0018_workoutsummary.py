@@ -0,0 +1,66 @@
+# Generated by Django 5.1.15 on 2026-10-18 17:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+
+
+def backfill_workout_summaries(apps, schema_editor):
+    """Create a WorkoutSummary for every existing workout"""
+    Workout = apps.get_model("workout", "Workout")
+    WorkoutSummary = apps.get_model("workout", "WorkoutSummary")
+
+    for workout in Workout.objects.all():
+        strength = workout.strength_series_logs.aggregate(
+            count=Count("id"), volume=Sum(F("reps") * F("weight"))
+        )
+        muscle_groups = set()
+        for logs in (workout.strength_series_logs, workout.cardio_series_logs):
+            muscle_groups.update(
+                logs.filter(exercise__muscle_groups__isnull=False).values_list(
+                    "exercise__muscle_groups__name", flat=True
+                )
+            )
+        WorkoutSummary.objects.create(
+            workout=workout,
+            exercise_count=workout.oneexercice_set.count(),
+            strength_series_count=strength["count"],
+            cardio_series_count=workout.cardio_series_logs.count(),
+            total_volume=strength["volume"] or 0,
+            muscle_groups=sorted(muscle_groups),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workout", "0017_remove_oneexercice_generic_fk"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkoutSummary",
+            fields=[
+                (
+                    "workout",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="workout.workout",
+                    ),
+                ),
+                ("exercise_count", models.IntegerField(default=0)),
+                ("strength_series_count", models.IntegerField(default=0)),
+                ("cardio_series_count", models.IntegerField(default=0)),
+                ("total_volume", models.IntegerField(default=0)),
+                ("muscle_groups", models.JSONField(blank=True, default=list)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Workout summaries",
+            },
+        ),
+        migrations.RunPython(backfill_workout_summaries, migrations.RunPython.noop),
+    ]
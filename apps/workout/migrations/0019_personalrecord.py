@@ -0,0 +1,92 @@
+# Generated by Django 5.1.15 on 2026-10-18 17:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_personal_records(apps, schema_editor):
+    """Build the PersonalRecord index from existing strength series"""
+    StrengthSeriesLog = apps.get_model("workout", "StrengthSeriesLog")
+    PersonalRecord = apps.get_model("workout", "PersonalRecord")
+
+    records = {}
+    logs = (
+        StrengthSeriesLog.objects.filter(weight__gt=0)
+        .select_related("workout")
+        .order_by("workout__date", "id")
+    )
+    for log in logs.iterator():
+        day = log.workout.date
+        one_rm = log.weight * (1 + log.reps / 30)
+        volume = log.reps * log.weight
+        record = records.get(log.exercise_id)
+        if record is None:
+            records[log.exercise_id] = PersonalRecord(
+                exercise_id=log.exercise_id,
+                max_weight=log.weight,
+                max_weight_date=day,
+                max_weight_workout_id=log.workout_id,
+                best_estimated_1rm=one_rm,
+                best_estimated_1rm_date=day,
+                best_set_volume=volume,
+                best_set_volume_date=day,
+            )
+            continue
+        # Logs are in date order, so ties go to the most recent workout
+        if log.weight >= record.max_weight:
+            record.max_weight = log.weight
+            record.max_weight_date = day
+            record.max_weight_workout_id = log.workout_id
+        if one_rm >= record.best_estimated_1rm:
+            record.best_estimated_1rm = one_rm
+            record.best_estimated_1rm_date = day
+        if volume >= record.best_set_volume:
+            record.best_set_volume = volume
+            record.best_set_volume_date = day
+
+    PersonalRecord.objects.bulk_create(records.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workout", "0018_workoutsummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonalRecord",
+            fields=[
+                (
+                    "exercise",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="personal_record",
+                        serialize=False,
+                        to="workout.exercice",
+                    ),
+                ),
+                ("max_weight", models.IntegerField()),
+                ("max_weight_date", models.DateField()),
+                ("best_estimated_1rm", models.FloatField()),
+                ("best_estimated_1rm_date", models.DateField()),
+                ("best_set_volume", models.IntegerField()),
+                ("best_set_volume_date", models.DateField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "max_weight_workout",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="workout.workout",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-max_weight"],
+            },
+        ),
+        migrations.RunPython(backfill_personal_records, migrations.RunPython.noop),
+    ]
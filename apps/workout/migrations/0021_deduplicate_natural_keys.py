@@ -0,0 +1,138 @@
+# Generated by Django 5.1.15
+
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def merge_duplicate_type_workouts(apps, schema_editor):
+    """Point workouts and templates at the oldest type of each name"""
+    TypeWorkout = apps.get_model("workout", "TypeWorkout")
+    Workout = apps.get_model("workout", "Workout")
+    WorkoutTemplate = apps.get_model("workout", "WorkoutTemplate")
+
+    for keeper_id, duplicate_ids in _duplicates(TypeWorkout, "name_workout"):
+        Workout.objects.filter(type_workout_id__in=duplicate_ids).update(
+            type_workout_id=keeper_id
+        )
+        WorkoutTemplate.objects.filter(type_workout_id__in=duplicate_ids).update(
+            type_workout_id=keeper_id
+        )
+        TypeWorkout.objects.filter(id__in=duplicate_ids).delete()
+
+
+def merge_duplicate_exercises(apps, schema_editor):
+    """Move the logs, templates, tags and records of each name to its oldest exercise"""
+    Exercice = apps.get_model("workout", "Exercice")
+    PersonalRecord = apps.get_model("workout", "PersonalRecord")
+
+    for keeper_id, duplicate_ids in _duplicates(Exercice, "name"):
+        for model_name, field in (
+            ("StrengthSeriesLog", "exercise_id"),
+            ("CardioSeriesLog", "exercise_id"),
+            ("OneExercice", "name_id"),
+            ("TemplateExercise", "exercise_id"),
+        ):
+            apps.get_model("workout", model_name).objects.filter(
+                **{f"{field}__in": duplicate_ids}
+            ).update(**{field: keeper_id})
+
+        keeper = Exercice.objects.get(id=keeper_id)
+        for duplicate in Exercice.objects.filter(id__in=duplicate_ids):
+            keeper.muscle_groups.add(*duplicate.muscle_groups.all())
+            keeper.equipment.add(*duplicate.equipment.all())
+
+        # The best set of the merged history is the best of the records
+        records = list(
+            PersonalRecord.objects.filter(exercise_id__in=[keeper_id, *duplicate_ids])
+        )
+        if records:
+            merged = PersonalRecord(exercise_id=keeper_id)
+            for value, day, extra in (
+                ("max_weight", "max_weight_date", ["max_weight_workout_id"]),
+                ("best_estimated_1rm", "best_estimated_1rm_date", []),
+                ("best_set_volume", "best_set_volume_date", []),
+            ):
+                best = max(records, key=lambda r: (getattr(r, value), getattr(r, day)))
+                for field in [value, day, *extra]:
+                    setattr(merged, field, getattr(best, field))
+            PersonalRecord.objects.filter(exercise_id__in=duplicate_ids).delete()
+            merged.save()
+
+        Exercice.objects.filter(id__in=duplicate_ids).delete()
+
+
+def renumber_duplicate_rows(apps, schema_editor):
+    """
+    Renumber the rows sharing a position or series number within their parent.
+
+    Series of an exercise logged twice in one workout are numbered in the
+    order they were saved, which is how the forms now number them.
+    """
+    for model_name, group_fields, number_field, order_by in (
+        ("StrengthSeriesLog", ["workout_id", "exercise_id"], "series_number", ["id"]),
+        ("CardioSeriesLog", ["workout_id", "exercise_id"], "series_number", ["id"]),
+        ("OneExercice", ["seance_id"], "position", ["position", "id"]),
+        ("TemplateExercise", ["template_id"], "position", ["position", "id"]),
+        (
+            "TemplateStrengthSeries",
+            ["template_exercise_id"],
+            "series_number",
+            ["id"],
+        ),
+        ("TemplateCardioSeries", ["template_exercise_id"], "series_number", ["id"]),
+    ):
+        model = apps.get_model("workout", model_name)
+        duplicated_groups = {
+            tuple(row[field] for field in group_fields)
+            for row in model.objects.values(*group_fields, number_field)
+            .annotate(count=Count("id"))
+            .filter(count__gt=1)
+        }
+
+        to_update = []
+        for group in duplicated_groups:
+            rows = model.objects.filter(**dict(zip(group_fields, group))).order_by(
+                *order_by
+            )
+            for number, row in enumerate(rows, start=1):
+                if getattr(row, number_field) != number:
+                    setattr(row, number_field, number)
+                    to_update.append(row)
+        model.objects.bulk_update(to_update, [number_field], batch_size=1000)
+
+
+def _duplicates(model, field):
+    """Yield (oldest id, [other ids]) for each value of ``field`` used twice"""
+    ids_by_value = defaultdict(list)
+    duplicated = (
+        model.objects.values(field).annotate(count=Count("id")).filter(count__gt=1)
+    )
+    for row in model.objects.filter(
+        **{f"{field}__in": duplicated.values(field)}
+    ).order_by("id"):
+        ids_by_value[getattr(row, field)].append(row.id)
+    for keeper_id, *duplicate_ids in ids_by_value.values():
+        yield keeper_id, duplicate_ids
+
+
+class Migration(migrations.Migration):
+    """
+    Clean up the rows that would violate the unique constraints added in 0022.
+
+    Kept apart from the schema changes so that the updated rows are committed
+    before the tables are altered.
+    """
+
+    dependencies = [
+        ("workout", "0020_dataversion"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_type_workouts, migrations.RunPython.noop
+        ),
+        migrations.RunPython(merge_duplicate_exercises, migrations.RunPython.noop),
+        migrations.RunPython(renumber_duplicate_rows, migrations.RunPython.noop),
+    ]
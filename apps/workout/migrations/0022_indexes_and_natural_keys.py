@@ -0,0 +1,135 @@
+# Generated by Django 5.1.15 on 2026-10-18 17:40
+
+import django.db.models.constraints
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workout", "0021_deduplicate_natural_keys"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="cardioserieslog",
+            name="workout",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="cardio_series_logs",
+                to="workout.workout",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="exercice",
+            name="name",
+            field=models.CharField(max_length=50, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="strengthserieslog",
+            name="workout",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="strength_series_logs",
+                to="workout.workout",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="templatecardioseries",
+            name="template_exercise",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="workout.templateexercise",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="templatestrengthseries",
+            name="template_exercise",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="workout.templateexercise",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="typeworkout",
+            name="name_workout",
+            field=models.CharField(max_length=50, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="workout",
+            name="type_workout",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="workout.typeworkout",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="strengthserieslog",
+            index=models.Index(
+                condition=models.Q(("weight__gt", 0)),
+                fields=["exercise", "-weight"],
+                name="strength_record_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workout",
+            index=models.Index(fields=["date", "id"], name="workout_date_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="workout",
+            index=models.Index(
+                fields=["type_workout", "date"], name="workout_type_date_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="cardioserieslog",
+            constraint=models.UniqueConstraint(
+                fields=("workout", "exercise", "series_number"),
+                name="unique_cardio_series",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="oneexercice",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["DEFERRED"],
+                fields=("seance", "position"),
+                name="unique_exercise_position",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="strengthserieslog",
+            constraint=models.UniqueConstraint(
+                fields=("workout", "exercise", "series_number"),
+                name="unique_strength_series",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="templatecardioseries",
+            constraint=models.UniqueConstraint(
+                fields=("template_exercise", "series_number"),
+                name="unique_template_cardio_series",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="templateexercise",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["DEFERRED"],
+                fields=("template", "position"),
+                name="unique_template_exercise_position",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="templatestrengthseries",
+            constraint=models.UniqueConstraint(
+                fields=("template_exercise", "series_number"),
+                name="unique_template_strength_series",
+            ),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.1.15
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def _normalize(text):
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.lower().split())
+
+
+def backfill_search_text(apps, schema_editor):
+    """Fill search_text with the normalized name, muscle groups and equipment"""
+    Exercice = apps.get_model("workout", "Exercice")
+
+    words = {
+        exercise_id: [name]
+        for exercise_id, name in Exercice.objects.values_list("id", "name")
+    }
+    for through, field in (
+        (Exercice.muscle_groups.through, "musclegroup__name"),
+        (Exercice.equipment.through, "equipment__name"),
+    ):
+        for exercise_id, name in through.objects.order_by(field).values_list(
+            "exercice_id", field
+        ):
+            words[exercise_id].append(name)
+
+    Exercice.objects.bulk_update(
+        [
+            Exercice(id=exercise_id, search_text=_normalize(" ".join(names)))
+            for exercise_id, names in words.items()
+        ],
+        ["search_text"],
+        batch_size=500,
+    )
+
+
+def create_trigram_index(apps, schema_editor):
+    # pg_trgm only exists on PostgreSQL; elsewhere search falls back to Python
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Exercice = apps.get_model("workout", "Exercice")
+    table = schema_editor.quote_name(Exercice._meta.db_table)
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS exercise_search_trgm_idx "
+        f"ON {table} USING gin (search_text gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS exercise_search_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workout", "0022_indexes_and_natural_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exercice",
+            name="search_text",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -1,8 +1,9 @@
 from django.db import models
+from django.db.models import Deferrable, Q
 
 
 class TypeWorkout(models.Model):
-    name_workout = models.CharField(max_length=50)
+    name_workout = models.CharField(max_length=50, unique=True)
 
     class Meta:
         ordering = ["name_workout"]
@@ -36,9 +37,22 @@ class Equipment(models.Model):
 
 class Workout(models.Model):
     date = models.DateField()
-    type_workout = models.ForeignKey(TypeWorkout, null=True, on_delete=models.SET_NULL)
+    # Indexed by workout_type_date_idx
+    type_workout = models.ForeignKey(
+        TypeWorkout, null=True, on_delete=models.SET_NULL, db_index=False
+    )
     duration = models.IntegerField(default=0)
 
+    class Meta:
+        # Not unique on (date, type_workout): two sessions of the same type on
+        # one day are legitimate, and the type is nullable
+        indexes = [
+            # Feed (keyset on -date, -id), date ranges and per-year calendars
+            models.Index(fields=["date", "id"], name="workout_date_id_idx"),
+            # Last workout of a type
+            models.Index(fields=["type_workout", "date"], name="workout_type_date_idx"),
+        ]
+
     def __str__(self):
         date_str = self.date.strftime("%Y-%m-%d")
         type_workout_name = (
@@ -59,7 +73,7 @@ class Exercice(models.Model):
         ("advanced", "Advanced"),
     ]
 
-    name = models.CharField(max_length=50)
+    name = models.CharField(max_length=50, unique=True)
     exercise_type = models.CharField(
         max_length=20,
         choices=[("strength", "Strength"), ("cardio", "Cardio")],
@@ -88,6 +102,10 @@ class Exercice(models.Model):
         help_text="Exercise difficulty level",
     )
 
+    # Normalized name, muscle groups and equipment, see search.py. Trigram
+    # indexed on PostgreSQL by migration 0023.
+    search_text = models.TextField(blank=True, default="", editable=False)
+
     class Meta:
         ordering = ["name"]
 
@@ -103,8 +121,12 @@ class StrengthSeriesLog(models.Model):
     exercise = models.ForeignKey(
         Exercice, on_delete=models.CASCADE, related_name="strength_series_logs"
     )
+    # Indexed by unique_strength_series
     workout = models.ForeignKey(
-        Workout, on_delete=models.CASCADE, related_name="strength_series_logs"
+        Workout,
+        on_delete=models.CASCADE,
+        related_name="strength_series_logs",
+        db_index=False,
     )
     series_number = models.IntegerField()  # 1, 2, 3, etc.
     reps = models.IntegerField()
@@ -112,6 +134,20 @@ class StrengthSeriesLog(models.Model):
 
     class Meta:
         ordering = ["workout", "exercise", "series_number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["workout", "exercise", "series_number"],
+                name="unique_strength_series",
+            ),
+        ]
+        indexes = [
+            # Personal records: heaviest sets of an exercise
+            models.Index(
+                fields=["exercise", "-weight"],
+                condition=Q(weight__gt=0),
+                name="strength_record_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.exercise.name} - Series {self.series_number}: {self.reps}x{self.weight}kg"
@@ -125,8 +161,12 @@ class CardioSeriesLog(models.Model):
     exercise = models.ForeignKey(
         Exercice, on_delete=models.CASCADE, related_name="cardio_series_logs"
     )
+    # Indexed by unique_cardio_series
     workout = models.ForeignKey(
-        Workout, on_delete=models.CASCADE, related_name="cardio_series_logs"
+        Workout,
+        on_delete=models.CASCADE,
+        related_name="cardio_series_logs",
+        db_index=False,
     )
     series_number = models.IntegerField()  # 1, 2, 3, etc. for intervals
     duration_seconds = models.IntegerField(null=True, blank=True)
@@ -134,6 +174,12 @@ class CardioSeriesLog(models.Model):
 
     class Meta:
         ordering = ["workout", "exercise", "series_number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["workout", "exercise", "series_number"],
+                name="unique_cardio_series",
+            ),
+        ]
 
     def __str__(self):
         distance_str = f" - {self.distance_m}m" if self.distance_m else ""
@@ -151,6 +197,14 @@ class OneExercice(models.Model):
 
     class Meta:
         ordering = ["seance", "position"]
+        constraints = [
+            # Deferred so that reordering exercises can swap positions
+            models.UniqueConstraint(
+                fields=["seance", "position"],
+                name="unique_exercise_position",
+                deferrable=Deferrable.DEFERRED,
+            ),
+        ]
 
     def __str__(self):
         exercice_name = self.name.name if self.name else "No Exercice"
@@ -161,6 +215,73 @@ class OneExercice(models.Model):
         return f"{self.position}. {exercice_name} - {seance_date}"
 
 
+class WorkoutSummary(models.Model):
+    """
+    Denormalized per-workout facts, refreshed whenever a workout's series change
+    """
+
+    workout = models.OneToOneField(
+        Workout, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    exercise_count = models.IntegerField(default=0)
+    strength_series_count = models.IntegerField(default=0)
+    cardio_series_count = models.IntegerField(default=0)
+    total_volume = models.IntegerField(default=0)
+    muscle_groups = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Workout summaries"
+
+    def __str__(self):
+        return (
+            f"{self.workout_id}: {self.exercise_count} exercises, "
+            f"{self.strength_series_count}S/{self.cardio_series_count}C"
+        )
+
+
+class PersonalRecord(models.Model):
+    """
+    Best strength performances per exercise, maintained incrementally
+    """
+
+    exercise = models.OneToOneField(
+        Exercice,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="personal_record",
+    )
+    max_weight = models.IntegerField()
+    max_weight_date = models.DateField()
+    max_weight_workout = models.ForeignKey(
+        Workout, null=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    best_estimated_1rm = models.FloatField()
+    best_estimated_1rm_date = models.DateField()
+    best_set_volume = models.IntegerField()
+    best_set_volume_date = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-max_weight"]
+
+    def __str__(self):
+        return f"{self.exercise.name} - {self.max_weight}kg"
+
+
+class DataVersion(models.Model):
+    """
+    Change counter bumped on every write, used to invalidate cached payloads
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
 class WorkoutTemplate(models.Model):
     """
     Template for workout structures - global templates shared by all users
@@ -191,6 +312,13 @@ class TemplateExercise(models.Model):
 
     class Meta:
         ordering = ["position"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["template", "position"],
+                name="unique_template_exercise_position",
+                deferrable=Deferrable.DEFERRED,
+            ),
+        ]
 
     def __str__(self):
         return f"{self.position}. {self.exercise.name} - {self.template.name}"
@@ -201,7 +329,10 @@ class TemplateStrengthSeries(models.Model):
     Strength series data for template exercises
     """
 
-    template_exercise = models.ForeignKey(TemplateExercise, on_delete=models.CASCADE)
+    # Indexed by unique_template_strength_series
+    template_exercise = models.ForeignKey(
+        TemplateExercise, on_delete=models.CASCADE, db_index=False
+    )
     series_number = models.IntegerField()
     reps = models.IntegerField()
     weight = models.IntegerField()
@@ -209,6 +340,12 @@ class TemplateStrengthSeries(models.Model):
     class Meta:
         ordering = ["template_exercise__position", "series_number"]
         verbose_name_plural = "Template Strength Series"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["template_exercise", "series_number"],
+                name="unique_template_strength_series",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.template_exercise.exercise.name} - Series {self.series_number}: {self.reps}x{self.weight}kg"
@@ -219,7 +356,10 @@ class TemplateCardioSeries(models.Model):
     Cardio series data for template exercises
     """
 
-    template_exercise = models.ForeignKey(TemplateExercise, on_delete=models.CASCADE)
+    # Indexed by unique_template_cardio_series
+    template_exercise = models.ForeignKey(
+        TemplateExercise, on_delete=models.CASCADE, db_index=False
+    )
     series_number = models.IntegerField()
     duration_seconds = models.IntegerField(null=True, blank=True)
     distance_m = models.FloatField(null=True, blank=True)
@@ -227,6 +367,12 @@ class TemplateCardioSeries(models.Model):
     class Meta:
         ordering = ["template_exercise__position", "series_number"]
         verbose_name_plural = "Template Cardio Series"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["template_exercise", "series_number"],
+                name="unique_template_cardio_series",
+            ),
+        ]
 
     def __str__(self):
         distance_str = f" - {self.distance_m}m" if self.distance_m else ""
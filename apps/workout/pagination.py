@@ -0,0 +1,49 @@
+import base64
+import binascii
+from datetime import date
+
+from django.db.models import Q, QuerySet
+
+from .models import Workout
+
+
+def encode_cursor(workout: Workout) -> str:
+    """Return an opaque cursor pointing just after ``workout`` in the feed."""
+    raw = f"{workout.date.isoformat()}|{workout.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, int] | None:
+    """Return the (date, id) encoded in ``cursor``, or None if it is invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_str, id_str = base64.urlsafe_b64decode(padded).decode().split("|")
+        return date.fromisoformat(date_str), int(id_str)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def paginate_by_cursor(
+    workouts: QuerySet[Workout], cursor: str | None, page_size: int
+) -> tuple[list[Workout], str | None]:
+    """
+    Return one page of ``workouts`` ordered by (-date, -id) plus the cursor of
+    the next page (None on the last page).
+
+    Seeks past the cursor on the (date, id) key instead of counting and
+    offsetting, so every page costs the same single query.
+    """
+    workouts = workouts.order_by("-date", "-id")
+
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None:
+        last_date, last_id = position
+        workouts = workouts.filter(
+            Q(date__lt=last_date) | Q(date=last_date, id__lt=last_id)
+        )
+
+    page = list(workouts[: page_size + 1])
+    if len(page) > page_size:
+        page = page[:page_size]
+        return page, encode_cursor(page[-1])
+    return page, None
@@ -0,0 +1,141 @@
+from datetime import date
+from typing import Any
+
+from django.db.models import Count, F, Max, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from .models import StrengthSeriesLog
+from .records import estimated_1rm
+
+DEFAULT_POINTS = 100
+MAX_POINTS = 1000
+# "workout" is one point per workout; weeks and months are grouped in SQL
+BUCKETS = {"workout": None, "week": TruncWeek, "month": TruncMonth}
+# Series the LTTB downsampling preserves the shape of
+METRICS = ("estimated_1rm", "top_weight", "volume")
+
+
+def exercise_progression(
+    exercise_id: int,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    bucket: str = "workout",
+    points: int = DEFAULT_POINTS,
+    metric: str = "estimated_1rm",
+) -> dict[str, Any]:
+    """
+    Compute the progression of a strength exercise, one point per bucket.
+
+    Each point aggregates the sets of a workout, week or month in SQL: top
+    set weight, best estimated 1RM (see records.estimated_1rm), volume
+    (reps * weight), sets, reps and workouts. The history is read with a
+    single query whatever its length.
+
+    When there are more buckets than ``points``, they are downsampled with
+    Largest-Triangle-Three-Buckets on ``metric``, which keeps the first and
+    last points and the peaks and dips of the curve. The payload therefore
+    never holds more than ``points`` points.
+    """
+    logs = StrengthSeriesLog.objects.filter(exercise_id=exercise_id)
+    if start_date:
+        logs = logs.filter(workout__date__gte=start_date)
+    if end_date:
+        logs = logs.filter(workout__date__lte=end_date)
+
+    trunc = BUCKETS[bucket]
+    if trunc:
+        groups = logs.annotate(period=trunc("workout__date")).values("period")
+    else:
+        # Two workouts on the same day stay two points
+        groups = logs.annotate(period=F("workout__date")).values("period", "workout_id")
+    rows = groups.annotate(
+        top_weight=Max("weight"),
+        estimated_1rm=Max(estimated_1rm()),
+        volume=Sum(F("reps") * F("weight")),
+        sets=Count("id"),
+        reps=Sum("reps"),
+        workouts=Count("workout", distinct=True),
+    ).order_by("period", *([] if trunc else ["workout_id"]))
+
+    series = [
+        {
+            "date": row["period"].isoformat(),
+            "top_weight": row["top_weight"],
+            "estimated_1rm": round(row["estimated_1rm"], 1),
+            "volume": row["volume"],
+            "sets": row["sets"],
+            "reps": row["reps"],
+            "workouts": row["workouts"],
+        }
+        for row in rows
+    ]
+
+    total = len(series)
+    if total > points:
+        keep = lttb(
+            [
+                (date.fromisoformat(point["date"]).toordinal(), point[metric])
+                for point in series
+            ],
+            points,
+        )
+        series = [series[index] for index in keep]
+
+    return {
+        "bucket": bucket,
+        "metric": metric,
+        "total_points": total,
+        "downsampled": len(series) < total,
+        "points": series,
+    }
+
+
+def lttb(data: list[tuple[float, float]], threshold: int) -> list[int]:
+    """
+    Pick ``threshold`` of the (x, y) points with Largest-Triangle-Three-Buckets.
+
+    ``data`` must be sorted by x. Returns the indices of the kept points,
+    always including the first and the last one.
+    """
+    if threshold >= len(data):
+        return list(range(len(data)))
+    if threshold < 3:
+        raise ValueError("LTTB keeps at least 3 points")
+
+    kept = [0]
+    # The points between the first and the last are split into
+    # threshold - 2 buckets, each contributing the point that forms the
+    # largest triangle with the previously kept point and the next bucket's
+    # average
+    inner, buckets = len(data) - 2, threshold - 2
+
+    def bounds(bucket):
+        return bucket * inner // buckets + 1, (bucket + 1) * inner // buckets + 1
+
+    previous = 0
+    for bucket in range(buckets):
+        start, end = bounds(bucket)
+        # The last bucket is followed by the last point alone
+        next_points = (
+            data[slice(*bounds(bucket + 1))] if bucket + 1 < buckets else data[-1:]
+        )
+        average_x = sum(x for x, _y in next_points) / len(next_points)
+        average_y = sum(y for _x, y in next_points) / len(next_points)
+
+        previous_x, previous_y = data[previous]
+        best_area = -1.0
+        best = start
+        for index in range(start, end):
+            x, y = data[index]
+            area = abs(
+                (previous_x - average_x) * (y - previous_y)
+                - (previous_x - x) * (average_y - previous_y)
+            )
+            if area > best_area:
+                best_area = area
+                best = index
+        kept.append(best)
+        previous = best
+
+    kept.append(len(data) - 1)
+    return kept
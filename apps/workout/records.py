@@ -0,0 +1,169 @@
+from collections.abc import Iterable
+from datetime import date
+
+from django.db.models import F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast
+
+from .models import Exercice, PersonalRecord, StrengthSeriesLog
+
+RECORD_FIELDS = [
+    "max_weight",
+    "max_weight_date",
+    "max_weight_workout",
+    "best_estimated_1rm",
+    "best_estimated_1rm_date",
+    "best_set_volume",
+    "best_set_volume_date",
+    "updated_at",
+]
+
+
+def estimated_1rm():
+    """Epley estimate of a set's one-rep max: weight * (1 + reps / 30)."""
+    return Cast(F("weight"), FloatField()) * (
+        Value(1.0) + Cast(F("reps"), FloatField()) / Value(30.0)
+    )
+
+
+def refresh_personal_records(exercise_ids: Iterable[int]) -> None:
+    """
+    Recompute from scratch the records of the given exercises.
+
+    Used when series are edited or deleted, since a lost record cannot be
+    derived from the previous one. The best sets are picked by correlated
+    subqueries, so this is a single query whatever the number of exercises.
+    Ties go to the most recent workout.
+    """
+    exercise_ids = set(exercise_ids)
+    if not exercise_ids:
+        return
+
+    logs = StrengthSeriesLog.objects.filter(exercise_id=OuterRef("pk"), weight__gt=0)
+    by_weight = logs.order_by("-weight", "-workout__date", "-id")
+    by_1rm = logs.annotate(value=estimated_1rm()).order_by(
+        "-value", "-workout__date", "-id"
+    )
+    by_volume = logs.annotate(value=F("reps") * F("weight")).order_by(
+        "-value", "-workout__date", "-id"
+    )
+
+    rows = (
+        Exercice.objects.filter(id__in=exercise_ids)
+        .annotate(
+            record_max_weight=Subquery(by_weight.values("weight")[:1]),
+            record_max_weight_date=Subquery(by_weight.values("workout__date")[:1]),
+            record_max_weight_workout=Subquery(by_weight.values("workout_id")[:1]),
+            record_1rm=Subquery(by_1rm.values("value")[:1]),
+            record_1rm_date=Subquery(by_1rm.values("workout__date")[:1]),
+            record_volume=Subquery(by_volume.values("value")[:1]),
+            record_volume_date=Subquery(by_volume.values("workout__date")[:1]),
+        )
+        .values()
+    )
+
+    records = []
+    for row in rows:
+        if row["record_max_weight"] is None:
+            continue
+        records.append(
+            PersonalRecord(
+                exercise_id=row["id"],
+                max_weight=row["record_max_weight"],
+                max_weight_date=row["record_max_weight_date"],
+                max_weight_workout_id=row["record_max_weight_workout"],
+                best_estimated_1rm=row["record_1rm"],
+                best_estimated_1rm_date=row["record_1rm_date"],
+                best_set_volume=row["record_volume"],
+                best_set_volume_date=row["record_volume_date"],
+            )
+        )
+
+    # Exercises left without any weighted set lose their record
+    PersonalRecord.objects.filter(exercise_id__in=exercise_ids).exclude(
+        exercise_id__in=[record.exercise_id for record in records]
+    ).delete()
+    _save_records(records)
+
+
+def rebuild_all_personal_records() -> int:
+    """Recompute the records of every exercise."""
+    PersonalRecord.objects.all().delete()
+    refresh_personal_records(Exercice.objects.values_list("id", flat=True))
+    return PersonalRecord.objects.count()
+
+
+def record_new_series(
+    series_logs: Iterable[StrengthSeriesLog], workout_date: date
+) -> None:
+    """
+    Fold freshly created strength series into the stored records.
+
+    Only the records of the exercises involved are read, so the cost depends
+    on the number of new series, not on the size of the history.
+    """
+    series_logs = [log for log in series_logs if log.weight > 0]
+    if not series_logs:
+        return
+
+    existing = PersonalRecord.objects.in_bulk({log.exercise_id for log in series_logs})
+    changed: dict[int, PersonalRecord] = {}
+
+    for log in series_logs:
+        one_rm = log.weight * (1 + log.reps / 30)
+        volume = log.reps * log.weight
+        record = changed.get(log.exercise_id) or existing.get(log.exercise_id)
+
+        if record is None:
+            changed[log.exercise_id] = PersonalRecord(
+                exercise_id=log.exercise_id,
+                max_weight=log.weight,
+                max_weight_date=workout_date,
+                max_weight_workout_id=log.workout_id,
+                best_estimated_1rm=one_rm,
+                best_estimated_1rm_date=workout_date,
+                best_set_volume=volume,
+                best_set_volume_date=workout_date,
+            )
+            continue
+
+        improved = False
+        if _beats(log.weight, workout_date, record.max_weight, record.max_weight_date):
+            record.max_weight = log.weight
+            record.max_weight_date = workout_date
+            record.max_weight_workout_id = log.workout_id
+            improved = True
+        if _beats(
+            one_rm,
+            workout_date,
+            record.best_estimated_1rm,
+            record.best_estimated_1rm_date,
+        ):
+            record.best_estimated_1rm = one_rm
+            record.best_estimated_1rm_date = workout_date
+            improved = True
+        if _beats(
+            volume, workout_date, record.best_set_volume, record.best_set_volume_date
+        ):
+            record.best_set_volume = volume
+            record.best_set_volume_date = workout_date
+            improved = True
+        if improved:
+            changed[log.exercise_id] = record
+
+    _save_records(list(changed.values()))
+
+
+def _beats(value, value_date: date, record_value, record_date: date) -> bool:
+    # Same tie-break as refresh_personal_records: the most recent workout,
+    # then the latest series, which a new series always is
+    return value > record_value or (value == record_value and value_date >= record_date)
+
+
+def _save_records(records: list[PersonalRecord]) -> None:
+    if records:
+        PersonalRecord.objects.bulk_create(
+            records,
+            update_conflicts=True,
+            unique_fields=["exercise"],
+            update_fields=RECORD_FIELDS,
+        )
@@ -0,0 +1,50 @@
+from typing import Any
+
+from .cache import EXERCISES_STAMP, WORKOUT_TYPES_STAMP, cached_payload
+from .models import Equipment, Exercice, MuscleGroup, TypeWorkout
+
+# Change stamps of the tables the bundle is built from
+REFERENCE_STAMPS = (EXERCISES_STAMP, WORKOUT_TYPES_STAMP)
+
+
+def build_reference_data() -> dict[str, Any]:
+    """
+    Build the reference data the workout forms and filters share.
+
+    Exercises carry the ids of their muscle groups and equipment, read in
+    one query per relation: the bundle costs five queries whatever the size
+    of the library.
+    """
+    exercises = {
+        exercise["id"]: {**exercise, "muscle_groups": [], "equipment": []}
+        for exercise in Exercice.objects.order_by("name").values(
+            "id", "name", "exercise_type"
+        )
+    }
+    for relation, field, key in (
+        (Exercice.muscle_groups, "musclegroup_id", "muscle_groups"),
+        (Exercice.equipment, "equipment_id", "equipment"),
+    ):
+        for exercise_id, related_id in relation.through.objects.order_by(
+            "id"
+        ).values_list("exercice_id", field):
+            exercises[exercise_id][key].append(related_id)
+
+    return {
+        "exercises": list(exercises.values()),
+        "muscle_groups": list(
+            MuscleGroup.objects.order_by("name").values("id", "name")
+        ),
+        "equipment": list(Equipment.objects.order_by("name").values("id", "name")),
+        "workout_types": [
+            {"value": name, "display": name}
+            for name in TypeWorkout.objects.order_by("name_workout").values_list(
+                "name_workout", flat=True
+            )
+        ],
+    }
+
+
+def reference_data() -> dict[str, Any]:
+    """The reference data bundle, cached per data version"""
+    return cached_payload("reference_data", (), build_reference_data)
@@ -0,0 +1,234 @@
+import difflib
+import unicodedata
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import connection
+from django.db.models import Case, Count, IntegerField, Q, QuerySet, Value, When
+
+from .cache import cached_payload
+from .models import Equipment, Exercice, MuscleGroup
+
+SEARCH_BATCH_SIZE = 500
+# Minimum difflib ratio for a query word to match a word of the index when it
+# is not a substring of it, e.g. "bech" for "bench" (fallback search only)
+FUZZY_CUTOFF = 0.75
+
+
+def normalize(text: str) -> str:
+    """Lowercase ``text``, strip its accents and collapse its whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.lower().split())
+
+
+def refresh_search_text(exercise_ids: Iterable[int]) -> int:
+    """
+    Recompute Exercice.search_text for the given exercises.
+
+    The text is the normalized name, muscle groups and equipment of the
+    exercise. Each batch costs three queries plus one bulk update. Returns
+    the number of exercises updated.
+    """
+    exercise_ids = sorted(set(exercise_ids))
+    updated = 0
+    for start in range(0, len(exercise_ids), SEARCH_BATCH_SIZE):
+        end = start + SEARCH_BATCH_SIZE
+        updated += _refresh_batch(exercise_ids[start:end])
+    return updated
+
+
+def rebuild_all_search_text() -> int:
+    """Recompute the search text of every exercise."""
+    return refresh_search_text(Exercice.objects.values_list("id", flat=True))
+
+
+def _refresh_batch(exercise_ids: list[int]) -> int:
+    words: dict[int, list[str]] = {}
+    for exercise_id, name in Exercice.objects.filter(id__in=exercise_ids).values_list(
+        "id", "name"
+    ):
+        words[exercise_id] = [name]
+    for relation, field in (
+        (Exercice.muscle_groups, "musclegroup__name"),
+        (Exercice.equipment, "equipment__name"),
+    ):
+        links = (
+            relation.through.objects.filter(exercice_id__in=words)
+            .order_by(field)
+            .values_list("exercice_id", field)
+        )
+        for exercise_id, name in links:
+            words[exercise_id].append(name)
+
+    exercises = [
+        Exercice(id=exercise_id, search_text=normalize(" ".join(names)))
+        for exercise_id, names in words.items()
+    ]
+    Exercice.objects.bulk_update(exercises, ["search_text"])
+    return len(exercises)
+
+
+def exercise_ids_for_muscle_group(muscle_group_id: int) -> QuerySet:
+    return Exercice.muscle_groups.through.objects.filter(
+        musclegroup_id=muscle_group_id
+    ).values("exercice_id")
+
+
+def exercise_ids_for_equipment(equipment_id: int) -> QuerySet:
+    return Exercice.equipment.through.objects.filter(equipment_id=equipment_id).values(
+        "exercice_id"
+    )
+
+
+def search_exercises(
+    query: str = "",
+    muscle_group_id: int | None = None,
+    difficulty: str = "",
+    equipment_id: int | None = None,
+) -> tuple[QuerySet, dict[str, Any]]:
+    """
+    Search the exercise library and count the exercises of each filter value.
+
+    Every word of ``query`` must appear in the search text of an exercise,
+    or be close to one of its words. On PostgreSQL this runs on the pg_trgm
+    GIN index of Exercice.search_text; elsewhere the words are matched in
+    Python against the cached search texts. Results are ranked by where
+    the query matches (start of the name, name, muscle groups or equipment,
+    then close words only), then by similarity on PostgreSQL, then by name.
+
+    The facets count, for each muscle group, difficulty and equipment, the
+    exercises the search would return if that value were selected, the
+    other filters staying as they are. Whatever the query, the search costs
+    a constant number of queries: three for the facets and one for the
+    results, before prefetching, plus the data version lookup of the cached
+    search index on the fallback.
+
+    Returns (exercises, facets) where facets is
+    {"muscle_groups": [{"id", "name", "count"}], "difficulties": [{"value",
+    "label", "count"}], "equipment": [{"id", "name", "count"}], "total"},
+    total being the number of exercises returned.
+    """
+    words = normalize(query).split()
+    if words and connection.vendor == "postgresql":
+        text_filter, similarity = _trigram_filter(words)
+    elif words:
+        text_filter, similarity = _fallback_filter(words)
+    else:
+        text_filter, similarity = Q(), None
+
+    filters = {
+        "muscle_group": (
+            Q(id__in=exercise_ids_for_muscle_group(muscle_group_id))
+            if muscle_group_id
+            else Q()
+        ),
+        "difficulty": Q(difficulty=difficulty) if difficulty else Q(),
+        "equipment": (
+            Q(id__in=exercise_ids_for_equipment(equipment_id)) if equipment_id else Q()
+        ),
+    }
+
+    def matching(without: str | None = None) -> QuerySet:
+        queryset = Exercice.objects.filter(text_filter)
+        for name, facet_filter in filters.items():
+            if name != without:
+                queryset = queryset.filter(facet_filter)
+        return queryset
+
+    facets = {
+        "muscle_groups": [
+            {"id": group.id, "name": group.name, "count": group.exercise_count}
+            for group in MuscleGroup.objects.annotate(
+                exercise_count=Count(
+                    "exercises",
+                    filter=Q(exercises__in=matching("muscle_group").values("id")),
+                )
+            ).order_by("name")
+        ],
+        "equipment": [
+            {"id": item.id, "name": item.name, "count": item.exercise_count}
+            for item in Equipment.objects.annotate(
+                exercise_count=Count(
+                    "exercises",
+                    filter=Q(exercises__in=matching("equipment").values("id")),
+                )
+            ).order_by("name")
+        ],
+    }
+    difficulty_counts = dict(
+        matching("difficulty")
+        .values("difficulty")
+        .annotate(count=Count("id"))
+        .values_list("difficulty", "count")
+    )
+    facets["difficulties"] = [
+        {"value": value, "label": label, "count": difficulty_counts.get(value, 0)}
+        for value, label in Exercice.DIFFICULTY_CHOICES
+    ]
+    facets["total"] = (
+        difficulty_counts.get(difficulty, 0)
+        if difficulty
+        else sum(difficulty_counts.values())
+    )
+
+    exercises = matching()
+    if words:
+        phrase = " ".join(words)
+        exercises = exercises.annotate(
+            match_rank=Case(
+                When(name__istartswith=phrase, then=Value(0)),
+                When(name__icontains=phrase, then=Value(1)),
+                When(search_text__contains=phrase, then=Value(2)),
+                default=Value(3),
+                output_field=IntegerField(),
+            )
+        )
+        if similarity is not None:
+            exercises = exercises.annotate(similarity=similarity).order_by(
+                "match_rank", "-similarity", "name"
+            )
+        else:
+            exercises = exercises.order_by("match_rank", "name")
+    else:
+        exercises = exercises.order_by("name")
+    exercises = exercises.prefetch_related("muscle_groups", "equipment")
+
+    return exercises, facets
+
+
+def _trigram_filter(words: list[str]):
+    # Imported here as django.contrib.postgres needs a PostgreSQL driver
+    from django.contrib.postgres.lookups import TrigramWordSimilar
+    from django.contrib.postgres.search import TrigramWordSimilarity
+    from django.db.models import F
+
+    # LIKE and %> (word similarity) can both use the gin_trgm_ops index
+    text_filter = Q()
+    for word in words:
+        text_filter &= Q(search_text__contains=word) | Q(
+            TrigramWordSimilar(F("search_text"), Value(word))
+        )
+    return text_filter, TrigramWordSimilarity(" ".join(words), "search_text")
+
+
+def _fallback_filter(words: list[str]):
+    matches = []
+    for exercise_id, search_text in search_index():
+        index_words = search_text.split()
+        if all(
+            word in search_text
+            or difflib.get_close_matches(word, index_words, n=1, cutoff=FUZZY_CUTOFF)
+            for word in words
+        ):
+            matches.append(exercise_id)
+    return Q(id__in=matches), None
+
+
+def search_index() -> list[tuple[int, str]]:
+    """(id, search text) of every exercise, cached per data version"""
+    return cached_payload(
+        "search_index",
+        (),
+        lambda: list(Exercice.objects.order_by("id").values_list("id", "search_text")),
+    )
@@ -0,0 +1,245 @@
+import logging
+from collections import defaultdict
+from typing import Any
+
+from django.db import models
+
+from .models import CardioSeriesLog, Exercice, OneExercice, StrengthSeriesLog, Workout
+
+logger = logging.getLogger(__name__)
+
+
+def parse_exercise_form(post) -> list[tuple[int, dict[str, Any]]]:
+    """
+    Group the exercise fields of an add/edit workout form.
+
+    Form structure: exercise_<id>_name, exercise_<id>_series_<num>_<field>.
+    Returns [(position, {"name": ..., "series": {num: {field: value}}})]
+    sorted by form id, positions starting at 1.
+    """
+    exercise_data: dict[str, dict[str, Any]] = {}
+    for key, value in post.items():
+        if key.startswith("exercise_") and key.endswith("_name"):
+            # Extract exercise ID: exercise_0_name -> 0
+            exercise_id = key.split("_")[1]
+            if exercise_id not in exercise_data:
+                exercise_data[exercise_id] = {"name": value, "series": {}}
+        elif key.startswith("exercise_") and "_series_" in key:
+            # Format: exercise_<id>_series_<num>_<field>
+            parts = key.split("_")
+            exercise_id = parts[1]
+            series_num = parts[3]
+            field_name = "_".join(parts[4:])
+
+            if exercise_id not in exercise_data:
+                exercise_data[exercise_id] = {"name": "", "series": {}}
+            if series_num not in exercise_data[exercise_id]["series"]:
+                exercise_data[exercise_id]["series"][series_num] = {}
+
+            exercise_data[exercise_id]["series"][series_num][field_name] = value
+
+    # Sort exercises by their ID to maintain order
+    sorted_exercises = sorted(exercise_data.items(), key=lambda x: int(x[0]))
+    return [
+        (position, data)
+        for position, (_exercise_id, data) in enumerate(sorted_exercises, start=1)
+    ]
+
+
+def build_workout_rows(
+    workout: Workout, exercise_forms: list[tuple[int, dict[str, Any]]]
+) -> tuple[list[OneExercice], list[StrengthSeriesLog], list[CardioSeriesLog]]:
+    """
+    Turn parsed form data into unsaved OneExercice and series rows.
+
+    All exercise names are resolved with a single query. Exercises with a
+    missing or unknown name are skipped, keeping their position slot. When an
+    exercise appears twice, the series of the later entry are numbered after
+    those of the earlier one, as (workout, exercise, series_number) is unique.
+    """
+    names = {data["name"] for _position, data in exercise_forms if data.get("name")}
+    exercises_by_name: dict[str, Exercice] = {}
+    for exercise in Exercice.objects.filter(name__in=names).order_by("id"):
+        exercises_by_name.setdefault(exercise.name, exercise)
+
+    one_exercices: list[OneExercice] = []
+    strength_series: list[StrengthSeriesLog] = []
+    cardio_series: list[CardioSeriesLog] = []
+    last_series_number: dict[int, int] = defaultdict(int)
+
+    for position, data in exercise_forms:
+        if not data.get("name"):
+            logger.warning(f"Exercise at position {position} missing name, skipping")
+            continue
+
+        exercise_obj = exercises_by_name.get(data["name"])
+        if exercise_obj is None:
+            logger.warning(f"Exercise '{data['name']}' not found in database, skipping")
+            continue
+
+        # OneExercice record for position tracking
+        one_exercices.append(
+            OneExercice(name=exercise_obj, seance=workout, position=position)
+        )
+
+        offset = last_series_number[exercise_obj.id]
+        for series_num_str, series_data in data["series"].items():
+            series_number = offset + int(series_num_str)
+            last_series_number[exercise_obj.id] = max(
+                last_series_number[exercise_obj.id], series_number
+            )
+            if exercise_obj.exercise_type == "strength":
+                strength_series.append(
+                    StrengthSeriesLog(
+                        exercise=exercise_obj,
+                        workout=workout,
+                        series_number=series_number,
+                        reps=_to_int(series_data.get("reps"), 1),
+                        weight=_to_int(series_data.get("weight"), 0),
+                    )
+                )
+            elif exercise_obj.exercise_type == "cardio":
+                distance = series_data.get("distance_m")
+                cardio_series.append(
+                    CardioSeriesLog(
+                        exercise=exercise_obj,
+                        workout=workout,
+                        series_number=series_number,
+                        duration_seconds=_to_int(
+                            series_data.get("duration_seconds"), None
+                        ),
+                        distance_m=(
+                            None if distance in ("", None) else float(distance)
+                        ),
+                    )
+                )
+
+    return one_exercices, strength_series, cardio_series
+
+
+def create_workout_series(
+    workout: Workout, exercise_forms: list[tuple[int, dict[str, Any]]]
+) -> list[StrengthSeriesLog]:
+    """
+    Insert the exercises and series of a workout in a constant number of
+    statements (one name lookup plus one bulk insert per table).
+
+    Returns the created strength series.
+    """
+    one_exercices, strength_series, cardio_series = build_workout_rows(
+        workout, exercise_forms
+    )
+
+    OneExercice.objects.bulk_create(one_exercices)
+    StrengthSeriesLog.objects.bulk_create(strength_series)
+    CardioSeriesLog.objects.bulk_create(cardio_series)
+
+    logger.info(
+        f"Created {len(one_exercices)} exercises, {len(strength_series)} strength "
+        f"and {len(cardio_series)} cardio series for workout {workout.id}"
+    )
+    return strength_series
+
+
+def sync_workout_series(
+    workout: Workout, exercise_forms: list[tuple[int, dict[str, Any]]]
+) -> set[int]:
+    """
+    Bring the stored exercises and series of a workout in line with the form.
+
+    Rows are matched on (exercise, series_number), or on the exercise for
+    OneExercice positions. Only rows that differ are written: new ones are
+    bulk inserted, changed ones bulk updated and missing ones deleted, so an
+    untouched edit writes nothing.
+
+    Returns the ids of the exercises whose rows changed.
+    """
+    one_exercices, strength_series, cardio_series = build_workout_rows(
+        workout, exercise_forms
+    )
+
+    changed_ids: set[int] = set()
+    counts = defaultdict(int)
+    for model, existing, desired, key_fields, value_fields in (
+        (
+            OneExercice,
+            OneExercice.objects.filter(seance=workout),
+            one_exercices,
+            ["name_id"],
+            ["position"],
+        ),
+        (
+            StrengthSeriesLog,
+            StrengthSeriesLog.objects.filter(workout=workout),
+            strength_series,
+            ["exercise_id", "series_number"],
+            ["reps", "weight"],
+        ),
+        (
+            CardioSeriesLog,
+            CardioSeriesLog.objects.filter(workout=workout),
+            cardio_series,
+            ["exercise_id", "series_number"],
+            ["duration_seconds", "distance_m"],
+        ),
+    ):
+        created, updated, deleted = _sync_rows(
+            model, existing, desired, key_fields, value_fields
+        )
+        changed_ids.update(getattr(row, key_fields[0]) for row in created)
+        changed_ids.update(getattr(row, key_fields[0]) for row in updated)
+        changed_ids.update(getattr(row, key_fields[0]) for row in deleted)
+        counts["created"] += len(created)
+        counts["updated"] += len(updated)
+        counts["deleted"] += len(deleted)
+
+    logger.info(
+        f"Synced workout {workout.id}: {counts['created']} created, "
+        f"{counts['updated']} updated, {counts['deleted']} deleted"
+    )
+    return changed_ids
+
+
+def _sync_rows(
+    model: type[models.Model],
+    existing: models.QuerySet,
+    desired: list[models.Model],
+    key_fields: list[str],
+    value_fields: list[str],
+) -> tuple[list[models.Model], list[models.Model], list[models.Model]]:
+    """Diff ``desired`` against ``existing`` and write only the differences."""
+    stored = defaultdict(list)
+    for row in existing.order_by("id"):
+        stored[tuple(getattr(row, field) for field in key_fields)].append(row)
+
+    to_create, to_update = [], []
+    for row in desired:
+        matches = stored.get(tuple(getattr(row, field) for field in key_fields))
+        if not matches:
+            to_create.append(row)
+            continue
+
+        current = matches.pop(0)
+        if any(
+            getattr(current, field) != getattr(row, field) for field in value_fields
+        ):
+            for field in value_fields:
+                setattr(current, field, getattr(row, field))
+            to_update.append(current)
+
+    to_delete = [row for rows in stored.values() for row in rows]
+
+    if to_delete:
+        model.objects.filter(id__in=[row.id for row in to_delete]).delete()
+    if to_update:
+        model.objects.bulk_update(to_update, value_fields)
+    if to_create:
+        model.objects.bulk_create(to_create)
+
+    return to_create, to_update, to_delete
+
+
+def _to_int(value, default):
+    if value == "" or value is None:
+        return default
+    return int(value)
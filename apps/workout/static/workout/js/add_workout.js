@@ -1,6 +1,5 @@
 function addExercice() {
-    fetch('/workout/get_list_exercice/')
-        .then(response => response.json())
+    loadReferenceData()
         .then(data => {
             const exercisesContainer = document.getElementById('exercises');
             let exerciseCount = document.querySelectorAll('.exercise').length;
@@ -21,7 +20,7 @@ function addExercice() {
                                onblur="hideExerciseDropdown(${exerciseCount})">
                         <input type="hidden" id="exercise_${exerciseCount}_name" name="exercise_${exerciseCount}_name" required>
                         <div class="exercise-dropdown" id="exercise_${exerciseCount}_dropdown" style="display: none;">
-                            ${data.all_exercises.map(ex => `<div class="exercise-option" data-name="${ex.name}" data-type="${ex.exercise_type}" onclick="selectExercise(${exerciseCount}, '${ex.name}', '${ex.exercise_type}')">${ex.name}</div>`).join('')}
+                            ${data.exercises.map(ex => `<div class="exercise-option" data-name="${ex.name}" data-type="${ex.exercise_type}" onclick="selectExercise(${exerciseCount}, '${ex.name}', '${ex.exercise_type}')">${ex.name}</div>`).join('')}
                         </div>
                     </div>
                     <button type="button" class="add_workout_btn_delete" onclick="deleteExercise(${exerciseCount})">❌</button>
@@ -31,7 +30,8 @@ function addExercice() {
 
             exercisesContainer.appendChild(exerciseDiv);
             exerciseCount++;
-        });
+        })
+        .catch(error => console.error('Error loading exercises:', error));
 };
 
 function deleteExercise(index) {
@@ -288,9 +288,11 @@ function changeWorkoutType() {
     document.getElementById('add_workout_template_select').value = '';
 
     if (selectedType) {
-        fetch(`/workout/get_last_workout/?type=${selectedType}`)
-            .then(response => response.json())
-            .then(data => {
+        Promise.all([
+            fetch(`/workout/get_last_workout/?type=${selectedType}`).then(response => response.json()),
+            loadReferenceData()
+        ])
+            .then(([data, reference]) => {
                 if (data.date) {
                     document.getElementById('add_workout_date').value = data.date;
                 }
@@ -317,7 +319,7 @@ function changeWorkoutType() {
                                            onblur="hideExerciseDropdown(${index})">
                                     <input type="hidden" id="exercise_${index}_name" name="exercise_${index}_name" value="${exercise.name}" required>
                                     <div class="exercise-dropdown" id="exercise_${index}_dropdown" style="display: none;">
-                                        ${data.all_exercises.map(ex => `<div class="exercise-option" data-name="${ex.name}" data-type="${ex.exercise_type}" onclick="selectExercise(${index}, '${ex.name}', '${ex.exercise_type}')">${ex.name}</div>`).join('')}
+                                        ${reference.exercises.map(ex => `<div class="exercise-option" data-name="${ex.name}" data-type="${ex.exercise_type}" onclick="selectExercise(${index}, '${ex.name}', '${ex.exercise_type}')">${ex.name}</div>`).join('')}
                                     </div>
                                 </div>
                                 <button type="button" class="add_workout_btn_delete" onclick="deleteExercise(${index})">❌</button>
@@ -431,9 +433,11 @@ function loadTemplate() {
 
     if (!templateId) return;
 
-    fetch(`/workout/get_template_details/?template_id=${templateId}`)
-        .then(response => response.json())
-        .then(data => {
+    Promise.all([
+        fetch(`/workout/get_template_details/?template_id=${templateId}`).then(response => response.json()),
+        loadReferenceData()
+    ])
+        .then(([data, reference]) => {
             // Set date to today
             const today = new Date().toISOString().split('T')[0];
             document.getElementById('add_workout_date').value = today;
@@ -468,7 +472,7 @@ function loadTemplate() {
                                        onblur="hideExerciseDropdown(${index})">
                                 <input type="hidden" id="exercise_${index}_name" name="exercise_${index}_name" value="${exercise.name}" required>
                                 <div class="exercise-dropdown" id="exercise_${index}_dropdown" style="display: none;">
-                                    ${data.all_exercises.map(ex => `<div class="exercise-option" data-name="${ex.name}" data-type="${ex.exercise_type}" onclick="selectExercise(${index}, '${ex.name}', '${ex.exercise_type}')">${ex.name}</div>`).join('')}
+                                    ${reference.exercises.map(ex => `<div class="exercise-option" data-name="${ex.name}" data-type="${ex.exercise_type}" onclick="selectExercise(${index}, '${ex.name}', '${ex.exercise_type}')">${ex.name}</div>`).join('')}
                                 </div>
                             </div>
                             <button type="button" class="add_workout_btn_delete" onclick="deleteExercise(${index})">❌</button>
@@ -552,8 +556,7 @@ function loadTemplate() {
 }
 
 function loadWorkoutTypes() {
-    fetch('/workout/get_workout_types/')
-        .then(response => response.json())
+    return loadReferenceData()
         .then(data => {
             const select = document.getElementById('add_workout_type_workout');
 
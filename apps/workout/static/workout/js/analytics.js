@@ -61,12 +61,20 @@ document.addEventListener('DOMContentLoaded', function() {
         // Initial button state
         updateYearNavButtons(hasPrevData, hasNextData);
 
+        // Years already fetched on this page, so going back and forth
+        // between years does not hit the server again
+        const calendarYears = new Map();
+
         // Function to update calendar via AJAX
         async function updateCalendar(year) {
             try {
                 // Fetch calendar data from server
-                const response = await fetch(`/workout/get_calendar_data/?year=${year}`);
-                const data = await response.json();
+                let data = calendarYears.get(year);
+                if (!data) {
+                    const response = await fetch(`/workout/get_calendar_data/?year=${year}`);
+                    data = await response.json();
+                    calendarYears.set(year, data);
+                }
 
                 // Update year display
                 currentYear = data.year;
@@ -1,19 +1,15 @@
 // Load existing workout data when the page loads
 document.addEventListener('DOMContentLoaded', function() {
-    // First load workout types
-    loadWorkoutTypes();
-
-    // Wait a bit for workout types to load, then populate the form
-    setTimeout(function() {
-        populateWorkoutData();
-    }, 500);
+    // Populate the form once the workout types and exercises are loaded
+    Promise.all([loadWorkoutTypes(), loadReferenceData()])
+        .then(([, reference]) => populateWorkoutData(reference.exercises))
+        .catch(error => console.error('Error loading reference data:', error));
 });
 
-function populateWorkoutData() {
+function populateWorkoutData(all_exercises) {
     // Get data from JSON scripts
     const workout = JSON.parse(document.getElementById('workout-data').textContent);
     const exercises = JSON.parse(document.getElementById('exercises-data').textContent);
-    const all_exercises = JSON.parse(document.getElementById('all-exercises-data').textContent);
 
     if (!workout) {
         console.error('No workout data found');
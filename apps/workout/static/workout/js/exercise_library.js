@@ -13,6 +13,7 @@ $(document).ready(function() {
             success: function(data) {
                 // Update the exercises grid with new content
                 $('.exercises-grid').html(data.exercises_html);
+                updateFacetCounts(data.facets);
             },
             error: function(xhr) {
                 console.error('Failed to apply filters:', xhr);
@@ -20,6 +21,21 @@ $(document).ready(function() {
         });
     }
 
+    // Show next to each dropdown value how many exercises it would return
+    function updateFacetCounts(facets) {
+        const counts = {
+            muscle_group: facets.muscle_groups.map(item => [item.id, item.count]),
+            difficulty: facets.difficulties.map(item => [item.value, item.count]),
+            equipment: facets.equipment.map(item => [item.id, item.count])
+        };
+        $.each(counts, function(selectId, entries) {
+            entries.forEach(function([value, count]) {
+                const $option = $('#' + selectId + ' option[value="' + value + '"]');
+                $option.text($option.data('label') + ' (' + count + ')');
+            });
+        });
+    }
+
     // Auto-apply filter when dropdown changes
     $('.filter-select').on('change', function() {
         applyFilters();
@@ -55,18 +71,38 @@ $(document).ready(function() {
     // Optional: Add smooth scroll for long pages
     $('html').css('scroll-behavior', 'smooth');
 
-    // Export data button
+    // Export data button - runs the export as a job, then downloads its file
     $('#export-btn').on('click', function() {
         const $btn = $(this);
         const originalText = $btn.text();
         $btn.prop('disabled', true).text('Exporting...');
+        showMessage('Exporting data...', 'info');
 
-        window.location.href = '/workout/export_data/';
-
-        // Re-enable button after a short delay
-        setTimeout(function() {
-            $btn.prop('disabled', false).text(originalText);
-        }, 2000);
+        $.ajax({
+            url: '/workout/export_data/',
+            type: 'POST',
+            headers: {
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            success: function(job) {
+                pollJob(job, function(finishedJob) {
+                    showMessage('Data exported successfully!', 'success');
+                    window.location.href = finishedJob.download_url;
+                    $btn.prop('disabled', false).text(originalText);
+                }, function(errorMsg) {
+                    showMessage('Failed to export data: ' + errorMsg, 'error');
+                    $btn.prop('disabled', false).text(originalText);
+                });
+            },
+            error: function(xhr) {
+                let errorMsg = 'Failed to export data';
+                if (xhr.responseJSON && xhr.responseJSON.error) {
+                    errorMsg += ': ' + xhr.responseJSON.error;
+                }
+                showMessage(errorMsg, 'error');
+                $btn.prop('disabled', false).text(originalText);
+            }
+        });
     });
 
     // Import data button - opens file picker
@@ -96,12 +132,17 @@ $(document).ready(function() {
             headers: {
                 'X-CSRFToken': csrfToken
             },
-            success: function(response) {
-                showMessage('All data cleared successfully! Reloading page...', 'success');
-                // Reload page to show updated data
-                setTimeout(function() {
-                    location.reload();
-                }, 1500);
+            success: function(job) {
+                pollJob(job, function() {
+                    showMessage('All data cleared successfully! Reloading page...', 'success');
+                    // Reload page to show updated data
+                    setTimeout(function() {
+                        location.reload();
+                    }, 1500);
+                }, function(errorMsg) {
+                    showMessage('Failed to clear data: ' + errorMsg, 'error');
+                    $btn.prop('disabled', false).text(originalText);
+                });
             },
             error: function(xhr) {
                 let errorMsg = 'Failed to clear data';
@@ -120,8 +161,8 @@ $(document).ready(function() {
         if (!file) return;
 
         // Check file type
-        if (!file.name.endsWith('.json')) {
-            showMessage('Please select a JSON file', 'error');
+        if (!file.name.endsWith('.json') && !file.name.endsWith('.gz')) {
+            showMessage('Please select a JSON or .jsonl.gz export file', 'error');
             $(this).val('');
             return;
         }
@@ -156,12 +197,18 @@ $(document).ready(function() {
             headers: {
                 'X-CSRFToken': csrfToken
             },
-            success: function(response) {
-                showMessage('Data imported successfully! Reloading page...', 'success');
-                // Reload page to show updated data
-                setTimeout(function() {
-                    location.reload();
-                }, 1500);
+            success: function(job) {
+                // The upload is done; the import itself runs as a job
+                pollJob(job, function() {
+                    showMessage('Data imported successfully! Reloading page...', 'success');
+                    // Reload page to show updated data
+                    setTimeout(function() {
+                        location.reload();
+                    }, 1500);
+                }, function(errorMsg) {
+                    showMessage('Failed to import data: ' + errorMsg, 'error');
+                    $importBtn.prop('disabled', false).text(originalText);
+                });
             },
             error: function(xhr) {
                 let errorMsg = 'Failed to import data';
@@ -169,16 +216,39 @@ $(document).ready(function() {
                     errorMsg += ': ' + xhr.responseJSON.error;
                 }
                 showMessage(errorMsg, 'error');
+                $importBtn.prop('disabled', false).text(originalText);
             },
             complete: function() {
-                // Reset button state
-                $importBtn.prop('disabled', false).text(originalText);
                 // Reset file input
                 $('#import-file').val('');
             }
         });
     });
 
+    // Helper function to follow a background job until it finishes
+    function pollJob(job, onSuccess, onError) {
+        if (job.status === 'succeeded') {
+            onSuccess(job);
+            return;
+        }
+        if (job.status === 'failed') {
+            onError(job.error);
+            return;
+        }
+        if (job.progress) {
+            showMessage(job.label + ': ' + job.progress, 'info');
+        }
+        setTimeout(function() {
+            $.getJSON(job.status_url)
+                .done(function(updatedJob) {
+                    pollJob(updatedJob, onSuccess, onError);
+                })
+                .fail(function() {
+                    onError('lost track of the job');
+                });
+        }, 1000);
+    }
+
     // Helper function to get CSRF token
     function getCookie(name) {
         let cookieValue = null;
@@ -0,0 +1,23 @@
+// Reference data shared by the workout pages: exercises (with their muscle
+// groups and equipment), muscle groups, equipment and workout types.
+// Fetched once per page; the browser revalidates it with its ETag, so an
+// unchanged bundle only costs a 304.
+let referenceDataPromise = null;
+
+function loadReferenceData() {
+    if (!referenceDataPromise) {
+        referenceDataPromise = fetch('/workout/get_reference_data/')
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`Reference data request failed: ${response.status}`);
+                }
+                return response.json();
+            })
+            .catch(error => {
+                // Let the next caller retry
+                referenceDataPromise = null;
+                throw error;
+            });
+    }
+    return referenceDataPromise;
+}
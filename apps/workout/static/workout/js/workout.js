@@ -1,6 +1,6 @@
 let isLoading = false;
 let hasMoreContent = document.getElementById('load-more') ? true : false;
-let currentPage = document.getElementById('load-more') ? parseInt(document.getElementById('load-more').getAttribute('data-next-page')) : null;
+let nextCursor = document.getElementById('load-more') ? document.getElementById('load-more').getAttribute('data-next-cursor') : null;
 
 // Cache for SVG content
 let frontSvgContent = null;
@@ -328,7 +328,7 @@ function loadMore() {
     var workoutType = new URLSearchParams(window.location.search).get('workout_type') || '';
     var exercise = new URLSearchParams(window.location.search).get('exercise') || '';
 
-    var url = "/workout/?page=" + currentPage;
+    var url = "/workout/?cursor=" + encodeURIComponent(nextCursor);
     if (workoutType) {
         url += "&workout_type=" + encodeURIComponent(workoutType);
     }
@@ -463,7 +463,7 @@ function loadMore() {
             }
 
             if (response.has_next) {
-                currentPage = response.next_page_number;
+                nextCursor = response.next_cursor;
                 $('#load-more').show();
             } else {
                 hasMoreContent = false;
@@ -491,17 +491,18 @@ function applyFilters(e) {
     var exercise = $('#exercise-filter').val();
 
     // Reset pagination
-    currentPage = 2;
+    nextCursor = null;
     hasMoreContent = true;
 
-    // Build URL with filters
-    var url = "/workout/?page=1";
+    // Build URL with filters (first page has no cursor)
+    var params = new URLSearchParams();
     if (workoutType) {
-        url += "&workout_type=" + encodeURIComponent(workoutType);
+        params.set('workout_type', workoutType);
     }
     if (exercise) {
-        url += "&exercise=" + encodeURIComponent(exercise);
+        params.set('exercise', exercise);
     }
+    var url = "/workout/?" + params.toString();
 
     // Show loading indicator
     $('#loading-indicator').show();
@@ -640,17 +641,17 @@ function applyFilters(e) {
             }
 
             if (response.has_next) {
-                currentPage = response.next_page_number;
+                nextCursor = response.next_cursor;
                 hasMoreContent = true;
 
                 // Add or show load more button
                 if ($('#load-more').length === 0) {
-                    $('#workout-list').after('<button id="load-more" class="cliquable button_workout" data-next-page="' + response.next_page_number + '">Load More</button>');
+                    $('#workout-list').after('<button id="load-more" class="cliquable button_workout" data-next-cursor="' + response.next_cursor + '">Load More</button>');
                     $('#load-more').click(function() {
                         loadMore();
                     });
                 } else {
-                    $('#load-more').show().attr('data-next-page', response.next_page_number);
+                    $('#load-more').show().attr('data-next-cursor', response.next_cursor);
                 }
             } else {
                 hasMoreContent = false;
@@ -739,10 +740,34 @@ function getCookie(name) {
     return cookieValue;
 }
 
+function loadFilterOptions() {
+    // The filters only exist for logged-in users
+    if (!$('#filter-section').length) {
+        return;
+    }
+
+    loadReferenceData()
+        .then(data => {
+            fillFilterSelect($('#workout-type-filter'), data.workout_types.map(type => type.value));
+            fillFilterSelect($('#exercise-filter'), data.exercises.map(exercise => exercise.name));
+        })
+        .catch(error => console.error('Error loading filter options:', error));
+}
+
+function fillFilterSelect($select, values) {
+    values.forEach(function(value) {
+        $select.append($('<option>').val(value).text(value));
+    });
+    $select.val($select.attr('data-selected') || '');
+}
+
 $(document).ready(function() {
     // Pre-load SVG content for faster display
     loadSvgContent();
 
+    // Fill the filter dropdowns from the shared reference data
+    loadFilterOptions();
+
     // Initialize hover listeners for existing exercises
     attachHoverListeners();
 
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+from typing import Any
+
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncWeek
+
+from .models import OneExercice, Workout
+
+TOP_EXERCISES = 5
+
+
+def dashboard_stats(
+    start_date: date | None = None, end_date: date | None = None
+) -> dict[str, Any]:
+    """
+    Compute the dashboard panels for an optional date range in two queries.
+
+    The first groups the workouts of the range by week and type and sums
+    their summaries: the headline totals, the workouts by type and the
+    weekly trend are all rolled up from its rows in Python. The second
+    counts the top exercises. Without a start date the weekly trend begins
+    at the first workout; without an end date it runs to today.
+    """
+    workouts = Workout.objects.all()
+    if start_date:
+        workouts = workouts.filter(date__gte=start_date)
+    if end_date:
+        workouts = workouts.filter(date__lte=end_date)
+
+    groups = (
+        workouts.annotate(week=TruncWeek("date"))
+        .values_list("week", "type_workout__name_workout")
+        .annotate(
+            count=Count("id"),
+            exercises=Sum("summary__exercise_count"),
+            volume=Sum("summary__total_volume"),
+        )
+        .order_by()
+    )
+
+    total_workouts = total_exercises = total_volume = 0
+    counts_by_type: dict[str | None, int] = {}
+    counts_by_week: dict[date, int] = {}
+    for week, type_name, count, exercises, volume in groups:
+        total_workouts += count
+        total_exercises += exercises or 0
+        total_volume += volume or 0
+        counts_by_type[type_name] = counts_by_type.get(type_name, 0) + count
+        counts_by_week[week] = counts_by_week.get(week, 0) + count
+
+    workouts_by_type = [
+        {"type_workout__name_workout": type_name, "count": count}
+        for type_name, count in sorted(
+            counts_by_type.items(), key=lambda item: (-item[1], item[0] or "")
+        )
+    ]
+
+    top_exercises = OneExercice.objects.all()
+    if start_date:
+        top_exercises = top_exercises.filter(seance__date__gte=start_date)
+    if end_date:
+        top_exercises = top_exercises.filter(seance__date__lte=end_date)
+    top_exercises = (
+        top_exercises.values("name__name")
+        .annotate(count=Count("id"))
+        .order_by("-count", "name__name")[:TOP_EXERCISES]
+    )
+
+    first_day = start_date or min(counts_by_week, default=None)
+    if first_day:
+        weekly_workouts = _fill_weeks(
+            counts_by_week, first_day, end_date or date.today()
+        )
+    else:
+        # No workouts yet
+        weekly_workouts = []
+
+    return {
+        "total_workouts": total_workouts,
+        "total_exercises": total_exercises,
+        "total_volume": int(total_volume),
+        "workouts_by_type": workouts_by_type,
+        "weekly_workouts": weekly_workouts,
+        "top_exercises": list(top_exercises),
+    }
+
+
+def _fill_weeks(
+    counts_by_week: dict[date, int], start_dt: date, end_dt: date
+) -> list[dict[str, Any]]:
+    """Weekly entries from the week of ``start_dt``, zero where no workout"""
+    start_dt = start_dt - timedelta(days=start_dt.weekday())
+
+    # Show all weeks including partial current week
+    num_weeks = max((end_dt - start_dt).days // 7 + 1, 1)
+
+    weekly_workouts = []
+    for week in range(num_weeks):
+        week_start = start_dt + timedelta(weeks=week)
+        weekly_workouts.append(
+            {
+                "week": week + 1,
+                "count": counts_by_week.get(week_start, 0),
+                "start": week_start.strftime("%d/%m/%Y"),
+            }
+        )
+    return weekly_workouts
@@ -0,0 +1,122 @@
+from collections.abc import Iterable
+
+from django.db.models import Count, F, Sum
+
+from .models import (
+    CardioSeriesLog,
+    OneExercice,
+    StrengthSeriesLog,
+    Workout,
+    WorkoutSummary,
+)
+
+SUMMARY_BATCH_SIZE = 500
+SUMMARY_FIELDS = [
+    "exercise_count",
+    "strength_series_count",
+    "cardio_series_count",
+    "total_volume",
+    "muscle_groups",
+    "updated_at",
+]
+
+
+def refresh_workout_summaries(workout_ids: Iterable[int]) -> int:
+    """
+    Recompute the WorkoutSummary rows of the given workouts.
+
+    Each batch costs a fixed number of grouped queries plus one upsert,
+    whatever the number of series involved. Returns the number of rows written.
+    """
+    workout_ids = sorted(set(workout_ids))
+    written = 0
+    for start in range(0, len(workout_ids), SUMMARY_BATCH_SIZE):
+        end = start + SUMMARY_BATCH_SIZE
+        written += _refresh_batch(workout_ids[start:end])
+    return written
+
+
+def workouts_using_exercises(exercise_ids: Iterable[int]) -> set[int]:
+    """Ids of the workouts with a position or a series of the given exercises"""
+    exercise_ids = list(exercise_ids)
+    return set(
+        OneExercice.objects.filter(name_id__in=exercise_ids)
+        .order_by()
+        .values_list("seance_id", flat=True)
+        .union(
+            StrengthSeriesLog.objects.filter(exercise_id__in=exercise_ids)
+            .order_by()
+            .values_list("workout_id", flat=True),
+            CardioSeriesLog.objects.filter(exercise_id__in=exercise_ids)
+            .order_by()
+            .values_list("workout_id", flat=True),
+        )
+    )
+
+
+def rebuild_all_workout_summaries() -> int:
+    """Recompute the summary of every workout."""
+    return refresh_workout_summaries(Workout.objects.values_list("id", flat=True))
+
+
+def _refresh_batch(workout_ids: list[int]) -> int:
+    # Workouts deleted in the meantime are dropped by the cascade already
+    existing_ids = list(
+        Workout.objects.filter(id__in=workout_ids).values_list("id", flat=True)
+    )
+    if not existing_ids:
+        return 0
+
+    exercise_counts = dict(
+        OneExercice.objects.filter(seance_id__in=existing_ids)
+        .values("seance_id")
+        .annotate(count=Count("id"))
+        .values_list("seance_id", "count")
+    )
+    strength_stats = {
+        row["workout_id"]: row
+        for row in StrengthSeriesLog.objects.filter(workout_id__in=existing_ids)
+        .values("workout_id")
+        .annotate(count=Count("id"), volume=Sum(F("reps") * F("weight")))
+    }
+    cardio_counts = dict(
+        CardioSeriesLog.objects.filter(workout_id__in=existing_ids)
+        .values("workout_id")
+        .annotate(count=Count("id"))
+        .values_list("workout_id", "count")
+    )
+
+    muscle_groups: dict[int, set[str]] = {}
+    for model in (StrengthSeriesLog, CardioSeriesLog):
+        rows = (
+            model.objects.filter(
+                workout_id__in=existing_ids,
+                exercise__muscle_groups__isnull=False,
+            )
+            .values_list("workout_id", "exercise__muscle_groups__name")
+            .distinct()
+        )
+        for workout_id, name in rows:
+            muscle_groups.setdefault(workout_id, set()).add(name)
+
+    summaries = []
+    for workout_id in existing_ids:
+        strength = strength_stats.get(workout_id, {})
+        summaries.append(
+            WorkoutSummary(
+                workout_id=workout_id,
+                exercise_count=exercise_counts.get(workout_id, 0),
+                strength_series_count=strength.get("count", 0),
+                cardio_series_count=cardio_counts.get(workout_id, 0),
+                total_volume=strength.get("volume") or 0,
+                muscle_groups=sorted(muscle_groups.get(workout_id, ())),
+            )
+        )
+
+    WorkoutSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=["workout"],
+        update_fields=SUMMARY_FIELDS,
+    )
+    return len(summaries)
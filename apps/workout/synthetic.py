@@ -0,0 +1,354 @@
+import random
+from datetime import date, timedelta
+
+from .bulk import DEFAULT_BATCH_SIZE, bulk_set_m2m, bulk_upsert
+from .cache import ALL_STAMPS, bump_data_version
+from .models import (
+    CardioSeriesLog,
+    Equipment,
+    Exercice,
+    MuscleGroup,
+    OneExercice,
+    StrengthSeriesLog,
+    TemplateCardioSeries,
+    TemplateExercise,
+    TemplateStrengthSeries,
+    TypeWorkout,
+    Workout,
+    WorkoutTemplate,
+)
+from .records import rebuild_all_personal_records
+from .search import refresh_search_text
+from .summaries import refresh_workout_summaries
+
+MUSCLE_GROUPS = [
+    "Chest",
+    "Back",
+    "Shoulders",
+    "Biceps",
+    "Triceps",
+    "Quadriceps",
+    "Hamstrings",
+    "Glutes",
+    "Calves",
+    "Core",
+]
+EQUIPMENT = ["Barbell", "Dumbbell", "Machine", "Cable", "Bodyweight", "Treadmill"]
+
+# (name, muscle groups, equipment, starting weight in kg)
+STRENGTH_EXERCISES = [
+    ("Bench Press", ["Chest", "Triceps"], ["Barbell"], 50),
+    ("Incline Dumbbell Press", ["Chest", "Shoulders"], ["Dumbbell"], 18),
+    ("Overhead Press", ["Shoulders", "Triceps"], ["Barbell"], 30),
+    ("Lateral Raise", ["Shoulders"], ["Dumbbell"], 6),
+    ("Triceps Pushdown", ["Triceps"], ["Cable"], 20),
+    ("Dips", ["Chest", "Triceps"], ["Bodyweight"], 0),
+    ("Deadlift", ["Back", "Hamstrings", "Glutes"], ["Barbell"], 80),
+    ("Barbell Row", ["Back", "Biceps"], ["Barbell"], 45),
+    ("Lat Pulldown", ["Back", "Biceps"], ["Cable"], 40),
+    ("Pull Up", ["Back", "Biceps"], ["Bodyweight"], 0),
+    ("Biceps Curl", ["Biceps"], ["Dumbbell"], 10),
+    ("Face Pull", ["Shoulders", "Back"], ["Cable"], 15),
+    ("Squat", ["Quadriceps", "Glutes"], ["Barbell"], 60),
+    ("Leg Press", ["Quadriceps", "Glutes"], ["Machine"], 100),
+    ("Romanian Deadlift", ["Hamstrings", "Glutes"], ["Barbell"], 50),
+    ("Leg Curl", ["Hamstrings"], ["Machine"], 30),
+    ("Calf Raise", ["Calves"], ["Machine"], 40),
+    ("Plank", ["Core"], ["Bodyweight"], 0),
+]
+CARDIO_EXERCISES = [
+    ("Running", ["Quadriceps", "Calves"], ["Treadmill"]),
+    ("Rowing", ["Back", "Quadriceps"], ["Machine"]),
+    ("Cycling", ["Quadriceps", "Hamstrings"], ["Machine"]),
+]
+
+# Workout types and the share of their exercises that are strength ones
+WORKOUT_TYPES = {"Push": 1.0, "Pull": 1.0, "Legs": 0.9, "Cardio": 0.0}
+DIFFICULTIES = [value for value, _label in Exercice.DIFFICULTY_CHOICES]
+
+
+def generate_history(
+    years: int = 2,
+    exercises: int = 40,
+    workouts_per_week: int = 4,
+    templates: int = 8,
+    seed: int = 0,
+    end_date: date | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, int]:
+    """
+    Insert a realistic synthetic training history ending at ``end_date``.
+
+    Exercises beyond the built-in list are numbered variants ("Squat 2").
+    Weights progress slowly with noise and deloads, sessions rotate through
+    the workout types, and templates copy the structure of random sessions.
+    Reference rows are upserted by name, so generating twice adds a second
+    history on top of the same exercises. The same seed gives the same data.
+
+    Returns the number of rows created per table.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=365 * years)
+
+    muscle_groups, _, _ = bulk_upsert(
+        MuscleGroup, [{"name": name} for name in MUSCLE_GROUPS], ["name"], []
+    )
+    equipment, _, _ = bulk_upsert(
+        Equipment, [{"name": name} for name in EQUIPMENT], ["name"], []
+    )
+    muscle_group_ids = {mg.name: mg.id for mg in muscle_groups}
+    equipment_ids = {eq.name: eq.id for eq in equipment}
+
+    catalog = _exercise_catalog(exercises)
+    exercise_objs, _, _ = bulk_upsert(
+        Exercice,
+        [
+            {
+                "name": name,
+                "exercise_type": exercise_type,
+                "difficulty": rng.choice(DIFFICULTIES),
+            }
+            for name, exercise_type, _groups, _equipment, _weight in catalog
+        ],
+        ["name"],
+        ["exercise_type", "difficulty"],
+        batch_size=batch_size,
+    )
+    bulk_set_m2m(
+        Exercice.muscle_groups,
+        {
+            obj.id: {muscle_group_ids[group] for group in groups}
+            for obj, (_name, _type, groups, _eq, _weight) in zip(exercise_objs, catalog)
+        },
+        batch_size,
+    )
+    bulk_set_m2m(
+        Exercice.equipment,
+        {
+            obj.id: {equipment_ids[item] for item in items}
+            for obj, (_name, _type, _groups, items, _weight) in zip(
+                exercise_objs, catalog
+            )
+        },
+        batch_size,
+    )
+    start_weights = {
+        obj.id: weight for obj, (*_rest, weight) in zip(exercise_objs, catalog)
+    }
+
+    types, _, _ = bulk_upsert(
+        TypeWorkout,
+        [{"name_workout": name} for name in WORKOUT_TYPES],
+        ["name_workout"],
+        [],
+    )
+    pools = {
+        workout_type.id: (
+            [
+                obj
+                for obj in exercise_objs
+                if obj.exercise_type == "strength"
+                and _fits_type(obj.name, workout_type.name_workout)
+            ],
+            [obj for obj in exercise_objs if obj.exercise_type == "cardio"],
+            WORKOUT_TYPES[workout_type.name_workout],
+        )
+        for workout_type in types
+    }
+
+    workouts = []
+    day = start_date
+    while day <= end_date:
+        for _session in range(workouts_per_week):
+            session_day = day + timedelta(days=rng.randrange(7))
+            if session_day <= end_date:
+                workouts.append(
+                    Workout(
+                        date=session_day,
+                        type_workout=types[len(workouts) % len(types)],
+                        duration=rng.randint(35, 95),
+                    )
+                )
+        day += timedelta(weeks=1)
+    Workout.objects.bulk_create(workouts, batch_size=batch_size)
+
+    positions, strength_series, cardio_series = [], [], []
+    for workout in workouts:
+        strength_pool, cardio_pool, strength_share = pools[workout.type_workout_id]
+        weeks = (workout.date - start_date).days / 7
+        count = rng.randint(4, 7)
+        picked = rng.sample(
+            strength_pool, min(len(strength_pool), round(count * strength_share))
+        )
+        picked += rng.sample(cardio_pool, min(len(cardio_pool), count - len(picked)))
+
+        for position, exercise in enumerate(picked, start=1):
+            positions.append(
+                OneExercice(name=exercise, seance=workout, position=position)
+            )
+            if exercise.exercise_type == "strength":
+                strength_series.extend(
+                    _strength_series(
+                        rng, workout, exercise, start_weights[exercise.id], weeks
+                    )
+                )
+            else:
+                cardio_series.extend(_cardio_series(rng, workout, exercise))
+
+    OneExercice.objects.bulk_create(positions, batch_size=batch_size)
+    StrengthSeriesLog.objects.bulk_create(strength_series, batch_size=batch_size)
+    CardioSeriesLog.objects.bulk_create(cardio_series, batch_size=batch_size)
+
+    template_counts = _generate_templates(
+        rng, templates, workouts, positions, strength_series, cardio_series
+    )
+
+    refresh_workout_summaries(workout.id for workout in workouts)
+    rebuild_all_personal_records()
+    refresh_search_text(obj.id for obj in exercise_objs)
+    bump_data_version(*ALL_STAMPS)
+
+    return {
+        "exercises": len(exercise_objs),
+        "workouts": len(workouts),
+        "exercise_positions": len(positions),
+        "strength_series": len(strength_series),
+        "cardio_series": len(cardio_series),
+        **template_counts,
+    }
+
+
+def _exercise_catalog(count: int) -> list[tuple[str, str, list, list, int]]:
+    """(name, type, muscle groups, equipment, start weight) for ``count`` exercises"""
+    base = [
+        (name, "strength", groups, equipment, weight)
+        for name, groups, equipment, weight in STRENGTH_EXERCISES
+    ] + [
+        (name, "cardio", groups, equipment, 0)
+        for name, groups, equipment in CARDIO_EXERCISES
+    ]
+
+    catalog = []
+    for index in range(count):
+        name, exercise_type, groups, equipment, weight = base[index % len(base)]
+        variant = index // len(base)
+        if variant:
+            name = f"{name} {variant + 1}"
+        catalog.append((name, exercise_type, groups, equipment, weight))
+    return catalog
+
+
+def _fits_type(name: str, type_name: str) -> bool:
+    """Spread strength exercises over Push, Pull and Legs by their muscles"""
+    groups = next(
+        (
+            groups
+            for base, groups, _eq, _w in STRENGTH_EXERCISES
+            if name.startswith(base)
+        ),
+        [],
+    )
+    if type_name == "Push":
+        return bool({"Chest", "Shoulders", "Triceps"} & set(groups))
+    if type_name == "Pull":
+        return bool({"Back", "Biceps"} & set(groups))
+    if type_name == "Legs":
+        return bool(
+            {"Quadriceps", "Hamstrings", "Glutes", "Calves", "Core"} & set(groups)
+        )
+    return False
+
+
+def _strength_series(rng, workout, exercise, start_weight, weeks):
+    # ~1% progression per week, with noise and a deload every 8th week
+    weight = start_weight * (1 + 0.01 * weeks) * rng.uniform(0.93, 1.05)
+    if int(weeks) % 8 == 7:
+        weight *= 0.85
+    for series_number in range(1, rng.randint(3, 5) + 1):
+        yield StrengthSeriesLog(
+            exercise=exercise,
+            workout=workout,
+            series_number=series_number,
+            reps=rng.randint(5, 12),
+            weight=2 * round(weight / 2),
+        )
+
+
+def _cardio_series(rng, workout, exercise):
+    for series_number in range(1, rng.randint(1, 3) + 1):
+        duration = rng.randint(5, 30) * 60
+        yield CardioSeriesLog(
+            exercise=exercise,
+            workout=workout,
+            series_number=series_number,
+            duration_seconds=duration,
+            distance_m=(
+                round(duration * rng.uniform(2.2, 3.5)) if rng.random() < 0.8 else None
+            ),
+        )
+
+
+def _generate_templates(
+    rng, count, workouts, positions, strength_series, cardio_series
+):
+    """Copy the structure of ``count`` random workouts into templates"""
+    sources = rng.sample(workouts, min(count, len(workouts)))
+    source_ids = {workout.id for workout in sources}
+
+    templates = [
+        WorkoutTemplate(
+            name=f"{workout.type_workout.name_workout} {index}",
+            type_workout=workout.type_workout,
+            duration=workout.duration,
+        )
+        for index, workout in enumerate(sources, start=1)
+    ]
+    WorkoutTemplate.objects.bulk_create(templates)
+    template_by_workout = {
+        workout.id: template for workout, template in zip(sources, templates)
+    }
+
+    template_exercises = {
+        (position.seance_id, position.name_id): TemplateExercise(
+            template=template_by_workout[position.seance_id],
+            exercise_id=position.name_id,
+            position=position.position,
+        )
+        for position in positions
+        if position.seance_id in source_ids
+    }
+    TemplateExercise.objects.bulk_create(template_exercises.values())
+
+    template_strength = [
+        TemplateStrengthSeries(
+            template_exercise=template_exercises[
+                (series.workout_id, series.exercise_id)
+            ],
+            series_number=series.series_number,
+            reps=series.reps,
+            weight=series.weight,
+        )
+        for series in strength_series
+        if series.workout_id in source_ids
+    ]
+    template_cardio = [
+        TemplateCardioSeries(
+            template_exercise=template_exercises[
+                (series.workout_id, series.exercise_id)
+            ],
+            series_number=series.series_number,
+            duration_seconds=series.duration_seconds,
+            distance_m=series.distance_m,
+        )
+        for series in cardio_series
+        if series.workout_id in source_ids
+    ]
+    TemplateStrengthSeries.objects.bulk_create(template_strength)
+    TemplateCardioSeries.objects.bulk_create(template_cardio)
+
+    return {
+        "templates": len(templates),
+        "template_exercises": len(template_exercises),
+        "template_series": len(template_strength) + len(template_cardio),
+    }
@@ -1 +1,967 @@
-# Create your tests here.
+import json
+import tempfile
+from datetime import date, timedelta
+from functools import partial
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase
+from django.urls import reverse
+
+from .cache import (
+    ALL_STAMPS,
+    EXERCISES_STAMP,
+    bump_data_version,
+    get_data_version,
+)
+from .feed import build_exercises_by_workout
+from .jsonstream import iter_json_object
+from .management.commands.benchmark_workout import endpoints
+from .models import (
+    CardioSeriesLog,
+    Equipment,
+    Exercice,
+    MuscleGroup,
+    OneExercice,
+    PersonalRecord,
+    StrengthSeriesLog,
+    TemplateCardioSeries,
+    TemplateExercise,
+    TemplateStrengthSeries,
+    TypeWorkout,
+    Workout,
+    WorkoutSummary,
+    WorkoutTemplate,
+)
+from .progression import MAX_POINTS, exercise_progression, lttb
+from .records import RECORD_FIELDS, refresh_personal_records
+from .search import rebuild_all_search_text, refresh_search_text, search_exercises
+from .stats import dashboard_stats
+from .summaries import refresh_workout_summaries
+from .workout_templates import build_template_exercises, save_workout_as_template
+
+
+def create_exercises() -> list[Exercice]:
+    """Two strength exercises and a cardio one, each with a muscle group"""
+    chest = MuscleGroup.objects.create(name="Chest")
+    legs = MuscleGroup.objects.create(name="Legs")
+    exercises = [
+        Exercice.objects.create(name="Bench Press", exercise_type="strength"),
+        Exercice.objects.create(name="Squat", exercise_type="strength"),
+        Exercice.objects.create(name="Running", exercise_type="cardio"),
+    ]
+    exercises[0].muscle_groups.add(chest)
+    exercises[1].muscle_groups.add(legs)
+    exercises[2].muscle_groups.add(legs)
+    return exercises
+
+
+def create_workout(
+    day: date, exercises: list[Exercice], series: int = 1, type_name: str = "Push"
+) -> Workout:
+    """A workout doing each of ``exercises`` for ``series`` series"""
+    type_workout = TypeWorkout.objects.get_or_create(name_workout=type_name)[0]
+    workout = Workout.objects.create(date=day, type_workout=type_workout, duration=60)
+    for position, exercise in enumerate(exercises, start=1):
+        OneExercice.objects.create(name=exercise, seance=workout, position=position)
+        for series_number in range(1, series + 1):
+            if exercise.exercise_type == "strength":
+                StrengthSeriesLog.objects.create(
+                    exercise=exercise,
+                    workout=workout,
+                    series_number=series_number,
+                    reps=10,
+                    weight=50 + 5 * series_number,
+                )
+            else:
+                CardioSeriesLog.objects.create(
+                    exercise=exercise,
+                    workout=workout,
+                    series_number=series_number,
+                    duration_seconds=600,
+                    distance_m=2000.0,
+                )
+    refresh_workout_summaries([workout.id])
+    return workout
+
+
+def workout_form(
+    day: date, exercises: list[Exercice], series: int = 1, reps: int = 10
+) -> dict[str, str]:
+    """POST data of the add/edit workout form, as sent by add_workout.js"""
+    data = {"date": day.isoformat(), "type_workout": "Push", "duration": "60"}
+    for index, exercise in enumerate(exercises):
+        data[f"exercise_{index}_name"] = exercise.name
+        for series_number in range(1, series + 1):
+            prefix = f"exercise_{index}_series_{series_number}"
+            if exercise.exercise_type == "strength":
+                data[f"{prefix}_reps"] = str(reps)
+                data[f"{prefix}_weight"] = str(50 + 5 * series_number)
+            else:
+                data[f"{prefix}_duration_seconds"] = str(60 * reps)
+                data[f"{prefix}_distance_m"] = "2000"
+    return data
+
+
+class FeedQueryCountTests(TestCase):
+    """The feed costs the same queries whatever the page size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        exercises = create_exercises()
+        cls.workouts = [
+            create_workout(
+                date(2024, 1, 1) + timedelta(days=day),
+                exercises[: 1 + day % 3],
+                series=1 + day % 4,
+            )
+            for day in range(40)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_build_exercises_by_workout(self):
+        # Positions, strength series and cardio series
+        for size in (1, 5, 40):
+            workout_ids = [workout.id for workout in self.workouts[:size]]
+            with self.subTest(size=size), self.assertNumQueries(3):
+                exercises = build_exercises_by_workout(workout_ids)
+            self.assertEqual(len(exercises), size)
+
+    def test_build_exercises_by_workout_with_details(self):
+        # Plus the muscle groups
+        for size in (1, 5, 40):
+            workout_ids = [workout.id for workout in self.workouts[:size]]
+            with self.subTest(size=size), self.assertNumQueries(4):
+                exercises = build_exercises_by_workout(workout_ids, with_details=True)
+            self.assertEqual(len(exercises), size)
+
+    def test_feed_page(self):
+        # The page of workouts plus build_exercises_by_workout
+        for page_size in (1, 5, 40):
+            with (
+                self.subTest(page_size=page_size),
+                mock.patch("apps.workout.views.WORKOUTS_PER_PAGE", page_size),
+                self.assertNumQueries(5),
+            ):
+                response = self.client.get(
+                    reverse("workout"), headers={"x-requested-with": "XMLHttpRequest"}
+                )
+            self.assertEqual(len(response.json()["workout_data"]), page_size)
+
+    def test_feed_page_html(self):
+        for page_size in (1, 5, 40):
+            with (
+                self.subTest(page_size=page_size),
+                mock.patch("apps.workout.views.WORKOUTS_PER_PAGE", page_size),
+                self.assertNumQueries(5),
+            ):
+                response = self.client.get(reverse("workout"))
+            self.assertEqual(len(response.context["workout_data"]), page_size)
+
+
+class AdminSummaryTests(TestCase):
+    """Admin edits keep the workout summaries and personal records current"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("admin", password="x")
+        cls.bench, cls.squat, cls.running = create_exercises()
+        cls.upper = create_workout(date(2024, 1, 1), [cls.bench, cls.squat], series=2)
+        cls.lower = create_workout(date(2024, 1, 2), [cls.squat, cls.running])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def summary(self, workout):
+        return WorkoutSummary.objects.get(workout=workout)
+
+    def test_delete_exercise(self):
+        self.client.post(
+            reverse("admin:workout_exercice_delete", args=[self.bench.id]),
+            {"post": "yes"},
+        )
+        summary = self.summary(self.upper)
+        self.assertEqual(summary.exercise_count, 1)
+        self.assertEqual(summary.total_volume, 10 * 55 + 10 * 60)
+        self.assertEqual(summary.muscle_groups, ["Legs"])
+        self.assertEqual(dashboard_stats()["total_volume"], 10 * 55 + 10 * 60 + 10 * 55)
+
+    def test_delete_exercises_action(self):
+        self.client.post(
+            reverse("admin:workout_exercice_changelist"),
+            {
+                "action": "delete_selected",
+                "_selected_action": [self.squat.id, self.running.id],
+                "post": "yes",
+            },
+        )
+        self.assertEqual(self.summary(self.upper).exercise_count, 1)
+        self.assertEqual(self.summary(self.upper).muscle_groups, ["Chest"])
+        lower = self.summary(self.lower)
+        self.assertEqual(lower.exercise_count, 0)
+        self.assertEqual(lower.cardio_series_count, 0)
+        self.assertEqual(lower.muscle_groups, [])
+
+    def test_change_exercise_muscle_groups(self):
+        legs = MuscleGroup.objects.get(name="Legs")
+        self.client.post(
+            reverse("admin:workout_exercice_change", args=[self.bench.id]),
+            {
+                "name": "Bench Press",
+                "exercise_type": "strength",
+                "difficulty": "beginner",
+                "muscle_groups": [legs.id],
+            },
+        )
+        self.assertEqual(self.summary(self.upper).muscle_groups, ["Legs"])
+
+    def test_rename_muscle_group(self):
+        chest = MuscleGroup.objects.get(name="Chest")
+        self.client.post(
+            reverse("admin:workout_musclegroup_change", args=[chest.id]),
+            {"name": "Pecs", "description": ""},
+        )
+        self.assertEqual(self.summary(self.upper).muscle_groups, ["Legs", "Pecs"])
+
+    def test_delete_muscle_group(self):
+        legs = MuscleGroup.objects.get(name="Legs")
+        self.client.post(
+            reverse("admin:workout_musclegroup_delete", args=[legs.id]),
+            {"post": "yes"},
+        )
+        self.assertEqual(self.summary(self.upper).muscle_groups, ["Chest"])
+        self.assertEqual(self.summary(self.lower).muscle_groups, [])
+
+    def test_delete_workouts_action(self):
+        refresh_personal_records([self.bench.id, self.squat.id])
+        version = get_data_version()
+        self.client.post(
+            reverse("admin:workout_workout_changelist"),
+            {
+                "action": "delete_selected",
+                "_selected_action": [self.upper.id],
+                "post": "yes",
+            },
+        )
+        self.assertFalse(PersonalRecord.objects.filter(exercise=self.bench).exists())
+        squat = PersonalRecord.objects.get(exercise=self.squat)
+        self.assertEqual(
+            (squat.max_weight, squat.max_weight_date), (55, self.lower.date)
+        )
+        self.assertEqual(get_data_version(), version + 1)
+
+    def test_delete_workouts_action_is_atomic(self):
+        with (
+            mock.patch(
+                "apps.workout.admin.refresh_personal_records",
+                side_effect=DatabaseError("lost connection"),
+            ),
+            self.assertRaises(DatabaseError),
+        ):
+            self.client.post(
+                reverse("admin:workout_workout_changelist"),
+                {
+                    "action": "delete_selected",
+                    "_selected_action": [self.upper.id],
+                    "post": "yes",
+                },
+            )
+        self.assertTrue(Workout.objects.filter(id=self.upper.id).exists())
+
+
+class WorkoutWriteQueryCountTests(TestCase):
+    """Adding and editing a workout costs the same queries whatever its size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("athlete", password="x")
+        cls.exercises = create_exercises()
+        cls.bench, cls.squat, cls.running = cls.exercises
+        # The workout type and the payload stamps exist once the app is in use
+        TypeWorkout.objects.create(name_workout="Push")
+        bump_data_version(*ALL_STAMPS)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def edit(self, workout, data, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.post(
+                reverse("edit_workout", args=[workout.id]), data
+            )
+        self.assertRedirects(response, "/workout/", fetch_redirect_response=False)
+
+    def series_count(self, workout):
+        return (
+            StrengthSeriesLog.objects.filter(workout=workout).count()
+            + CardioSeriesLog.objects.filter(workout=workout).count()
+        )
+
+    def test_add_workout(self):
+        day = date(2024, 1, 1)
+        for exercises, series in (([self.bench, self.running], 1), (self.exercises, 8)):
+            with self.subTest(series=series), self.assertNumQueries(20):
+                response = self.client.post(
+                    reverse("add_workout"), workout_form(day, exercises, series)
+                )
+            self.assertRedirects(response, "/workout/", fetch_redirect_response=False)
+            workout = Workout.objects.latest("id")
+            self.assertEqual(self.series_count(workout), len(exercises) * series)
+            self.assertEqual(workout.summary.exercise_count, len(exercises))
+
+    def test_edit_workout(self):
+        # Every series changes
+        day = date(2024, 1, 1)
+        for exercises, series in (([self.bench, self.running], 1), (self.exercises, 8)):
+            workout = create_workout(day, exercises, series)
+            with self.subTest(series=series):
+                self.edit(workout, workout_form(day, exercises, series, reps=12), 24)
+            self.assertEqual(
+                set(
+                    StrengthSeriesLog.objects.filter(workout=workout).values_list(
+                        "reps", flat=True
+                    )
+                ),
+                {12},
+            )
+
+    def test_edit_workout_unchanged(self):
+        day = date(2024, 1, 1)
+        for exercises, series in (([self.bench, self.running], 1), (self.exercises, 8)):
+            workout = create_workout(day, exercises, series)
+            with self.subTest(series=series):
+                self.edit(workout, workout_form(day, exercises, series), 12)
+            self.assertEqual(self.series_count(workout), len(exercises) * series)
+
+    def test_edit_workout_reorder(self):
+        day = date(2024, 1, 1)
+        for exercises, series in (([self.bench, self.running], 1), (self.exercises, 8)):
+            workout = create_workout(day, exercises, series)
+            with self.subTest(series=series):
+                self.edit(workout, workout_form(day, exercises[::-1], series), 23)
+            self.assertEqual(
+                list(
+                    OneExercice.objects.filter(seance=workout)
+                    .order_by("position")
+                    .values_list("name_id", flat=True)
+                ),
+                [exercise.id for exercise in exercises[::-1]],
+            )
+
+    def test_edit_workout_removal(self):
+        # The last exercise and the last series of the others are removed
+        day = date(2024, 1, 1)
+        for exercises, series in (([self.bench, self.running], 2), (self.exercises, 8)):
+            workout = create_workout(day, exercises, series)
+            with self.subTest(series=series):
+                self.edit(workout, workout_form(day, exercises[:-1], series - 1), 25)
+            self.assertEqual(
+                self.series_count(workout), (len(exercises) - 1) * (series - 1)
+            )
+            self.assertEqual(workout.summary.exercise_count, len(exercises) - 1)
+
+
+class PersonalRecordTests(TestCase):
+    """The record index follows the series, as a rebuild would compute it"""
+
+    fields = [field for field in RECORD_FIELDS if field != "updated_at"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("athlete", password="x")
+        cls.bench, cls.squat, cls.running = create_exercises()
+        TypeWorkout.objects.create(name_workout="Push")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def add(self, data) -> Workout:
+        self.client.post(reverse("add_workout"), data)
+        return Workout.objects.latest("id")
+
+    def edit(self, workout, data):
+        self.client.post(reverse("edit_workout", args=[workout.id]), data)
+
+    def record(self) -> dict | None:
+        record = PersonalRecord.objects.filter(exercise=self.bench).values(*self.fields)
+        return record.first()
+
+    def assertRecord(self, weight, day, workout, reps=10):
+        """Check the bench record, then that a rebuild leaves it unchanged"""
+        record = self.record()
+        self.assertEqual(
+            record,
+            {
+                "max_weight": weight,
+                "max_weight_date": day,
+                "max_weight_workout": workout.id,
+                "best_estimated_1rm": weight * (1 + reps / 30),
+                "best_estimated_1rm_date": day,
+                "best_set_volume": weight * reps,
+                "best_set_volume_date": day,
+            },
+        )
+        refresh_personal_records([self.bench.id])
+        self.assertEqual(self.record(), record)
+
+    def test_create(self):
+        first = self.add(workout_form(date(2024, 1, 1), [self.bench]))
+        self.assertRecord(55, date(2024, 1, 1), first)
+        second = self.add(workout_form(date(2024, 1, 8), [self.bench], series=2))
+        self.assertRecord(60, date(2024, 1, 8), second)
+        # A lighter workout leaves the record alone
+        self.add(workout_form(date(2024, 1, 15), [self.bench]))
+        self.assertRecord(60, date(2024, 1, 8), second)
+
+    def test_create_tie_on_the_same_day(self):
+        # Ties go to the latest series, as in refresh_personal_records
+        day = date(2024, 1, 1)
+        self.add(workout_form(day, [self.bench]))
+        second = self.add(workout_form(day, [self.bench]))
+        self.assertRecord(55, day, second)
+
+    def test_edit(self):
+        first = self.add(workout_form(date(2024, 1, 1), [self.bench], series=2))
+        second = self.add(workout_form(date(2024, 1, 8), [self.bench]))
+        self.edit(first, workout_form(date(2024, 1, 1), [self.bench], 2, reps=12))
+        self.assertRecord(60, date(2024, 1, 1), first, reps=12)
+        # Down to a tie: the most recent workout holds the record
+        self.edit(first, workout_form(date(2024, 1, 1), [self.bench]))
+        self.assertRecord(55, date(2024, 1, 8), second)
+
+    def test_delete_series(self):
+        first = self.add(workout_form(date(2024, 1, 1), [self.bench]))
+        second = self.add(workout_form(date(2024, 1, 8), [self.bench], series=2))
+        self.assertRecord(60, date(2024, 1, 8), second)
+        # The record series goes away: the previous best is demoted back
+        self.edit(second, workout_form(date(2024, 1, 8), [self.squat], series=2))
+        self.assertRecord(55, date(2024, 1, 1), first)
+        self.edit(first, workout_form(date(2024, 1, 1), [self.squat]))
+        self.assertIsNone(self.record())
+
+
+class DashboardQueryCountTests(TestCase):
+    """The dashboard panels cost the same queries whatever the range"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("athlete", password="x")
+        exercises = create_exercises()
+        for day in range(0, 120, 3):
+            create_workout(
+                date(2024, 1, 1) + timedelta(days=day),
+                exercises[: 1 + day % 3],
+                type_name=("Push", "Pull", "Cardio")[day % 3],
+            )
+        bump_data_version(*ALL_STAMPS)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_dashboard_stats(self):
+        # Workouts grouped by week and type, then the top exercises
+        for start_date, end_date, workouts in (
+            (None, None, 40),
+            (date(2024, 2, 1), date(2024, 2, 29), 9),
+            (date(2024, 1, 1), date(2024, 1, 1), 1),
+        ):
+            with self.subTest(start_date=start_date), self.assertNumQueries(2):
+                stats = dashboard_stats(start_date, end_date)
+            self.assertEqual(stats["total_workouts"], workouts)
+
+    def test_get_dashboard_data(self):
+        for query in ("", "?start_date=2024-02-01&end_date=2024-02-29"):
+            with self.subTest(query=query), self.assertNumQueries(4):
+                response = self.client.get(reverse("get_dashboard_data") + query)
+            self.assertEqual(response.status_code, 200)
+
+    def test_analytics(self):
+        with self.assertNumQueries(9):
+            response = self.client.get(reverse("analytics"))
+        self.assertEqual(response.context["total_workouts"], 40)
+
+
+class TemplateQueryCountTests(TestCase):
+    """Saving and loading a template does not depend on its size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("athlete", password="x")
+        cls.exercises = create_exercises()
+        bump_data_version(*ALL_STAMPS)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def cases(self):
+        # Both sizes mix strength and cardio so every insert is issued
+        bench, squat, running = self.exercises
+        return (
+            ("small", create_workout(date(2024, 1, 1), [bench, running])),
+            ("large", create_workout(date(2024, 1, 2), self.exercises, series=8)),
+        )
+
+    def test_save_and_build(self):
+        for label, workout in self.cases():
+            with self.subTest(label):
+                with self.assertNumQueries(7):
+                    template = save_workout_as_template(workout, label)
+                with self.assertNumQueries(3):
+                    exercises = build_template_exercises(template.id)
+                self.assertEqual(
+                    exercises, build_exercises_by_workout([workout.id])[workout.id]
+                )
+
+    def test_create_and_details_views(self):
+        for label, workout in self.cases():
+            with self.subTest(label):
+                with self.assertNumQueries(13):
+                    response = self.client.post(
+                        reverse("create_template", args=[workout.id]),
+                        json.dumps({"template_name": label}),
+                        content_type="application/json",
+                    )
+                template_id = response.json()["template_id"]
+
+                with self.assertNumQueries(7):
+                    response = self.client.get(
+                        reverse("get_template_details"), {"template_id": template_id}
+                    )
+                self.assertEqual(
+                    response.json(),
+                    {
+                        "duration": workout.duration,
+                        "type_workout": "Push",
+                        "exercises": build_exercises_by_workout([workout.id])[
+                            workout.id
+                        ],
+                    },
+                )
+
+
+class RebuildCommandTests(TestCase):
+    """Rebuilding the denormalized tables invalidates the cached payloads"""
+
+    def test_rebuilds_bump_the_data_version(self):
+        create_workout(date(2024, 1, 1), create_exercises())
+        for command in ("rebuild_personal_records", "rebuild_workout_summaries"):
+            with self.subTest(command):
+                version = get_data_version()
+                call_command(command, stdout=StringIO())
+                self.assertEqual(get_data_version(), version + 1)
+
+
+@mock.patch("apps.workout.search.connection", mock.Mock(vendor="sqlite"))
+class ExerciseSearchTests(TestCase):
+    """
+    Library searches cost the same queries whatever the library size.
+
+    The Python fallback runs on every backend, so that neither the counts
+    nor the ranking depend on pg_trgm.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.chest = MuscleGroup.objects.create(name="Chest")
+        cls.legs = MuscleGroup.objects.create(name="Legs")
+        cls.barbell = Equipment.objects.create(name="Barbell")
+        flat_bench = Equipment.objects.create(name="Flat Bench")
+        for name, group, equipment, difficulty in (
+            ("Bench Press", cls.chest, cls.barbell, "beginner"),
+            ("Incline Bench Press", cls.chest, cls.barbell, "intermediate"),
+            ("Dumbbell Fly", cls.chest, flat_bench, "beginner"),
+            ("Squat", cls.legs, cls.barbell, "advanced"),
+        ):
+            exercise = Exercice.objects.create(name=name, difficulty=difficulty)
+            exercise.muscle_groups.add(group)
+            exercise.equipment.add(equipment)
+        rebuild_all_search_text()
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, *args, **kwargs) -> tuple[list[str], dict]:
+        exercises, facets = search_exercises(*args, **kwargs)
+        return [exercise.name for exercise in exercises], facets
+
+    def grow_library(self, count):
+        exercises = Exercice.objects.bulk_create(
+            Exercice(name=f"Lunge {index}", difficulty="advanced")
+            for index in range(count)
+        )
+        Exercice.muscle_groups.through.objects.bulk_create(
+            Exercice.muscle_groups.through(exercice=exercise, musclegroup=self.legs)
+            for exercise in exercises
+        )
+        refresh_search_text(exercise.id for exercise in exercises)
+        bump_data_version(EXERCISES_STAMP)
+
+    def test_query_count(self):
+        # Three facet queries, the results and their two prefetches, plus
+        # the data version of the cached search index when there are words
+        searches = [
+            ({}, 6),
+            ({"query": "bench"}, 7),
+            ({"query": "bech press", "difficulty": "beginner"}, 7),
+            ({"query": "press", "muscle_group_id": self.chest.id}, 7),
+            ({"equipment_id": self.barbell.id}, 6),
+        ]
+        for size in ("small", "large"):
+            if size == "large":
+                self.grow_library(200)
+            for search, queries in searches:
+                # The first keystroke builds the search index
+                self.search(**search)
+                with self.subTest(size, **search), self.assertNumQueries(queries):
+                    self.search(**search)
+
+    def test_ranking(self):
+        # Start of the name, then the name, then muscle groups or equipment
+        self.assertEqual(
+            self.search("bench")[0],
+            ["Bench Press", "Incline Bench Press", "Dumbbell Fly"],
+        )
+        # Close words only, sorted by name
+        self.assertEqual(
+            self.search("bech")[0],
+            ["Bench Press", "Dumbbell Fly", "Incline Bench Press"],
+        )
+
+    def test_facet_counts(self):
+        names, facets = self.search("bench", muscle_group_id=self.legs.id)
+        self.assertEqual(names, [])
+        self.assertEqual(facets["total"], 0)
+        # Each facet ignores its own filter but keeps the others
+        self.assertEqual([group["count"] for group in facets["muscle_groups"]], [3, 0])
+        self.assertEqual(
+            {item["name"]: item["count"] for item in facets["equipment"]},
+            {"Barbell": 0, "Flat Bench": 0},
+        )
+        self.assertEqual(
+            [difficulty["count"] for difficulty in facets["difficulties"]], [0, 0, 0]
+        )
+
+        names, facets = self.search("press", difficulty="beginner")
+        self.assertEqual(names, ["Bench Press"])
+        self.assertEqual(facets["total"], 1)
+        self.assertEqual(
+            [difficulty["count"] for difficulty in facets["difficulties"]], [1, 1, 0]
+        )
+
+
+class ProgressionTests(TestCase):
+    """Exercise progression buckets and downsampling"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("athlete", password="x")
+        cls.bench, cls.squat, _running = create_exercises()
+        type_workout = TypeWorkout.objects.create(name_workout="Push")
+        # 60 bench workouts, every third day, with a sawtooth of top weights
+        for index in range(60):
+            workout = Workout.objects.create(
+                date=date(2024, 1, 1) + timedelta(days=3 * index),
+                type_workout=type_workout,
+                duration=60,
+            )
+            StrengthSeriesLog.objects.create(
+                exercise=cls.bench,
+                workout=workout,
+                series_number=1,
+                reps=5,
+                weight=60 + index * 7 % 23,
+            )
+        # Two squat workouts in the first week, one in each of the next two
+        for day in (date(2024, 1, 1), date(2024, 1, 3), date(2024, 1, 8)):
+            create_workout(day, [cls.squat], series=2)
+        create_workout(date(2024, 2, 5), [cls.squat], series=2)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_downsampling(self):
+        full = exercise_progression(self.bench.id, points=100)
+        self.assertEqual(len(full["points"]), 60)
+        self.assertFalse(full["downsampled"])
+
+        for points in (3, 10, 59):
+            with self.subTest(points=points):
+                progression = exercise_progression(self.bench.id, points=points)
+                self.assertEqual(progression["total_points"], 60)
+                self.assertTrue(progression["downsampled"])
+                self.assertEqual(len(progression["points"]), points)
+                # A subset of the full series, first and last points included
+                self.assertLessEqual(
+                    {point["date"] for point in progression["points"]},
+                    {point["date"] for point in full["points"]},
+                )
+                self.assertEqual(progression["points"][0], full["points"][0])
+                self.assertEqual(progression["points"][-1], full["points"][-1])
+
+    def test_lttb(self):
+        data = [(x, 0.0) for x in range(20)]
+        data[7] = (7, 100.0)
+        kept = lttb(data, 5)
+        self.assertEqual(len(kept), 5)
+        self.assertEqual([kept[0], kept[-1]], [0, 19])
+        # The peak survives
+        self.assertIn(7, kept)
+        self.assertEqual(lttb(data[:4], 5), [0, 1, 2, 3])
+        with self.assertRaises(ValueError):
+            lttb(data, 2)
+
+    def test_buckets(self):
+        # Each workout: 10 reps at 55 kg, then 10 reps at 60 kg
+        def point(day, workouts):
+            return {
+                "date": day,
+                "top_weight": 60,
+                "estimated_1rm": 80.0,
+                "volume": 1150 * workouts,
+                "sets": 2 * workouts,
+                "reps": 20 * workouts,
+                "workouts": workouts,
+            }
+
+        for bucket, expected in (
+            (
+                "week",
+                [
+                    point("2024-01-01", 2),
+                    point("2024-01-08", 1),
+                    point("2024-02-05", 1),
+                ],
+            ),
+            ("month", [point("2024-01-01", 3), point("2024-02-01", 1)]),
+        ):
+            with self.subTest(bucket):
+                progression = exercise_progression(self.squat.id, bucket=bucket)
+                self.assertEqual(progression["points"], expected)
+
+    def test_view_rejects_bad_parameters(self):
+        url = reverse("get_exercise_progression")
+        for parameters in (
+            {"bucket": "day"},
+            {"metric": "reps"},
+            {"points": "2"},
+            {"points": str(MAX_POINTS + 1)},
+            {"points": "ten"},
+        ):
+            with self.subTest(**parameters):
+                response = self.client.get(
+                    url, {"exercise_id": self.bench.id, **parameters}
+                )
+                self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(
+            url, {"exercise_id": self.bench.id, "bucket": "month", "points": "3"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["points"]), 3)
+
+
+def snapshot() -> dict[str, list[tuple]]:
+    """The workout data by natural keys, as an import recreates it"""
+    tables = {
+        "type_workouts": TypeWorkout.objects.values_list("name_workout"),
+        "muscle_groups": MuscleGroup.objects.values_list("name", "description"),
+        "equipment": Equipment.objects.values_list("name", "description"),
+        "exercises": Exercice.objects.values_list(
+            "name", "exercise_type", "difficulty", "search_text"
+        ),
+        "exercise_muscle_groups": Exercice.muscle_groups.through.objects.values_list(
+            "exercice__name", "musclegroup__name"
+        ),
+        "exercise_equipment": Exercice.equipment.through.objects.values_list(
+            "exercice__name", "equipment__name"
+        ),
+        "workouts": Workout.objects.values_list(
+            "date", "type_workout__name_workout", "duration"
+        ),
+        "strength_series_logs": StrengthSeriesLog.objects.values_list(
+            "workout__date", "exercise__name", "series_number", "reps", "weight"
+        ),
+        "cardio_series_logs": CardioSeriesLog.objects.values_list(
+            "workout__date",
+            "exercise__name",
+            "series_number",
+            "duration_seconds",
+            "distance_m",
+        ),
+        "one_exercices": OneExercice.objects.values_list(
+            "seance__date", "name__name", "position"
+        ),
+        "summaries": WorkoutSummary.objects.values_list(
+            "workout__date", "exercise_count", "total_volume", "muscle_groups"
+        ),
+        "personal_records": PersonalRecord.objects.values_list(
+            "exercise__name", "max_weight", "max_weight_date", "best_set_volume"
+        ),
+        "workout_templates": WorkoutTemplate.objects.values_list(
+            "name", "type_workout__name_workout", "duration", "is_active"
+        ),
+        "template_exercises": TemplateExercise.objects.values_list(
+            "template__name", "exercise__name", "position"
+        ),
+        "template_strength_series": TemplateStrengthSeries.objects.values_list(
+            "template_exercise__template__name",
+            "template_exercise__position",
+            "series_number",
+            "reps",
+            "weight",
+        ),
+        "template_cardio_series": TemplateCardioSeries.objects.values_list(
+            "template_exercise__template__name",
+            "template_exercise__position",
+            "series_number",
+            "duration_seconds",
+            "distance_m",
+        ),
+    }
+    return {name: sorted(map(tuple, rows)) for name, rows in tables.items()}
+
+
+class ImportExportTests(TestCase):
+    """An export imported into an empty database recreates the same data"""
+
+    @classmethod
+    def setUpTestData(cls):
+        exercises = create_exercises()
+        exercises[0].equipment.add(Equipment.objects.create(name="Barbell"))
+        refresh_search_text(exercise.id for exercise in exercises)
+        workout = create_workout(date(2024, 1, 1), exercises, series=3)
+        create_workout(date(2024, 1, 3), exercises[1:], type_name="Legs")
+        save_workout_as_template(workout, "Full body")
+        refresh_personal_records(exercise.id for exercise in exercises)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.expected = snapshot()
+        self.assertTrue(all(self.expected.values()), "every table has rows")
+
+    def export(self, name, **options) -> Path:
+        path = self.directory / name
+        call_command("export_workout_data", output=str(path), **options)
+        return path
+
+    def reimport(self, path):
+        """Import ``path`` into an emptied database"""
+        call_command("clear_workout_data", no_input=True, stdout=StringIO())
+        WorkoutTemplate.objects.all().delete()
+        self.assertEqual(Workout.objects.count(), 0)
+        call_command("import_workout_data", file=str(path), stdout=StringIO())
+
+    def test_json_round_trip(self):
+        # A tiny read buffer cuts strings and numbers across reads
+        path = self.export("export.json")
+        with mock.patch(
+            "apps.workout.jsonstream.iter_json_object",
+            partial(iter_json_object, read_size=7),
+        ):
+            self.reimport(path)
+        self.assertEqual(snapshot(), self.expected)
+
+    def test_columnar_round_trip(self):
+        # Two rows per block, so tables span several blocks
+        path = self.export("export.jsonl.gz", format="columnar", chunk_size=2)
+        self.assertEqual(path.read_bytes()[:2], b"\x1f\x8b")
+        self.reimport(path)
+        self.assertEqual(snapshot(), self.expected)
+
+    def test_sections_out_of_order(self):
+        # Series before their workouts and exercises go through temp files
+        path = self.export("export.json")
+        export = json.loads(path.read_text())
+        path.write_text(json.dumps(dict(reversed(export.items()))))
+        self.reimport(path)
+        self.assertEqual(snapshot(), self.expected)
+
+
+class ExportStreamingTests(TestCase):
+    """GET export_data streams under both WSGI and ASGI"""
+
+    # reverse("export_data") is the home app's export
+    url = "/workout/export_data/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("athlete", password="x")
+        create_workout(date(2024, 1, 1), create_exercises(), series=3)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+
+    def test_wsgi(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.is_async)
+        export = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(export["strength_series_logs"]), 6)
+
+    async def test_asgi(self):
+        response = await self.async_client.get(self.url)
+        # An async iterator is sent chunk by chunk instead of listed first
+        self.assertTrue(response.is_async)
+        export = json.loads(
+            b"".join([chunk async for chunk in response.streaming_content])
+        )
+        self.assertEqual(len(export["strength_series_logs"]), 6)
+
+
+class BenchmarkSmokeTests(TestCase):
+    """The synthetic data generator and the benchmark run at their smallest size"""
+
+    def test_generate_workout_data(self):
+        stdout = StringIO()
+        call_command(
+            "generate_workout_data",
+            years=1,
+            exercises=5,
+            workouts_per_week=1,
+            templates=1,
+            stdout=stdout,
+        )
+        self.assertIn("Synthetic workout data generated.", stdout.getvalue())
+        self.assertTrue(Workout.objects.exists())
+        self.assertTrue(StrengthSeriesLog.objects.exists())
+        self.assertTrue(WorkoutTemplate.objects.exists())
+
+    def test_benchmark_workout(self):
+        stdout = StringIO()
+        call_command(
+            "benchmark_workout",
+            years="1",
+            exercises=5,
+            workouts_per_week=1,
+            repeat=2,
+            use_current_database=True,
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+        results = json.loads(stdout.getvalue())
+
+        (size,) = results["sizes"]
+        self.assertEqual(size["years"], 1)
+        self.assertEqual(size["rows"]["imported_workouts"], size["rows"]["workouts"])
+        self.assertEqual(
+            sorted(size["benchmarks"]),
+            sorted(
+                [name for name, _url in endpoints(date.today())]
+                + ["export_json", "export_columnar", "import_json", "import_columnar"]
+            ),
+        )
+        for name, benchmark in size["benchmarks"].items():
+            with self.subTest(name=name):
+                self.assertGreater(benchmark["queries"], 0)
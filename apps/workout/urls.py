@@ -8,6 +8,7 @@ urlpatterns = [
     path("get_last_workout/", views.get_last_workout, name="get_last_workout"),
     path("get_list_exercice/", views.get_list_exercise, name="get_list_exercise"),
     path("get_workout_types/", views.get_workout_types, name="get_workout_types"),
+    path("get_reference_data/", views.get_reference_data, name="get_reference_data"),
     path("add_workout/", views.add_workout, name="add_workout"),
     path("edit_workout/<int:workout_id>/", views.edit_workout, name="edit_workout"),
     path(
@@ -23,6 +24,12 @@ urlpatterns = [
     path("analytics/", views.analytics, name="analytics"),
     path("get_dashboard_data/", views.get_dashboard_data, name="get_dashboard_data"),
     path("get_calendar_data/", views.get_calendar_data, name="get_calendar_data"),
+    path(
+        "get_exercise_progression/",
+        views.get_exercise_progression,
+        name="get_exercise_progression",
+    ),
+    path("cache_stats/", views.get_cache_stats, name="cache_stats"),
     path("export_data/", views.export_data, name="export_data"),
     path("import_data/", views.import_data, name="import_data"),
     path("clear_data/", views.clear_data, name="clear_data"),
@@ -1,36 +1,75 @@
 import json
 import logging
-import os
-import tempfile
-from datetime import datetime, timedelta
-from typing import Any
+from datetime import datetime
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
-from django.core.management import call_command
+from django.core.handlers.asgi import ASGIRequest
 from django.core.paginator import Paginator
 from django.db import transaction
-from django.http import HttpResponse, JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.utils import translation
 from django.utils.translation import gettext
 
+from apps.jobs.runner import enqueue, save_upload
+from apps.jobs.views import job_payload
+
+from .cache import (
+    EXERCISES_STAMP,
+    TEMPLATES_STAMP,
+    WORKOUT_TYPES_STAMP,
+    bump_data_version,
+    cache_stats,
+    cached_payload,
+    get_data_version,
+)
+from .conditional import conditional_on
+from .export import (
+    aiter_chunks,
+    iter_columnar_export,
+    iter_gzip,
+    iter_json_export,
+)
+from .feed import build_exercises_by_workout
+from .heatmap import calendar_payload
 from .models import (
-    CardioSeriesLog,
-    Equipment,
     Exercice,
-    MuscleGroup,
-    OneExercice,
+    PersonalRecord,
     StrengthSeriesLog,
-    TemplateCardioSeries,
-    TemplateExercise,
-    TemplateStrengthSeries,
     TypeWorkout,
     Workout,
     WorkoutTemplate,
 )
+from .pagination import paginate_by_cursor
+from .progression import (
+    BUCKETS,
+    DEFAULT_POINTS,
+    MAX_POINTS,
+    METRICS,
+    exercise_progression,
+)
+from .records import record_new_series, refresh_personal_records
+from .reference import REFERENCE_STAMPS, reference_data
+from .search import search_exercises
+from .series import (
+    create_workout_series,
+    parse_exercise_form,
+    sync_workout_series,
+)
+from .stats import dashboard_stats
+from .summaries import refresh_workout_summaries
+from .workout_templates import build_template_exercises, save_workout_as_template
 
 logger = logging.getLogger(__name__)
 
+WORKOUTS_PER_PAGE = 5
+
+
+def new_type_stamps(type_created: bool) -> tuple[str, ...]:
+    """Change stamps to bump when saving a workout created its type"""
+    return (WORKOUT_TYPES_STAMP,) if type_created else ()
+
 
 def redirect_workout(request):
     lang = translation.get_language()
@@ -40,7 +79,7 @@ def redirect_workout(request):
     exercise_filter = request.GET.get("exercise", "")
 
     # Base queryset
-    workouts = Workout.objects.all().order_by("-date")
+    workouts = Workout.objects.select_related("type_workout").order_by("-date")
 
     # Apply workout type filter (exact match)
     if workout_type_filter:
@@ -54,102 +93,33 @@ def redirect_workout(request):
             oneexercice__name__name__icontains=exercise_filter
         ).distinct()
 
-    paginator = Paginator(workouts, 5)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
-
-    workout_data = []
-    for workout in page_obj:
-        type_workout = (
-            workout.type_workout.name_workout if workout.type_workout else "No Type"
-        )
-        exercises: list[dict[str, Any]] = []
-
-        # Get exercises ordered by position from OneExercice
-        one_exercices = OneExercice.objects.filter(seance=workout).order_by("position")
-        exercise_positions: dict[int, int] = {
-            oe.name.id: oe.position for oe in one_exercices
+    if "page" in request.GET:
+        # Legacy page-number mode (COUNT + OFFSET), kept for existing links
+        paginator = Paginator(workouts.order_by("-date", "-id"), WORKOUTS_PER_PAGE)
+        page_obj = paginator.get_page(request.GET.get("page"))
+        page_workouts = list(page_obj)
+        pagination = {
+            "has_next": page_obj.has_next(),
+            "next_page_number": (
+                page_obj.next_page_number() if page_obj.has_next() else None
+            ),
         }
-
-        # Get strength exercises with series
-        strength_series = StrengthSeriesLog.objects.filter(workout=workout).order_by(
-            "exercise", "series_number"
+    else:
+        # Keyset mode: seek past the (date, id) cursor, no count query
+        page_workouts, next_cursor = paginate_by_cursor(
+            workouts, request.GET.get("cursor"), WORKOUTS_PER_PAGE
         )
-        current_exercise: int | None = None
-        current_exercise_data: dict[str, Any] | None = None
-
-        for series in strength_series:
-            if current_exercise != series.exercise.id:
-                if current_exercise_data:
-                    exercises.append(current_exercise_data)
-                current_exercise = series.exercise.id
-                current_exercise_data = {
-                    "id": series.exercise.id,
-                    "name": series.exercise.name,
-                    "exercise_type": "strength",
-                    "position": exercise_positions.get(series.exercise.id, 0),
-                    "series": [],
-                    "muscle_groups": list(
-                        series.exercise.muscle_groups.all().values_list(
-                            "name", flat=True
-                        )
-                    ),
-                }
-
-            if current_exercise_data is not None:
-                current_exercise_data["series"].append(
-                    {
-                        "series_number": series.series_number,
-                        "reps": series.reps,
-                        "weight": series.weight,
-                    }
-                )
+        pagination = {"has_next": next_cursor is not None, "next_cursor": next_cursor}
 
-        if current_exercise_data:
-            exercises.append(current_exercise_data)
+    exercises_by_workout = build_exercises_by_workout(
+        (workout.id for workout in page_workouts), with_details=True
+    )
 
-        # Get cardio exercises with series
-        cardio_series = CardioSeriesLog.objects.filter(workout=workout).order_by(
-            "exercise", "series_number"
+    workout_data = []
+    for workout in page_workouts:
+        type_workout = (
+            workout.type_workout.name_workout if workout.type_workout else "No Type"
         )
-        current_cardio_exercise: int | None = None
-        current_cardio_data: dict[str, Any] | None = None
-
-        for cardio_series_item in cardio_series:
-            if current_cardio_exercise != cardio_series_item.exercise.id:
-                if current_cardio_data:
-                    exercises.append(current_cardio_data)
-                current_cardio_exercise = cardio_series_item.exercise.id
-                current_cardio_data = {
-                    "id": cardio_series_item.exercise.id,
-                    "name": cardio_series_item.exercise.name,
-                    "exercise_type": "cardio",
-                    "position": exercise_positions.get(
-                        cardio_series_item.exercise.id, 0
-                    ),
-                    "series": [],
-                    "muscle_groups": list(
-                        cardio_series_item.exercise.muscle_groups.all().values_list(
-                            "name", flat=True
-                        )
-                    ),
-                }
-
-            if current_cardio_data is not None:
-                current_cardio_data["series"].append(
-                    {
-                        "series_number": cardio_series_item.series_number,
-                        "duration_seconds": cardio_series_item.duration_seconds,
-                        "distance_m": cardio_series_item.distance_m,
-                    }
-                )
-
-        if current_cardio_data:
-            exercises.append(current_cardio_data)
-
-        # Sort exercises by position
-        exercises.sort(key=lambda x: x.get("position", 0))
-
         workout_data.append(
             {
                 "workout": {
@@ -158,33 +128,16 @@ def redirect_workout(request):
                     "type_workout": type_workout,
                     "duration": workout.duration,
                 },
-                "exercises": exercises,
+                "exercises": exercises_by_workout[workout.id],
             }
         )
 
     is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
-    # Get unique workout types and exercises for filter dropdowns
-    all_workout_types = (
-        TypeWorkout.objects.all()
-        .values_list("name_workout", flat=True)
-        .distinct()
-        .order_by("name_workout")
-    )
-    all_exercises = (
-        Exercice.objects.all()
-        .values_list("name", flat=True)
-        .distinct()
-        .order_by("name")
-    )
-
     if is_ajax:
         data = {
             "workout_data": workout_data,
-            "has_next": page_obj.has_next(),
-            "next_page_number": (
-                page_obj.next_page_number() if page_obj.has_next() else None
-            ),
+            **pagination,
         }
         return JsonResponse(data)
 
@@ -192,14 +145,9 @@ def redirect_workout(request):
         "page": "workout",
         "lang": lang,
         "workout_data": workout_data,
-        "has_next": page_obj.has_next(),
-        "next_page_number": (
-            page_obj.next_page_number() if page_obj.has_next() else None
-        ),
+        **pagination,
         "workout_type_filter": workout_type_filter,
         "exercise_filter": exercise_filter,
-        "all_workout_types": all_workout_types,
-        "all_exercises": all_exercises,
         "translations": {
             "exercise": gettext("Exercise"),
             "exercice": gettext("Exercise"),
@@ -225,7 +173,7 @@ def add_workout(request):
                 type_workout = request.POST["type_workout"]
                 duration = request.POST["duration"]
 
-                type_obj, _ = TypeWorkout.objects.get_or_create(
+                type_obj, type_created = TypeWorkout.objects.get_or_create(
                     name_workout=type_workout
                 )
 
@@ -233,140 +181,15 @@ def add_workout(request):
                     date=date, type_workout=type_obj, duration=duration
                 )
 
-                # Process exercises and series from form data
-                # Form structure: exercise_<id>_name, exercise_<id>_series_<series_num>_reps, etc.
-                exercise_data = {}
-                for key, value in request.POST.items():
-                    if key.startswith("exercise_") and key.endswith("_name"):
-                        # Extract exercise ID: exercise_0_name -> 0
-                        exercise_id = key.split("_")[1]
-                        if exercise_id not in exercise_data:
-                            exercise_data[exercise_id] = {"name": value, "series": {}}
-                    elif key.startswith("exercise_") and "_series_" in key:
-                        # Extract exercise ID and series number
-                        # Format: exercise_<id>_series_<num>_<field>
-                        parts = key.split("_")
-                        exercise_id = parts[1]
-                        series_num = parts[3]
-                        field_name = "_".join(parts[4:])
-
-                        if exercise_id not in exercise_data:
-                            exercise_data[exercise_id] = {"name": "", "series": {}}
-                        if series_num not in exercise_data[exercise_id]["series"]:
-                            exercise_data[exercise_id]["series"][series_num] = {}
-
-                        exercise_data[exercise_id]["series"][series_num][
-                            field_name
-                        ] = value
-
-                logger.info(
-                    f"Processing {len(exercise_data)} exercises "
-                    f"for workout {workout.id}"
+                created_series = create_workout_series(
+                    workout, parse_exercise_form(request.POST)
                 )
 
-                # Sort exercises by their ID to maintain order
-                sorted_exercises = sorted(
-                    exercise_data.items(), key=lambda x: int(x[0])
+                refresh_workout_summaries([workout.id])
+                record_new_series(
+                    created_series, datetime.strptime(date, "%Y-%m-%d").date()
                 )
-
-                for position, (exercise_id, data) in enumerate(
-                    sorted_exercises, start=1
-                ):
-                    logger.info(
-                        f"Processing exercise_id: {exercise_id}, "
-                        f"data: {data}, position: {position}"
-                    )
-
-                    if "name" not in data or not data["name"]:
-                        logger.warning(f"Exercise {exercise_id} missing name, skipping")
-                        continue
-
-                    try:
-                        exercise_obj = Exercice.objects.get(name=data["name"])
-                        logger.info(
-                            f"Found exercise: {exercise_obj.name} "
-                            f"(type: {exercise_obj.exercise_type})"
-                        )
-                    except Exercice.DoesNotExist:
-                        logger.warning(
-                            f"Exercise '{data['name']}' not found in database, "
-                            f"skipping"
-                        )
-                        continue
-
-                    # Create OneExercice record for position tracking
-                    _ = OneExercice.objects.create(
-                        name=exercise_obj, seance=workout, position=position
-                    )
-                    logger.info(
-                        f"Created OneExercice: {exercise_obj.name} "
-                        f"at position {position}"
-                    )
-
-                    # Process series for this exercise
-                    if exercise_obj.exercise_type == "strength":
-                        logger.info(
-                            f"Creating StrengthSeriesLog entries for "
-                            f"exercise: {exercise_obj.name}, workout: {workout.id}"
-                        )
-
-                        for series_num_str, series_data in data["series"].items():
-                            series_num = int(series_num_str)
-                            reps = series_data.get("reps", 1)
-                            if reps == "" or reps is None:
-                                reps = 1
-                            else:
-                                reps = int(reps)
-
-                            weight = series_data.get("weight", 0)
-                            if weight == "" or weight is None:
-                                weight = 0
-                            else:
-                                weight = int(weight)
-
-                            StrengthSeriesLog.objects.create(
-                                exercise=exercise_obj,
-                                workout=workout,
-                                series_number=series_num,
-                                reps=reps,
-                                weight=weight,
-                            )
-                            logger.info(
-                                f"Created StrengthSeriesLog: "
-                                f"{exercise_obj.name} series {series_num}"
-                            )
-
-                    elif exercise_obj.exercise_type == "cardio":
-                        logger.info(
-                            f"Creating CardioSeriesLog entries for "
-                            f"exercise: {exercise_obj.name}, workout: {workout.id}"
-                        )
-
-                        for series_num_str, series_data in data["series"].items():
-                            series_num = int(series_num_str)
-                            duration = series_data.get("duration_seconds")
-                            if duration == "" or duration is None:
-                                duration = None
-                            else:
-                                duration = int(duration)
-
-                            distance = series_data.get("distance_m")
-                            if distance == "" or distance is None:
-                                distance = None
-                            else:
-                                distance = float(distance)
-
-                            CardioSeriesLog.objects.create(
-                                exercise=exercise_obj,
-                                workout=workout,
-                                series_number=series_num,
-                                duration_seconds=duration,
-                                distance_m=distance,
-                            )
-                            logger.info(
-                                f"Created CardioSeriesLog: "
-                                f"{exercise_obj.name} interval {series_num}"
-                            )
+                bump_data_version(*new_type_stamps(type_created))
 
         except Exception as e:
             # If there's any error, redirect back to form with error handling
@@ -400,119 +223,48 @@ def get_last_workout(request):
         Workout.objects.filter(type_workout=workout_type_id).order_by("-date").first()
     )
 
-    all_exercises = (
-        Exercice.objects.all().order_by("name").values("name", "exercise_type")
-    )
-
     if last_workout:
-        exercises_data: list[dict[str, Any]] = []
-
-        # Get exercises ordered by position from OneExercice
-        one_exercices = OneExercice.objects.filter(seance=last_workout).order_by(
-            "position"
-        )
-        exercise_positions: dict[int, int] = {
-            oe.name.id: oe.position for oe in one_exercices
-        }
-
-        # Get all strength exercises from the last workout
-        strength_series = StrengthSeriesLog.objects.filter(
-            workout=last_workout
-        ).order_by("exercise", "series_number")
-        current_exercise: int | None = None
-        current_exercise_data: dict[str, Any] | None = None
-
-        for series in strength_series:
-            if current_exercise != series.exercise.id:
-                if current_exercise_data:
-                    exercises_data.append(current_exercise_data)
-                current_exercise = series.exercise.id
-                current_exercise_data = {
-                    "name": series.exercise.name,
-                    "exercise_type": "strength",
-                    "position": exercise_positions.get(series.exercise.id, 0),
-                    "series": [],
-                }
-
-            if current_exercise_data is not None:
-                current_exercise_data["series"].append(
-                    {
-                        "series_number": series.series_number,
-                        "reps": series.reps,
-                        "weight": series.weight,
-                    }
-                )
-
-        if current_exercise_data:
-            exercises_data.append(current_exercise_data)
-
-        # Get all cardio exercises from the last workout
-        cardio_series = CardioSeriesLog.objects.filter(workout=last_workout).order_by(
-            "exercise", "series_number"
-        )
-        current_cardio_exercise: int | None = None
-        current_cardio_data: dict[str, Any] | None = None
-
-        for cardio_series_item in cardio_series:
-            if current_cardio_exercise != cardio_series_item.exercise.id:
-                if current_cardio_data:
-                    exercises_data.append(current_cardio_data)
-                current_cardio_exercise = cardio_series_item.exercise.id
-                current_cardio_data = {
-                    "name": cardio_series_item.exercise.name,
-                    "exercise_type": "cardio",
-                    "position": exercise_positions.get(
-                        cardio_series_item.exercise.id, 0
-                    ),
-                    "series": [],
-                }
-
-            if current_cardio_data is not None:
-                current_cardio_data["series"].append(
-                    {
-                        "series_number": cardio_series_item.series_number,
-                        "duration_seconds": cardio_series_item.duration_seconds,
-                        "distance_m": cardio_series_item.distance_m,
-                    }
-                )
-
-        if current_cardio_data:
-            exercises_data.append(current_cardio_data)
-
-        # Sort exercises by position
-        exercises_data.sort(key=lambda x: x.get("position", 0))
+        exercises_data = build_exercises_by_workout([last_workout.id])[last_workout.id]
 
         data = {
             "date": last_workout.date.strftime("%Y-%m-%d"),
             "exercises": exercises_data,
-            "all_exercises": list(all_exercises),
         }
     else:
-        data = {"all_exercises": list(all_exercises)}
+        data = {}
 
     return JsonResponse(data)
 
 
 @login_required
-def get_list_exercise(_request):
-    all_exercises = (
-        Exercice.objects.all().order_by("name").values("name", "exercise_type")
-    )
-    data = {"all_exercises": list(all_exercises)}
-    return JsonResponse(data)
+@conditional_on(*REFERENCE_STAMPS)
+async def get_reference_data(_request):
+    """
+    Exercises, muscle groups, equipment and workout types in one bundle.
+
+    The pages load it once and revalidate it with its ETag, which changes
+    with the exercises and workout types.
+    """
+    return JsonResponse(await sync_to_async(reference_data)())
 
 
 @login_required
-def get_workout_types(_request):
-    workout_types = TypeWorkout.objects.all().order_by("name_workout")
+@conditional_on(EXERCISES_STAMP)
+async def get_list_exercise(_request):
+    exercises = (await sync_to_async(reference_data)())["exercises"]
+    data = {
+        "all_exercises": [
+            {"name": exercise["name"], "exercise_type": exercise["exercise_type"]}
+            for exercise in exercises
+        ]
+    }
+    return JsonResponse(data)
 
-    workout_types_data = []
-    for workout_type in workout_types:
-        workout_types_data.append(
-            {"value": workout_type.name_workout, "display": workout_type.name_workout}
-        )
 
-    data = {"workout_types": workout_types_data}
+@login_required
+@conditional_on(WORKOUT_TYPES_STAMP)
+async def get_workout_types(_request):
+    data = {"workout_types": (await sync_to_async(reference_data)())["workout_types"]}
     return JsonResponse(data)
 
 
@@ -521,7 +273,7 @@ def edit_workout(request, workout_id):
     lang = translation.get_language()
 
     try:
-        workout = Workout.objects.get(id=workout_id)
+        workout = Workout.objects.select_related("type_workout").get(id=workout_id)
     except Workout.DoesNotExist:
         return redirect("/workout/")
 
@@ -529,111 +281,35 @@ def edit_workout(request, workout_id):
         try:
             with transaction.atomic():
                 # Update workout basic fields
+                date_changed = workout.date.isoformat() != request.POST["date"]
                 workout.date = request.POST["date"]
                 type_workout = request.POST["type_workout"]
                 workout.duration = request.POST["duration"]
 
-                type_obj, _ = TypeWorkout.objects.get_or_create(
+                type_obj, type_created = TypeWorkout.objects.get_or_create(
                     name_workout=type_workout
                 )
                 workout.type_workout = type_obj
                 workout.save()
 
-                # Delete existing exercise data
-                OneExercice.objects.filter(seance=workout).delete()
-                StrengthSeriesLog.objects.filter(workout=workout).delete()
-                CardioSeriesLog.objects.filter(workout=workout).delete()
-
-                # Process exercises and series from form data
-                # (same logic as add_workout)
-                exercise_data = {}
-                for key, value in request.POST.items():
-                    if key.startswith("exercise_") and key.endswith("_name"):
-                        exercise_id = key.split("_")[1]
-                        if exercise_id not in exercise_data:
-                            exercise_data[exercise_id] = {"name": value, "series": {}}
-                    elif key.startswith("exercise_") and "_series_" in key:
-                        parts = key.split("_")
-                        exercise_id = parts[1]
-                        series_num = parts[3]
-                        field_name = "_".join(parts[4:])
-
-                        if exercise_id not in exercise_data:
-                            exercise_data[exercise_id] = {"name": "", "series": {}}
-                        if series_num not in exercise_data[exercise_id]["series"]:
-                            exercise_data[exercise_id]["series"][series_num] = {}
-
-                        exercise_data[exercise_id]["series"][series_num][
-                            field_name
-                        ] = value
-
-                # Sort exercises by their ID to maintain order
-                sorted_exercises = sorted(
-                    exercise_data.items(), key=lambda x: int(x[0])
+                changed_ids = sync_workout_series(
+                    workout, parse_exercise_form(request.POST)
                 )
 
-                for position, (_exercise_id, data) in enumerate(
-                    sorted_exercises, start=1
-                ):
-                    if "name" not in data or not data["name"]:
-                        continue
-
-                    try:
-                        exercise_obj = Exercice.objects.get(name=data["name"])
-                    except Exercice.DoesNotExist:
-                        continue
-
-                    # Create OneExercice record for position tracking
-                    _ = OneExercice.objects.create(
-                        name=exercise_obj, seance=workout, position=position
+                # Records carry the workout date, so a date change touches
+                # every exercise of the workout
+                record_exercise_ids = set(changed_ids)
+                if date_changed:
+                    record_exercise_ids.update(
+                        StrengthSeriesLog.objects.filter(workout=workout).values_list(
+                            "exercise_id", flat=True
+                        )
                     )
 
-                    # Process series for this exercise
-                    if exercise_obj.exercise_type == "strength":
-                        for series_num_str, series_data in data["series"].items():
-                            series_num = int(series_num_str)
-                            reps = series_data.get("reps", 1)
-                            if reps == "" or reps is None:
-                                reps = 1
-                            else:
-                                reps = int(reps)
-
-                            weight = series_data.get("weight", 0)
-                            if weight == "" or weight is None:
-                                weight = 0
-                            else:
-                                weight = int(weight)
-
-                            StrengthSeriesLog.objects.create(
-                                exercise=exercise_obj,
-                                workout=workout,
-                                series_number=series_num,
-                                reps=reps,
-                                weight=weight,
-                            )
-
-                    elif exercise_obj.exercise_type == "cardio":
-                        for series_num_str, series_data in data["series"].items():
-                            series_num = int(series_num_str)
-                            duration = series_data.get("duration_seconds")
-                            if duration == "" or duration is None:
-                                duration = None
-                            else:
-                                duration = int(duration)
-
-                            distance = series_data.get("distance_m")
-                            if distance == "" or distance is None:
-                                distance = None
-                            else:
-                                distance = float(distance)
-
-                            CardioSeriesLog.objects.create(
-                                exercise=exercise_obj,
-                                workout=workout,
-                                series_number=series_num,
-                                duration_seconds=duration,
-                                distance_m=distance,
-                            )
+                if changed_ids:
+                    refresh_workout_summaries([workout.id])
+                refresh_personal_records(record_exercise_ids)
+                bump_data_version(*new_type_stamps(type_created))
 
         except Exception as e:
             logger.error(f"Error updating workout: {str(e)}", exc_info=True)
@@ -642,83 +318,7 @@ def edit_workout(request, workout_id):
         return redirect("/workout/")
 
     # GET request - render edit form with existing data
-    exercises_data: list[dict[str, Any]] = []
-
-    # Get exercises ordered by position from OneExercice
-    one_exercices = OneExercice.objects.filter(seance=workout).order_by("position")
-    exercise_positions: dict[int, int] = {
-        oe.name.id: oe.position for oe in one_exercices
-    }
-
-    # Get all strength exercises from the workout
-    strength_series = StrengthSeriesLog.objects.filter(workout=workout).order_by(
-        "exercise", "series_number"
-    )
-    current_exercise: int | None = None
-    current_exercise_data: dict[str, Any] | None = None
-
-    for series in strength_series:
-        if current_exercise != series.exercise.id:
-            if current_exercise_data:
-                exercises_data.append(current_exercise_data)
-            current_exercise = series.exercise.id
-            current_exercise_data = {
-                "name": series.exercise.name,
-                "exercise_type": "strength",
-                "position": exercise_positions.get(series.exercise.id, 0),
-                "series": [],
-            }
-
-        if current_exercise_data is not None:
-            current_exercise_data["series"].append(
-                {
-                    "series_number": series.series_number,
-                    "reps": series.reps,
-                    "weight": series.weight,
-                }
-            )
-
-    if current_exercise_data:
-        exercises_data.append(current_exercise_data)
-
-    # Get all cardio exercises from the workout
-    cardio_series = CardioSeriesLog.objects.filter(workout=workout).order_by(
-        "exercise", "series_number"
-    )
-    current_cardio_exercise: int | None = None
-    current_cardio_data: dict[str, Any] | None = None
-
-    for cardio_series_item in cardio_series:
-        if current_cardio_exercise != cardio_series_item.exercise.id:
-            if current_cardio_data:
-                exercises_data.append(current_cardio_data)
-            current_cardio_exercise = cardio_series_item.exercise.id
-            current_cardio_data = {
-                "name": cardio_series_item.exercise.name,
-                "exercise_type": "cardio",
-                "position": exercise_positions.get(cardio_series_item.exercise.id, 0),
-                "series": [],
-            }
-
-        if current_cardio_data is not None:
-            current_cardio_data["series"].append(
-                {
-                    "series_number": cardio_series_item.series_number,
-                    "duration_seconds": cardio_series_item.duration_seconds,
-                    "distance_m": cardio_series_item.distance_m,
-                }
-            )
-
-    if current_cardio_data:
-        exercises_data.append(current_cardio_data)
-
-    # Sort exercises by position
-    exercises_data.sort(key=lambda x: x.get("position", 0))
-
-    # Get all exercises for dropdown
-    all_exercises = (
-        Exercice.objects.all().order_by("name").values("name", "exercise_type")
-    )
+    exercises_data = build_exercises_by_workout([workout.id])[workout.id]
 
     context = {
         "page": "edit_workout",
@@ -732,7 +332,6 @@ def edit_workout(request, workout_id):
             "duration": workout.duration,
         },
         "exercises": exercises_data,
-        "all_exercises": list(all_exercises),
         "translations": {
             "sets": gettext("Sets"),
             "series": gettext("Series"),
@@ -763,56 +362,11 @@ def create_template_from_workout(request, workout_id):
                 {"success": False, "error": "Template name is required"}, status=400
             )
 
-        # Load workout with related data
         workout = Workout.objects.get(id=workout_id)
 
-        # Create template in atomic transaction
         with transaction.atomic():
-            # Create WorkoutTemplate
-            template = WorkoutTemplate.objects.create(
-                name=template_name,
-                type_workout=workout.type_workout,
-                duration=workout.duration,
-            )
-
-            # Get exercises ordered by position
-            one_exercises = OneExercice.objects.filter(seance=workout).order_by(
-                "position"
-            )
-
-            for one_exercise in one_exercises:
-                # Create TemplateExercise
-                template_exercise = TemplateExercise.objects.create(
-                    template=template,
-                    exercise=one_exercise.name,
-                    position=one_exercise.position,
-                )
-
-                # Get strength series for this exercise
-                strength_series = StrengthSeriesLog.objects.filter(
-                    workout=workout, exercise=one_exercise.name
-                ).order_by("series_number")
-
-                for strength_series_item in strength_series:
-                    TemplateStrengthSeries.objects.create(
-                        template_exercise=template_exercise,
-                        series_number=strength_series_item.series_number,
-                        reps=strength_series_item.reps,
-                        weight=strength_series_item.weight,
-                    )
-
-                # Get cardio series for this exercise
-                cardio_series = CardioSeriesLog.objects.filter(
-                    workout=workout, exercise=one_exercise.name
-                ).order_by("series_number")
-
-                for cardio_series_item in cardio_series:
-                    TemplateCardioSeries.objects.create(
-                        template_exercise=template_exercise,
-                        series_number=cardio_series_item.series_number,
-                        duration_seconds=cardio_series_item.duration_seconds,
-                        distance_m=cardio_series_item.distance_m,
-                    )
+            template = save_workout_as_template(workout, template_name)
+            bump_data_version(TEMPLATES_STAMP)
 
         return JsonResponse(
             {
@@ -832,11 +386,16 @@ def create_template_from_workout(request, workout_id):
 
 
 @login_required
-def get_template_list(_request):
-    templates = WorkoutTemplate.objects.filter(is_active=True).order_by("name")
+@conditional_on(TEMPLATES_STAMP, WORKOUT_TYPES_STAMP)
+async def get_template_list(_request):
+    templates = (
+        WorkoutTemplate.objects.filter(is_active=True)
+        .select_related("type_workout")
+        .order_by("name")
+    )
 
     templates_data = []
-    for template in templates:
+    async for template in templates:
         templates_data.append(
             {
                 "id": template.id,
@@ -852,6 +411,7 @@ def get_template_list(_request):
 
 
 @login_required
+@conditional_on(TEMPLATES_STAMP, EXERCISES_STAMP)
 def get_template_details(request):
     template_id = request.GET.get("template_id")
 
@@ -859,70 +419,10 @@ def get_template_details(request):
         return JsonResponse({"error": "template_id is required"}, status=400)
 
     try:
-        template = WorkoutTemplate.objects.get(id=template_id, is_active=True)
-
-        # Get all exercises for dropdown
-        all_exercises = (
-            Exercice.objects.all().order_by("name").values("name", "exercise_type")
+        template = WorkoutTemplate.objects.select_related("type_workout").get(
+            id=template_id, is_active=True
         )
-
-        exercises_data: list[dict[str, Any]] = []
-
-        # Get template exercises ordered by position
-        template_exercises = TemplateExercise.objects.filter(
-            template=template
-        ).order_by("position")
-
-        for template_exercise in template_exercises:
-            # Get strength series for this template exercise
-            strength_series = TemplateStrengthSeries.objects.filter(
-                template_exercise=template_exercise
-            ).order_by("series_number")
-
-            if strength_series.exists():
-                strength_series_list: list[dict[str, Any]] = []
-                for strength_series_item in strength_series:
-                    strength_series_list.append(
-                        {
-                            "series_number": strength_series_item.series_number,
-                            "reps": strength_series_item.reps,
-                            "weight": strength_series_item.weight,
-                        }
-                    )
-
-                exercise_data = {
-                    "name": template_exercise.exercise.name,
-                    "exercise_type": "strength",
-                    "position": template_exercise.position,
-                    "series": strength_series_list,
-                }
-
-                exercises_data.append(exercise_data)
-
-            # Get cardio series for this template exercise
-            cardio_series = TemplateCardioSeries.objects.filter(
-                template_exercise=template_exercise
-            ).order_by("series_number")
-
-            if cardio_series.exists():
-                cardio_series_list: list[dict[str, Any]] = []
-                for cardio_series_item in cardio_series:
-                    cardio_series_list.append(
-                        {
-                            "series_number": cardio_series_item.series_number,
-                            "duration_seconds": cardio_series_item.duration_seconds,
-                            "distance_m": cardio_series_item.distance_m,
-                        }
-                    )
-
-                exercise_data = {
-                    "name": template_exercise.exercise.name,
-                    "exercise_type": "cardio",
-                    "position": template_exercise.position,
-                    "series": cardio_series_list,
-                }
-
-                exercises_data.append(exercise_data)
+        exercises_data = build_template_exercises(template.id)
 
         data = {
             "duration": template.duration,
@@ -930,7 +430,6 @@ def get_template_details(request):
                 template.type_workout.name_workout if template.type_workout else ""
             ),
             "exercises": exercises_data,
-            "all_exercises": list(all_exercises),
         }
 
         return JsonResponse(data)
@@ -951,28 +450,14 @@ def exercise_library(request):
     difficulty = request.GET.get("difficulty", "")
     equipment_id = request.GET.get("equipment", "")
 
-    # Start with all exercises
-    exercises = (
-        Exercice.objects.all()
-        .prefetch_related("muscle_groups", "equipment")
-        .order_by("name")
+    # Ranked matches plus the count of each dropdown value, in constant queries
+    exercises, facets = search_exercises(
+        name,
+        muscle_group_id=int(muscle_group_id) if muscle_group_id.isdigit() else None,
+        difficulty=difficulty,
+        equipment_id=int(equipment_id) if equipment_id.isdigit() else None,
     )
 
-    # Apply filters
-    if name:
-        exercises = exercises.filter(name__icontains=name)
-    if muscle_group_id:
-        exercises = exercises.filter(muscle_groups__id=muscle_group_id)
-    if difficulty:
-        exercises = exercises.filter(difficulty=difficulty)
-    if equipment_id:
-        exercises = exercises.filter(equipment__id=equipment_id)
-
-    # Get all muscle groups and equipment for filter dropdowns
-    muscle_groups = MuscleGroup.objects.all().order_by("name")
-    difficulties = Exercice.DIFFICULTY_CHOICES
-    equipments = Equipment.objects.all().order_by("name")
-
     # Check if it's an AJAX request
     is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
@@ -980,9 +465,10 @@ def exercise_library(request):
         "page": "exercise_library",
         "lang": lang,
         "exercises": exercises,
-        "muscle_groups": muscle_groups,
-        "difficulties": difficulties,
-        "equipments": equipments,
+        "muscle_groups": facets["muscle_groups"],
+        "difficulties": facets["difficulties"],
+        "equipments": facets["equipment"],
+        "total": facets["total"],
         "selected_name": name,
         "selected_muscle_group": muscle_group_id,
         "selected_difficulty": difficulty,
@@ -1005,549 +491,216 @@ def exercise_library(request):
         exercises_html = render_to_string(
             "workout/exercise_library_grid.html", context, request=request
         )
-        return JsonResponse({"exercises_html": exercises_html})
+        return JsonResponse({"exercises_html": exercises_html, "facets": facets})
 
     return render(request, "exercise_library.html", context)
 
 
 @login_required
-def export_data(_request):
-    """Export all workout data to JSON file"""
-    try:
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(
-            mode="w", delete=False, suffix=".json"
-        ) as tmp_file:
-            tmp_path = tmp_file.name
-
-        # Call the export command
-        call_command("export_workout_data", output=tmp_path)
-
-        # Read the file and return as download
-        with open(tmp_path, "r", encoding="utf-8") as f:
-            response = HttpResponse(f.read(), content_type="application/json")
-            today_date = datetime.today().strftime("%Y-%m-%d")
-            response["Content-Disposition"] = (
-                f'attachment; filename="workout_data_{today_date}.json"'
-            )
+def get_cache_stats(_request):
+    """Hit/miss counters of the cached analytics payloads"""
+    return JsonResponse({"data_version": get_data_version(), "stats": cache_stats()})
 
-        # Clean up temp file
-        os.unlink(tmp_path)
 
-        return response
-    except Exception as e:
-        logger.error(f"Error exporting data: {str(e)}", exc_info=True)
-        return JsonResponse({"error": str(e)}, status=500)
+@login_required
+def export_data(request):
+    """
+    Export all workout data as JSON (or ?format=columnar, gzipped).
+
+    GET streams the file in the response, through an async iterator under
+    ASGI. POST runs the export as a background job and returns it; the file
+    is downloaded from the job once it has succeeded.
+    """
+    today_date = datetime.today().strftime("%Y-%m-%d")
+    columnar = request.GET.get("format") == "columnar"
+    if columnar:
+        filename = f"workout_data_{today_date}.jsonl.gz"
+        content_type = "application/gzip"
+    else:
+        filename = f"workout_data_{today_date}.json"
+        content_type = "application/json"
+
+    if request.method == "POST":
+        job = enqueue(
+            "Workout data export",
+            "export_workout_data",
+            user=request.user,
+            arguments={"format": "columnar" if columnar else "json"},
+            result_argument="output",
+            result_name=filename,
+            result_content_type=content_type,
+        )
+        return JsonResponse(job_payload(job), status=202)
+
+    if columnar:
+        chunks = iter_gzip(iter_columnar_export())
+    else:
+        chunks = iter_json_export()
+    if isinstance(request, ASGIRequest):
+        chunks = aiter_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
 
 
 @login_required
 def import_data(request):
-    """Import workout data from JSON file"""
+    """Import workout data from a JSON or columnar file, as a background job"""
     if request.method != "POST":
         return JsonResponse({"error": "POST request required"}, status=400)
 
     if "file" not in request.FILES:
         return JsonResponse({"error": "No file provided"}, status=400)
 
-    try:
-        uploaded_file = request.FILES["file"]
-
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(
-            mode="wb", delete=False, suffix=".json"
-        ) as tmp_file:
-            for chunk in uploaded_file.chunks():
-                tmp_file.write(chunk)
-            tmp_path = tmp_file.name
-
-        # Call the import command
-        call_command("import_workout_data", file=tmp_path)
-
-        # Clean up temp file
-        os.unlink(tmp_path)
-
-        return JsonResponse({"success": True, "message": "Data imported successfully"})
-    except Exception as e:
-        logger.error(f"Error importing data: {str(e)}", exc_info=True)
-        return JsonResponse({"error": str(e)}, status=500)
+    input_file = save_upload(request.FILES["file"])
+    job = enqueue(
+        "Workout data import",
+        "import_workout_data",
+        user=request.user,
+        arguments={"file": input_file},
+        input_file=input_file,
+    )
+    return JsonResponse(job_payload(job), status=202)
 
 
 @login_required
 def clear_data(request):
-    """Clear all workout data"""
+    """Clear all workout data, as a background job"""
     if request.method != "POST":
         return JsonResponse({"error": "POST request required"}, status=400)
 
-    try:
-        # Call the clear command with no-input flag
-        call_command("clear_workout_data", no_input=True)
-        return JsonResponse(
-            {"success": True, "message": "All data cleared successfully"}
-        )
-    except Exception as e:
-        logger.error(f"Error clearing data: {str(e)}", exc_info=True)
-        return JsonResponse({"error": str(e)}, status=500)
+    job = enqueue(
+        "Workout data reset",
+        "clear_workout_data",
+        user=request.user,
+        arguments={"no_input": True},
+    )
+    return JsonResponse(job_payload(job), status=202)
 
 
-def get_dashboard_data(request):
+@conditional_on()
+async def get_dashboard_data(request):
     """Get dashboard statistics filtered by date range (AJAX endpoint)"""
-    from django.db.models import Count, F, Sum
-
     # Get date filter parameters
     start_date = request.GET.get("start_date", "")
     end_date = request.GET.get("end_date", "")
 
-    # Build filter
-    workout_filter = {}
-    if start_date:
-        workout_filter["date__gte"] = start_date
-    if end_date:
-        workout_filter["date__lte"] = end_date
-
-    # Build the filtered workout queryset
-    filtered_workouts = (
-        Workout.objects.filter(**workout_filter)
-        if workout_filter
-        else Workout.objects.all()
+    # The cache lookup and, on a miss, the aggregates run together in one
+    # worker thread: they share the request's connection anyway
+    payload = await sync_to_async(cached_payload)(
+        "dashboard",
+        (start_date, end_date, translation.get_language(), datetime.now().date()),
+        lambda: build_dashboard_payload(start_date, end_date),
     )
+    return JsonResponse(payload)
 
-    total_workouts = filtered_workouts.count()
-
-    # Get exercise IDs from filtered workouts
-    if workout_filter:
-        filtered_workout_ids = filtered_workouts.values_list("id", flat=True)
-        total_exercises = OneExercice.objects.filter(
-            seance_id__in=filtered_workout_ids
-        ).count()
-
-        # Calculate total volume (for strength exercises) with date filter
-        total_volume = (
-            StrengthSeriesLog.objects.filter(
-                workout_id__in=filtered_workout_ids
-            ).aggregate(total=Sum(F("reps") * F("weight")))["total"]
-            or 0
-        )
 
-        # Workouts by type with date filter
-        workouts_by_type = list(
-            filtered_workouts.values("type_workout__name_workout")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
+def build_dashboard_payload(start_date, end_date):
+    """Compute the dashboard statistics for an optional date range"""
+    return dashboard_stats(
+        datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None,
+        datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None,
+    )
 
-        # Top exercises by frequency with date filter
-        top_exercises = list(
-            OneExercice.objects.filter(seance_id__in=filtered_workout_ids)
-            .values("name__name")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:5]
-        )
-    else:
-        total_exercises = OneExercice.objects.count()
-
-        # Calculate total volume (for strength exercises)
-        total_volume = (
-            StrengthSeriesLog.objects.aggregate(total=Sum(F("reps") * F("weight")))[
-                "total"
-            ]
-            or 0
-        )
 
-        # Workouts by type
-        workouts_by_type = list(
-            Workout.objects.values("type_workout__name_workout")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
+@login_required
+@conditional_on()
+async def get_exercise_progression(request):
+    """
+    Progression of a strength exercise over time (AJAX endpoint).
 
-        # Top exercises by frequency
-        top_exercises = list(
-            OneExercice.objects.values("name__name")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:5]
-        )
+    Parameters: exercise_id, optional start_date and end_date, bucket
+    (workout, week or month), points (the most points to return) and
+    metric (the series downsampling preserves).
+    """
+    exercise_id = request.GET.get("exercise_id", "")
+    start_date = request.GET.get("start_date", "")
+    end_date = request.GET.get("end_date", "")
+    bucket = request.GET.get("bucket", "workout")
+    metric = request.GET.get("metric", "estimated_1rm")
+    points = request.GET.get("points", str(DEFAULT_POINTS))
 
-    # Weekly workouts trend - use date filter for the range if provided
-    if start_date and end_date:
-        # Calculate weeks between start and end date
-        from datetime import datetime as dt
-
-        start_dt = dt.strptime(start_date, "%Y-%m-%d").date()
-        end_dt = dt.strptime(end_date, "%Y-%m-%d").date()
-
-        # Adjust start_dt to Monday of that week (Monday = 0, Sunday = 6)
-        days_since_monday = start_dt.weekday()
-        start_dt = start_dt - timedelta(days=days_since_monday)
-
-        total_days = (end_dt - start_dt).days
-        num_weeks = max(
-            total_days // 7 + 1, 1
-        )  # Show all weeks including partial current week
-
-        weekly_workouts = []
-        for week in range(num_weeks):
-            week_start = start_dt + timedelta(weeks=week)
-            week_end = min(week_start + timedelta(days=6), end_dt)
-            count = Workout.objects.filter(
-                date__gte=week_start, date__lte=week_end
-            ).count()
-            weekly_workouts.append(
-                {
-                    "week": week + 1,
-                    "count": count,
-                    "start": week_start.strftime("%d/%m/%Y"),
-                }
-            )
-    else:
-        # Show all available data - calculate from earliest workout to now
-        earliest_workout = Workout.objects.order_by("date").first()
-        if earliest_workout:
-            start_dt = earliest_workout.date
-            end_dt = datetime.now().date()
-
-            # Adjust start_dt to Monday of that week (Monday = 0, Sunday = 6)
-            days_since_monday = start_dt.weekday()
-            start_dt = start_dt - timedelta(days=days_since_monday)
-
-            total_days = (end_dt - start_dt).days
-            num_weeks = max(total_days // 7 + 1, 1)
-
-            weekly_workouts = []
-            for week in range(num_weeks):
-                week_start = start_dt + timedelta(weeks=week)
-                week_end = min(week_start + timedelta(days=6), end_dt)
-                count = Workout.objects.filter(
-                    date__gte=week_start, date__lte=week_end
-                ).count()
-                weekly_workouts.append(
-                    {
-                        "week": week + 1,
-                        "count": count,
-                        "start": week_start.strftime("%d/%m/%Y"),
-                    }
-                )
-        else:
-            # No workouts yet
-            weekly_workouts = []
+    if not exercise_id.isdigit():
+        return JsonResponse({"error": "exercise_id is required"}, status=400)
+    if bucket not in BUCKETS:
+        return JsonResponse(
+            {"error": f"bucket must be one of {', '.join(BUCKETS)}"}, status=400
+        )
+    if metric not in METRICS:
+        return JsonResponse(
+            {"error": f"metric must be one of {', '.join(METRICS)}"}, status=400
+        )
+    if not points.isdigit() or not 3 <= int(points) <= MAX_POINTS:
+        return JsonResponse(
+            {"error": f"points must be between 3 and {MAX_POINTS}"}, status=400
+        )
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+        end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
+    except ValueError:
+        return JsonResponse({"error": "Dates must be YYYY-MM-DD"}, status=400)
 
-    return JsonResponse(
-        {
-            "total_workouts": total_workouts,
-            "total_exercises": total_exercises,
-            "total_volume": int(total_volume),
-            "workouts_by_type": workouts_by_type,
-            "weekly_workouts": weekly_workouts,
-            "top_exercises": top_exercises,
-        }
+    exercise = (
+        await Exercice.objects.filter(id=exercise_id).values("id", "name").afirst()
     )
+    if exercise is None:
+        return JsonResponse({"error": "Exercise not found"}, status=404)
+
+    payload = await sync_to_async(cached_payload)(
+        "progression",
+        (exercise["id"], start_date, end_date, bucket, points, metric),
+        lambda: exercise_progression(
+            exercise["id"], start, end, bucket, int(points), metric
+        ),
+    )
+    return JsonResponse({"exercise": exercise, **payload})
 
 
 def calculate_personal_records():
     """
-    Calculate personal records at runtime from StrengthSeriesLog data.
+    Read personal records from the PersonalRecord index.
 
-    Returns a list of personal records sorted by date achieved (most recent first).
+    Returns a list of max weight records sorted by weight (heaviest first).
     """
-    # Get all strength series logs (only exercises with weight)
-    logs = (
-        StrengthSeriesLog.objects.select_related("exercise", "workout")
-        .filter(weight__gt=0)  # Only include exercises with weight > 0
-        .order_by("-workout__date")
-    )
-
-    # Track personal records for each exercise
-    records_by_exercise: dict[int, dict[str, Any]] = {}
-    all_records: list[dict[str, Any]] = []
-
-    for log in logs:
-        exercise_id = log.exercise.id
-
-        if exercise_id not in records_by_exercise:
-            records_by_exercise[exercise_id] = {
-                "max_weight": None,
-            }
-
-        exercise_records = records_by_exercise[exercise_id]
-
-        # Check for max weight record
-        if (
-            exercise_records["max_weight"] is None
-            or log.weight > exercise_records["max_weight"]["value"]
-        ):
-            exercise_records["max_weight"] = {
-                "exercise": log.exercise,
-                "record_type": "max_weight",
-                "value": log.weight,
-                "date_achieved": log.workout.date,
-                "workout": log.workout,
-                "display_name": "Max Weight",
-            }
-
-    # Collect all records
-    for _exercise_id, records in records_by_exercise.items():
-        for _record_type, record_data in records.items():
-            if record_data:
-                all_records.append(record_data)
+    records = PersonalRecord.objects.select_related(
+        "exercise", "max_weight_workout"
+    ).order_by("-max_weight")
 
-    # Sort by max weight (heaviest first)
-    all_records.sort(key=lambda x: x["value"], reverse=True)
-    return all_records
+    return [
+        {
+            "exercise": record.exercise,
+            "record_type": "max_weight",
+            "value": record.max_weight,
+            "date_achieved": record.max_weight_date,
+            "workout": record.max_weight_workout,
+            "display_name": "Max Weight",
+            "estimated_1rm": record.best_estimated_1rm,
+            "best_set_volume": record.best_set_volume,
+        }
+        for record in records
+    ]
 
 
-def get_calendar_data(request):
+@conditional_on()
+async def get_calendar_data(request):
     """AJAX endpoint to get calendar data for a specific year"""
-    import calendar as cal
-    from collections import defaultdict
-
-    from django.http import JsonResponse
-
     # Get year from URL parameter or use current year
     current_year = int(request.GET.get("year", datetime.now().year))
-    current_month = datetime.now().month
-
-    # Get all workouts for calendar view
-    workouts = Workout.objects.filter(date__year=current_year).order_by("date")
-
-    # Determine which years have workout data
-    years_with_data = (
-        Workout.objects.dates("date", "year")
-        .values_list("date__year", flat=True)
-        .distinct()
-    )
-    years_with_data_l = list(years_with_data)
-
-    # Check if there's data for previous and next year
-    has_prev_year_data = (current_year - 1) in years_with_data_l
-    has_next_year_data = (current_year + 1) in years_with_data_l
-
-    # Create calendar data structure
-    calendar_data = defaultdict(list)
-    for workout in workouts:
-        month_key = f"{workout.date.year}-{workout.date.month:02d}"
-        calendar_data[month_key].append(
-            {
-                "day": workout.date.day,
-                "type": (
-                    workout.type_workout.name_workout
-                    if workout.type_workout
-                    else "No Type"
-                ),
-                "duration": workout.duration,
-                "id": workout.id,
-            }
-        )
-
-    # Define translatable month names
-    month_names = [
-        gettext("January"),
-        gettext("February"),
-        gettext("March"),
-        gettext("April"),
-        gettext("May"),
-        gettext("June"),
-        gettext("July"),
-        gettext("August"),
-        gettext("September"),
-        gettext("October"),
-        gettext("November"),
-        gettext("December"),
-    ]
-
-    months_data = []
-    for month in range(1, 13):
-        month_name = month_names[month - 1]
-        month_key = f"{current_year}-{month:02d}"
-
-        # Get first day of month and number of days
-        first_day = datetime(current_year, month, 1)
-        num_days = cal.monthrange(current_year, month)[1]
-        start_weekday = first_day.weekday()
-
-        # Get workouts for this month
-        month_workouts = calendar_data.get(month_key, [])
-        workout_days = {w["day"]: w for w in month_workouts}
-
-        months_data.append(
-            {
-                "name": month_name,
-                "number": month,
-                "num_days": num_days,
-                "start_weekday": start_weekday,
-                "empty_days_before": list(range(start_weekday)),
-                "workout_days": workout_days,
-                "is_current": month == current_month
-                and current_year == datetime.now().year,
-            }
-        )
-
-    return JsonResponse(
-        {
-            "year": current_year,
-            "months": months_data,
-            "has_prev_year_data": has_prev_year_data,
-            "has_next_year_data": has_next_year_data,
-        }
-    )
+    return JsonResponse(await sync_to_async(calendar_payload)(current_year))
 
 
 def analytics(request):
     """Analytics page with calendar view, progress dashboard, and PR tracking"""
-    import calendar as cal
-    import json
-    from collections import defaultdict
-
-    from django.db.models import Count, F, Sum
-
     lang = translation.get_language()
 
-    # Use current year for initial page load
-    current_year = datetime.now().year
-    current_month = datetime.now().month
-
-    # Get all workouts for calendar view
-    workouts = Workout.objects.filter(date__year=current_year).order_by("date")
-
-    # Determine which years have workout data
-    years_with_data = (
-        Workout.objects.dates("date", "year")
-        .values_list("date__year", flat=True)
-        .distinct()
-    )
-    years_with_data_l = list(years_with_data)
-
-    # Check if there's data for previous and next year
-    has_prev_year_data = (current_year - 1) in years_with_data_l
-    has_next_year_data = (current_year + 1) in years_with_data_l
-
-    # Create calendar data structure
-    calendar_data = defaultdict(list)
-    for workout in workouts:
-        month_key = f"{workout.date.year}-{workout.date.month:02d}"
-        calendar_data[month_key].append(
-            {
-                "day": workout.date.day,
-                "type": (
-                    workout.type_workout.name_workout
-                    if workout.type_workout
-                    else "No Type"
-                ),
-                "duration": workout.duration,
-                "id": workout.id,
-            }
-        )
-
-    # Dashboard statistics - start with all workouts for initial load
-    total_exercises = OneExercice.objects.count()
-
-    # Calculate total volume (for strength exercises)
-    total_volume = (
-        StrengthSeriesLog.objects.aggregate(total=Sum(F("reps") * F("weight")))["total"]
-        or 0
-    )
-
-    # Workouts by type
-    workouts_by_type = list(
-        Workout.objects.values("type_workout__name_workout")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-    )
-
-    # Top exercises by frequency
-    top_exercises = list(
-        OneExercice.objects.values("name__name")
-        .annotate(count=Count("id"))
-        .order_by("-count")[:5]
+    payload = cached_payload(
+        "analytics", (lang, datetime.now().date()), build_analytics_payload
     )
 
-    # Total workouts for initial load
-    total_workouts = Workout.objects.count()
-
-    # Weekly workouts trend - calculate from earliest workout to now
-    earliest_workout = Workout.objects.order_by("date").first()
-    if earliest_workout:
-        start_dt = earliest_workout.date
-        end_dt = datetime.now().date()
-        total_days = (end_dt - start_dt).days
-        num_weeks = max(total_days // 7, 1)
-
-        weekly_workouts = []
-        for week in range(num_weeks):
-            week_start = start_dt + timedelta(weeks=week)
-            week_end = min(week_start + timedelta(days=6), end_dt)
-            count = Workout.objects.filter(
-                date__gte=week_start, date__lte=week_end
-            ).count()
-            weekly_workouts.append(
-                {
-                    "week": week + 1,
-                    "count": count,
-                    "start": week_start.strftime("%d/%m/%Y"),
-                }
-            )
-    else:
-        # No workouts yet
-        weekly_workouts = []
-
-    # Personal Records (calculated at runtime)
-    personal_records = calculate_personal_records()
-
-    # Generate calendar months for the year
-    # Define translatable month names
-    month_names = [
-        gettext("January"),
-        gettext("February"),
-        gettext("March"),
-        gettext("April"),
-        gettext("May"),
-        gettext("June"),
-        gettext("July"),
-        gettext("August"),
-        gettext("September"),
-        gettext("October"),
-        gettext("November"),
-        gettext("December"),
-    ]
-
-    months_data = []
-    for month in range(1, 13):
-        month_name = month_names[month - 1]
-        month_key = f"{current_year}-{month:02d}"
-
-        # Get first day of month and number of days
-        first_day = datetime(current_year, month, 1)
-        num_days = cal.monthrange(current_year, month)[1]
-        start_weekday = first_day.weekday()
-
-        # Get workouts for this month
-        month_workouts = calendar_data.get(month_key, [])
-        workout_days = {w["day"]: w for w in month_workouts}
-
-        months_data.append(
-            {
-                "name": month_name,
-                "number": month,
-                "num_days": num_days,
-                "start_weekday": start_weekday,
-                "empty_days_before": list(range(start_weekday)),
-                "workout_days": workout_days,
-                "is_current": month == current_month,
-            }
-        )
-
     context = {
         "page": "analytics",
         "lang": lang,
-        "current_year": current_year,
-        "months": months_data,
-        "has_prev_year_data": has_prev_year_data,
-        "has_next_year_data": has_next_year_data,
-        "total_workouts": total_workouts,
-        "total_exercises": total_exercises,
-        "total_volume": int(total_volume),
-        "workouts_by_type": json.dumps(workouts_by_type),
-        "weekly_workouts": json.dumps(weekly_workouts),
-        "personal_records": personal_records,
-        "top_exercises": json.dumps(top_exercises),
+        **payload,
         "translations": {
             "analytics": gettext("Analytics"),
             "calendar": gettext("Calendar"),
@@ -1565,3 +718,31 @@ def analytics(request):
     }
 
     return render(request, "workout/analytics.html", context)
+
+
+def build_analytics_payload():
+    """Compute the calendar, dashboard and records shown on the analytics page"""
+    import json
+
+    # Use current year for initial page load
+    calendar_data = calendar_payload(datetime.now().year)
+
+    # Dashboard statistics - start with all workouts for initial load
+    dashboard = dashboard_stats()
+
+    # Personal Records (calculated at runtime)
+    personal_records = calculate_personal_records()
+
+    return {
+        "current_year": calendar_data["year"],
+        "months": calendar_data["months"],
+        "has_prev_year_data": calendar_data["has_prev_year_data"],
+        "has_next_year_data": calendar_data["has_next_year_data"],
+        "total_workouts": dashboard["total_workouts"],
+        "total_exercises": dashboard["total_exercises"],
+        "total_volume": dashboard["total_volume"],
+        "workouts_by_type": json.dumps(dashboard["workouts_by_type"]),
+        "weekly_workouts": json.dumps(dashboard["weekly_workouts"]),
+        "personal_records": personal_records,
+        "top_exercises": json.dumps(dashboard["top_exercises"]),
+    }
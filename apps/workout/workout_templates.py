@@ -0,0 +1,117 @@
+from collections import defaultdict
+from typing import Any
+
+from .feed import CARDIO_FIELDS, STRENGTH_FIELDS
+from .models import (
+    CardioSeriesLog,
+    OneExercice,
+    StrengthSeriesLog,
+    TemplateCardioSeries,
+    TemplateExercise,
+    TemplateStrengthSeries,
+    Workout,
+    WorkoutTemplate,
+)
+
+
+def save_workout_as_template(workout: Workout, name: str) -> WorkoutTemplate:
+    """
+    Save the exercises and series of ``workout`` as a new template.
+
+    The workout is read with three queries and the template written with
+    one insert per table, whatever the number of exercises and series.
+    Each template exercise gets all the series its exercise has in the
+    workout. Must run inside a transaction.
+    """
+    template = WorkoutTemplate.objects.create(
+        name=name, type_workout_id=workout.type_workout_id, duration=workout.duration
+    )
+
+    positions = list(
+        OneExercice.objects.filter(seance=workout)
+        .order_by("position")
+        .values_list("name_id", "position")
+    )
+    strength_by_exercise = _series_by_exercise(
+        StrengthSeriesLog, workout, STRENGTH_FIELDS
+    )
+    cardio_by_exercise = _series_by_exercise(CardioSeriesLog, workout, CARDIO_FIELDS)
+
+    template_exercises = TemplateExercise.objects.bulk_create(
+        [
+            TemplateExercise(
+                template=template, exercise_id=exercise_id, position=position
+            )
+            for exercise_id, position in positions
+        ]
+    )
+
+    TemplateStrengthSeries.objects.bulk_create(
+        [
+            TemplateStrengthSeries(template_exercise=template_exercise, **series)
+            for template_exercise in template_exercises
+            for series in strength_by_exercise[template_exercise.exercise_id]
+        ]
+    )
+    TemplateCardioSeries.objects.bulk_create(
+        [
+            TemplateCardioSeries(template_exercise=template_exercise, **series)
+            for template_exercise in template_exercises
+            for series in cardio_by_exercise[template_exercise.exercise_id]
+        ]
+    )
+    return template
+
+
+def build_template_exercises(template_id: int) -> list[dict[str, Any]]:
+    """
+    Assemble the exercises and series of a template in three queries.
+
+    Returns one entry per template exercise and series kind, sorted by
+    position, strength before cardio, in the format of
+    build_exercises_by_workout.
+    """
+    template_exercises = list(
+        TemplateExercise.objects.filter(template_id=template_id)
+        .order_by("position")
+        .values_list("id", "exercise__name", "position")
+    )
+
+    series_by_kind = {}
+    for exercise_type, model, fields in (
+        ("strength", TemplateStrengthSeries, STRENGTH_FIELDS),
+        ("cardio", TemplateCardioSeries, CARDIO_FIELDS),
+    ):
+        grouped = defaultdict(list)
+        for template_exercise_id, *values in (
+            model.objects.filter(template_exercise__template_id=template_id)
+            .order_by("template_exercise_id", "series_number")
+            .values_list("template_exercise_id", *fields)
+        ):
+            grouped[template_exercise_id].append(dict(zip(fields, values)))
+        series_by_kind[exercise_type] = grouped
+
+    exercises = []
+    for template_exercise_id, name, position in template_exercises:
+        for exercise_type, grouped in series_by_kind.items():
+            if grouped[template_exercise_id]:
+                exercises.append(
+                    {
+                        "name": name,
+                        "exercise_type": exercise_type,
+                        "position": position,
+                        "series": grouped[template_exercise_id],
+                    }
+                )
+    return exercises
+
+
+def _series_by_exercise(model, workout, fields) -> defaultdict[int, list[dict]]:
+    series = defaultdict(list)
+    for exercise_id, *values in (
+        model.objects.filter(workout=workout)
+        .order_by("exercise_id", "series_number")
+        .values_list("exercise_id", *fields)
+    ):
+        series[exercise_id].append(dict(zip(fields, values)))
+    return series
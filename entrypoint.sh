@@ -7,6 +7,8 @@ python manage.py wait_for_db
 # Apply migrations
 echo "Applying migrations..."
 python manage.py migrate
+python manage.py createcachetable
+python manage.py recover_jobs
 
 # Create superuser if it doesn't exist
 echo "Creating superuser..."
@@ -0,0 +1,13 @@
+# Gunicorn settings of the production image.
+# WEB_SERVER_MODE selects "wsgi" (sync workers, default) or "asgi" (uvicorn
+# workers, needs the "asgi" extra) and WEB_WORKERS the number of processes.
+import os
+
+bind = "0.0.0.0:8000"
+workers = int(os.getenv("WEB_WORKERS", "3"))
+
+if os.getenv("WEB_SERVER_MODE", "wsgi") == "asgi":
+    wsgi_app = "mysite.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "mysite.wsgi:application"
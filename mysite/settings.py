@@ -45,9 +45,11 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "apps.home.apps.HomeConfig",
     "apps.workout.apps.WorkoutConfig",
+    "apps.jobs.apps.JobsConfig",
 ]
 
 MIDDLEWARE = [
+    "apps.workout.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -91,10 +93,89 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", ""),
         "HOST": os.getenv("DB_HOST", "localhost"),
         "PORT": os.getenv("DB_PORT", "5432"),
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "true").lower()
+        == "true",
+    }
+}
+
+# Connections are kept open for DB_CONN_MAX_AGE seconds (0 closes them at the
+# end of each request) and checked before reuse when DB_CONN_HEALTH_CHECKS is
+# on. DB_POOL=true uses psycopg 3's connection pool instead (install the
+# "pool" extra; the production image does when built with DB_POOL=true).
+# Django prefers psycopg 3 to psycopg2 whenever it is installed, so the extra
+# also switches the driver. Each worker keeps DB_POOL_MIN_SIZE to
+# DB_POOL_MAX_SIZE connections and waits up to DB_POOL_TIMEOUT seconds for a
+# free one. Pooled connections are returned to the pool after each request,
+# so CONN_MAX_AGE must be 0.
+#
+# WEB_SERVER_MODE=asgi (read by gunicorn.conf.py) serves the app with uvicorn
+# workers. Every ASGI request runs in its own thread context and never reuses
+# an earlier request's connection, so persistent connections are turned off
+# there; use DB_POOL to avoid reconnecting on each request.
+if os.getenv("WEB_SERVER_MODE", "wsgi") == "asgi":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+
+if os.getenv("DB_POOL", "false").lower() == "true":
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "4")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "check": ConnectionPool.check_connection,
+        }
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# CACHE_BACKEND selects "locmem" (default, per process), "file" or "db".
+# The db backend needs `python manage.py createcachetable`.
+
+CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "workout-cache"),
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        str(BASE_DIR / ".cache"),
+    ),
+    "db": ("django.core.cache.backends.db.DatabaseCache", "django_cache"),
+}
+CACHE_BACKEND, CACHE_DEFAULT_LOCATION = CACHE_BACKENDS[
+    os.getenv("CACHE_BACKEND", "locmem")
+]
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", CACHE_DEFAULT_LOCATION),
+        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "3600")),
     }
 }
 
 
+# Request metrics
+# Query count, DB time and total time of the requests under these paths are
+# sent in a Server-Timing header and logged; requests over any of the
+# SLOW_REQUEST_* thresholds are logged as warnings.
+
+REQUEST_METRICS_PATHS = ["/workout/", "/jobs/"]
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "30"))
+SLOW_REQUEST_DB_MS = int(os.getenv("SLOW_REQUEST_DB_MS", "200"))
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "1000"))
+
+
+# Background jobs
+# Imports, exports and resets run in a worker thread of the web process (see
+# apps/jobs/runner.py). Uploaded and generated files are kept in JOBS_ROOT,
+# which has to be shared by all the workers, for JOBS_RETENTION_DAYS.
+
+JOBS_ROOT = Path(os.getenv("JOBS_ROOT", BASE_DIR / ".jobs"))
+JOBS_RETENTION_DAYS = int(os.getenv("JOBS_RETENTION_DAYS", "2"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -202,5 +283,10 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "apps.jobs": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
@@ -24,5 +24,6 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("i18n/", include("django.conf.urls.i18n")),
     path("workout/", include("apps.workout.urls")),
+    path("jobs/", include("apps.jobs.urls")),
     path("", include("apps.home.urls")),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)